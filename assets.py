@@ -3,14 +3,26 @@ Gerenciamento de carregamento de assets (imagens, sprites)
 """
 import pygame
 import sys
+from memoria import ContabilidadeMemoria
+from pacote_assets import carregar_pacote, gravar_pacote
 # Adicionamos LARGURA_VIRTUAL e ALTURA_VIRTUAL nas importações
 from config import SPRITE_LARGURA, SPRITE_ALTURA, FRAMES_IDLE, FRAMES_MOVE, FRAMES_JUMP, FRAMES_HURT, FRAMES_DEAD, LARGURA_VIRTUAL, ALTURA_VIRTUAL, FRAMES_MOEDA
+from config import ORCAMENTO_MEMORIA_MB, ROTACAO_METEORO_PASSO, PACOTE_ASSETS
+from config import HITBOX_OFFSET_X, HITBOX_OFFSET_Y, HITBOX_LARGURA, HITBOX_ALTURA
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 class Assets:
     """Classe para carregar e gerenciar todos os recursos do jogo"""
     
     def __init__(self):
+        # Contabilidade de todas as superfícies criadas pelo jogo
+        self.memoria = ContabilidadeMemoria(ORCAMENTO_MEMORIA_MB * 1024 * 1024)
+        
         self.tile_grama = None
         self.tile_terra = None
         self.tile_ponta_esq = None
@@ -30,11 +42,33 @@ class Assets:
         # Novo atributo para o background
         self.background = None
         
+        # Caches de sprites transformados (podem ser liberados pelo orçamento)
+        self._cache_rotacao_meteoro = {}
+        self._cache_espelhado = {}
+        
+        # Máscaras de colisão por pixel (pequenas, ficam fora do orçamento)
+        self._cache_mascaras_meteoro = {}  # balde de rotação -> máscara por frame
+        self._cache_mascaras_dino = {}  # (id do sprite, espelhado) -> (sprite, máscara)
+        
+        # Imagens já decodificadas (vazio se não houver pacote válido)
+        self._pacote = carregar_pacote(PACOTE_ASSETS) if PACOTE_ASSETS else {}
+        self._lidas = {}  # caminho -> superfície antes do convert (para regravar o pacote)
+        self._pacote_desatualizado = False  # Algum PNG não veio do pacote
+        
         self.carregar_recursos()
+        
+        # Pacote ausente ou desatualizado: grava um novo para a próxima abertura
+        if PACOTE_ASSETS and self._pacote_desatualizado:
+            try:
+                gravar_pacote(self._lidas, PACOTE_ASSETS)
+            except OSError:
+                pass  # Sem permissão de escrita: continua usando os PNGs
+        self._pacote = None
+        self._lidas = None
     
     def _criar_background_apocaliptico(self):
         """Cria um background com gradiente de pôr do sol apocalíptico"""
-        bg = pygame.Surface((LARGURA_VIRTUAL, ALTURA_VIRTUAL))
+        bg = self.memoria.registrar(pygame.Surface((LARGURA_VIRTUAL, ALTURA_VIRTUAL)), 'fundo')
         
         # Cores do pôr do sol apocalíptico (de cima para baixo)
         cores = [
@@ -51,12 +85,28 @@ class Assets:
         # Calcular altura de cada faixa
         num_faixas = len(cores) - 1
         altura_faixa = ALTURA_VIRTUAL / num_faixas
+        limites = [int(i * altura_faixa) for i in range(num_faixas + 1)]
+        
+        if numpy is not None:
+            # Interpolação de todas as linhas de uma vez
+            cores_arr = numpy.array(cores, dtype=float)
+            ys = numpy.arange(ALTURA_VIRTUAL)
+            faixa = numpy.searchsorted(limites, ys, side='right') - 1
+            faixa = numpy.clip(faixa, 0, num_faixas - 1)
+            t = (ys - numpy.array(limites)[faixa]) / altura_faixa
+            inicio = cores_arr[faixa]
+            fim = cores_arr[faixa + 1]
+            coluna = (inicio + (fim - inicio) * t[:, None]).astype(numpy.uint8)
+            pygame.surfarray.blit_array(
+                bg, numpy.broadcast_to(coluna, (LARGURA_VIRTUAL, ALTURA_VIRTUAL, 3))
+            )
+            return bg
         
         for i in range(num_faixas):
             cor_inicio = cores[i]
             cor_fim = cores[i + 1]
-            y_inicio = int(i * altura_faixa)
-            y_fim = int((i + 1) * altura_faixa)
+            y_inicio = limites[i]
+            y_fim = limites[i + 1]
             
             for y in range(y_inicio, y_fim):
                 # Interpolação linear entre as cores
@@ -73,27 +123,29 @@ class Assets:
         try:
             try:
                 bg_raw = pygame.image.load('background.png').convert()
-                self.background = pygame.transform.scale(bg_raw, (LARGURA_VIRTUAL, ALTURA_VIRTUAL))
+                self.background = self.memoria.registrar(
+                    pygame.transform.scale(bg_raw, (LARGURA_VIRTUAL, ALTURA_VIRTUAL)), 'fundo'
+                )
             except FileNotFoundError:
                 # Se não achar o background, cria um gradiente de pôr do sol apocalíptico
                 self.background = self._criar_background_apocaliptico()
 
             # Tiles do mapa
-            self.tile_grama = pygame.image.load('assets/grass.png').convert_alpha()
-            self.tile_terra = pygame.image.load('assets/terra.png').convert_alpha()
-            self.tile_ponta_esq = pygame.image.load('assets/grass_ponta_esquerda.png').convert_alpha()
-            self.tile_ponta_dir = pygame.image.load('assets/grass_ponta_direita.png').convert_alpha()
-            self.tile_terra_esq_dir = pygame.image.load('assets/terra_esquerda_direita.png').convert_alpha()
-            self.tile_terra_dir_esq = pygame.image.load('assets/terra_direita_esquerda.png').convert_alpha()
-            self.tile_terra_lateral_esq = pygame.image.load('assets/terra_lateral_esquerda.png').convert_alpha()
-            self.tile_terra_lateral_dir = pygame.image.load('assets/terra_lateral_direita.png').convert_alpha()
+            self.tile_grama = self._carregar('assets/grass.png')
+            self.tile_terra = self._carregar('assets/terra.png')
+            self.tile_ponta_esq = self._carregar('assets/grass_ponta_esquerda.png')
+            self.tile_ponta_dir = self._carregar('assets/grass_ponta_direita.png')
+            self.tile_terra_esq_dir = self._carregar('assets/terra_esquerda_direita.png')
+            self.tile_terra_dir_esq = self._carregar('assets/terra_direita_esquerda.png')
+            self.tile_terra_lateral_esq = self._carregar('assets/terra_lateral_esquerda.png')
+            self.tile_terra_lateral_dir = self._carregar('assets/terra_lateral_direita.png')
             
             # Sprite sheets do dino
-            sprite_sheet_idle = pygame.image.load('assets/idle.png').convert_alpha()
-            sprite_sheet_move = pygame.image.load('assets/move.png').convert_alpha()
-            sprite_sheet_jump = pygame.image.load('assets/jump.png').convert_alpha()
-            sprite_sheet_hurt = pygame.image.load('assets/hurt.png').convert_alpha()
-            sprite_sheet_dead = pygame.image.load('assets/dead.png').convert_alpha()
+            sprite_sheet_idle = self._carregar('assets/idle.png')
+            sprite_sheet_move = self._carregar('assets/move.png')
+            sprite_sheet_jump = self._carregar('assets/jump.png')
+            sprite_sheet_hurt = self._carregar('assets/hurt.png')
+            sprite_sheet_dead = self._carregar('assets/dead.png')
             
             # Separar frames das animações
             self.dino_idle = self._extrair_frames(sprite_sheet_idle, FRAMES_IDLE)
@@ -103,14 +155,16 @@ class Assets:
             self.dino_dead = self._extrair_frames(sprite_sheet_dead, FRAMES_DEAD)
             
             # Sprite sheet do meteoro (3 frames, 10x19 cada)
-            sprite_sheet_meteoro = pygame.image.load('assets/meteoro.png').convert_alpha()
+            sprite_sheet_meteoro = self._carregar('assets/meteoro.png')
             for i in range(3):
-                frame = sprite_sheet_meteoro.subsurface((i * 10, 0, 10, 19))
+                frame = self.memoria.registrar(
+                    sprite_sheet_meteoro.subsurface((i * 10, 0, 10, 19)), 'assets'
+                )
                 self.meteoro_sprites.append(frame)
             
             # Sprite sheet das moedas
             try:
-                sprite_sheet_moeda = pygame.image.load('assets/moeda.png').convert_alpha()
+                sprite_sheet_moeda = self._carregar('assets/moeda.png')
                 # Extrair frames de moeda (tamanho diferente do sprite padrão)
                 self.moeda_sprites = self._extrair_frames_moeda(sprite_sheet_moeda, FRAMES_MOEDA)
             except FileNotFoundError:
@@ -118,7 +172,7 @@ class Assets:
                 self.moeda_sprites = self._criar_moedas_procedurais()
             
             # Ícone de vida
-            self.icone_vida = pygame.image.load('assets/vida.png').convert_alpha()
+            self.icone_vida = self._carregar('assets/vida.png')
             
         except FileNotFoundError as e:
             pygame.quit()
@@ -131,7 +185,7 @@ class Assets:
             frame = sprite_sheet.subsurface(
                 (i * SPRITE_LARGURA, 0, SPRITE_LARGURA, SPRITE_ALTURA)
             )
-            frames.append(frame)
+            frames.append(self.memoria.registrar(frame, 'assets'))
         return frames
     
     def _extrair_frames_moeda(self, sprite_sheet, num_frames):
@@ -141,6 +195,74 @@ class Assets:
             frame = sprite_sheet.subsurface(
                 (i * 16, 0, 16, 16)
             )
-            frames.append(frame)
+            frames.append(self.memoria.registrar(frame, 'assets'))
         return frames
     
+    def _carregar(self, caminho):
+        """Carrega uma imagem com transparência e registra na contabilidade"""
+        imagem = self._pacote.get(caminho)
+        if imagem is None:
+            superficie = pygame.image.load(caminho)
+            self._pacote_desatualizado = True
+        else:
+            largura, altura, pixels = imagem
+            superficie = pygame.image.frombuffer(pixels, (largura, altura), 'RGBA')
+        self._lidas[caminho] = superficie
+        return self.memoria.registrar(superficie.convert_alpha(), 'assets')
+    
+    def meteoro_rotacionado(self, angulo):
+        """Retorna os frames do meteoro girados, agrupando ângulos em baldes"""
+        balde = round(angulo / ROTACAO_METEORO_PASSO) * ROTACAO_METEORO_PASSO
+        sprites = self._cache_rotacao_meteoro.get(balde)
+        if sprites is None:
+            # pygame.transform.rotate gira no sentido anti-horário
+            sprites = [pygame.transform.rotate(sprite, balde) for sprite in self.meteoro_sprites]
+            self._cache_rotacao_meteoro[balde] = sprites
+            for sprite_rot in sprites:
+                self.memoria.registrar(
+                    sprite_rot, 'cache meteoro',
+                    lambda b=balde: self._cache_rotacao_meteoro.pop(b, None)
+                )
+        return sprites
+    
+    def mascaras_meteoro(self, angulo):
+        """Retorna as máscaras dos frames do meteoro girado (mesmos baldes)"""
+        balde = round(angulo / ROTACAO_METEORO_PASSO) * ROTACAO_METEORO_PASSO
+        mascaras = self._cache_mascaras_meteoro.get(balde)
+        if mascaras is None:
+            mascaras = [pygame.mask.from_surface(sprite) for sprite in self.meteoro_rotacionado(balde)]
+            self._cache_mascaras_meteoro[balde] = mascaras
+        return mascaras
+    
+    def mascara_dino(self, sprite, espelhado):
+        """Retorna a máscara de um frame do dino, recortada pela hitbox.
+        
+        O recorte garante que a colisão por pixel nunca seja mais larga que
+        a hitbox retangular (a hitbox não muda com o espelhamento).
+        """
+        chave = (id(sprite), espelhado)
+        entrada = self._cache_mascaras_dino.get(chave)
+        if entrada is None or entrada[0] is not sprite:
+            imagem = self.espelhado(sprite) if espelhado else sprite
+            mascara = pygame.mask.from_surface(imagem)
+            recorte = pygame.mask.Mask(mascara.get_size())
+            recorte.draw(
+                pygame.mask.Mask((HITBOX_LARGURA, HITBOX_ALTURA), fill=True),
+                (HITBOX_OFFSET_X, HITBOX_OFFSET_Y)
+            )
+            entrada = (sprite, mascara.overlap_mask(recorte, (0, 0)))
+            self._cache_mascaras_dino[chave] = entrada
+        return entrada[1]
+    
+    def espelhado(self, sprite):
+        """Retorna o sprite espelhado horizontalmente (com cache)"""
+        chave = id(sprite)
+        entrada = self._cache_espelhado.get(chave)
+        if entrada is None or entrada[0] is not sprite:
+            entrada = (sprite, pygame.transform.flip(sprite, True, False))
+            self._cache_espelhado[chave] = entrada
+            self.memoria.registrar(
+                entrada[1], 'cache espelho',
+                lambda c=chave: self._cache_espelhado.pop(c, None)
+            )
+        return entrada[1]
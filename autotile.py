@@ -0,0 +1,104 @@
+"""
+Autotiling: escolhe o sprite de cada tile a partir dos vizinhos sólidos
+"""
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# IDs dos tiles (índice nesta string); 0 é vazio
+TILES = '.GTEDLR<>'
+VAZIO, GRAMA, TERRA, PONTA_ESQ, PONTA_DIR, TERRA_ESQ_DIR, TERRA_DIR_ESQ, LATERAL_ESQ, LATERAL_DIR = range(9)
+
+# Bits da máscara de vizinhança
+N, L, S, O, NE, NO = 1, 2, 4, 8, 16, 32
+
+
+def _tile_para_mascara(mascara):
+    """Regra de escolha do tile sólido para uma máscara de vizinhos"""
+    if not mascara & N:
+        # Superfície: pontas quando só um dos lados está vazio
+        if mascara & L and not mascara & O:
+            return PONTA_ESQ
+        if mascara & O and not mascara & L:
+            return PONTA_DIR
+        return GRAMA
+    if not mascara & O:
+        return LATERAL_ESQ
+    if not mascara & L:
+        return LATERAL_DIR
+    # Cantos internos (degrau de grama na diagonal de cima)
+    if not mascara & NE:
+        return TERRA_ESQ_DIR
+    if not mascara & NO:
+        return TERRA_DIR_ESQ
+    return TERRA
+
+
+# Tabela de consulta: máscara (0..63) -> ID do tile
+LUT = bytes(_tile_para_mascara(mascara) for mascara in range(64))
+
+
+def autotile(solidos):
+    """Calcula os IDs de todos os tiles de uma grade sólido/vazio.
+
+    `solidos` é uma lista de bytearrays (0 = vazio) ou um array NumPy 2D.
+    Fora do mapa, as laterais e o fundo repetem a borda e o topo conta como
+    vazio. Retorna uma lista de bytearrays com os IDs.
+    """
+    if numpy is None:
+        return [
+            bytearray(
+                autotile_celula(solidos, col, row) for col in range(len(solidos[row]))
+            )
+            for row in range(len(solidos))
+        ]
+
+    if isinstance(solidos, numpy.ndarray):
+        grade = solidos.astype(bool)
+    else:
+        grade = numpy.frombuffer(b''.join(solidos), dtype=numpy.uint8)
+        grade = grade.reshape(len(solidos), -1).astype(bool)
+    # Borda de uma célula: topo vazio, laterais e fundo repetem a borda
+    p = numpy.pad(grade, 1, mode='edge')
+    p[0, :] = False
+
+    centro = p[1:-1, 1:-1]
+    mascara = (
+        p[:-2, 1:-1] * N
+        | p[1:-1, 2:] * L
+        | p[2:, 1:-1] * S
+        | p[1:-1, :-2] * O
+        | p[:-2, 2:] * NE
+        | p[:-2, :-2] * NO
+    ).astype(numpy.uint8)
+
+    ids = numpy.frombuffer(LUT, dtype=numpy.uint8)[mascara]
+    ids[~centro] = VAZIO
+    return [bytearray(linha.tobytes()) for linha in ids]
+
+
+def autotile_celula(solidos, col, row):
+    """Calcula o ID de um único tile (usado em edições locais)"""
+    linhas = len(solidos)
+    colunas = len(solidos[0])
+
+    def solido(c, r):
+        if r < 0:
+            return False
+        r = min(r, linhas - 1)
+        c = max(0, min(c, colunas - 1))
+        return bool(solidos[r][c])
+
+    if not solido(col, row):
+        return VAZIO
+
+    mascara = (
+        solido(col, row - 1) * N
+        | solido(col + 1, row) * L
+        | solido(col, row + 1) * S
+        | solido(col - 1, row) * O
+        | solido(col + 1, row - 1) * NE
+        | solido(col - 1, row - 1) * NO
+    )
+    return LUT[mascara]
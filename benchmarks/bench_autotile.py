@@ -0,0 +1,48 @@
+"""
+Tempo do autotiling vetorizado numa grade grande
+
+Uso: python benchmarks/bench_autotile.py [lado]
+"""
+import random
+import sys
+import tempfile
+import time
+
+from comum import iniciar_pygame, gerar_mapa
+from autotile import autotile, autotile_celula
+from assets import Assets
+from mapa import Mapa
+
+
+def main():
+    lado = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    rng = random.Random(0)
+
+    # Grade aleatória de colunas de terreno com buracos
+    solidos = []
+    for row in range(lado):
+        solidos.append(bytearray(rng.random() < row / lado for _ in range(lado)))
+
+    inicio = time.perf_counter()
+    ids = autotile(solidos)
+    duracao = time.perf_counter() - inicio
+    print(f"Autotiling de {lado}x{lado} ({lado * lado:,} tiles): {duracao * 1000:.1f} ms")
+
+    # Confere a versão vetorizada contra a regra célula a célula numa amostra
+    for _ in range(2000):
+        col, row = rng.randrange(lado), rng.randrange(lado)
+        assert ids[row][col] == autotile_celula(solidos, col, row), (col, row)
+    print("Amostra confere com autotile_celula -> OK")
+
+    # Mapa gerado só com '#' (sprites escolhidos no carregamento)
+    iniciar_pygame()
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+        caminho = gerar_mapa(f.name, 2000, automatico=True)
+    inicio = time.perf_counter()
+    Mapa(caminho, Assets())
+    print(f"Carregar mapa automático de 2000 colunas: {(time.perf_counter() - inicio) * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
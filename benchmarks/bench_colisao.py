@@ -0,0 +1,96 @@
+"""
+Custo da colisão meteoro-jogador com centenas de meteoros perto do jogador:
+só hitboxes, retângulos + máscaras em cache e máscaras geradas a cada teste
+
+Uso: python benchmarks/bench_colisao.py [meteoros ...]
+"""
+import random
+import sys
+import time
+
+from comum import iniciar_pygame
+import pygame
+from assets import Assets
+from eventos import BarramentoEventos
+from jogador import Jogador
+from meteoro import GerenciadorMeteoros, Meteoro
+
+TICKS = 300
+RAIO = 48  # Meteoros espalhados até RAIO pixels do jogador
+
+
+def espalhar(gerenciador, assets, quantidade, jogador, rng):
+    """Cria meteoros com ângulos variados em volta do jogador"""
+    gerenciador.meteoros = [
+        Meteoro(
+            jogador.x + rng.uniform(-RAIO, RAIO), jogador.y + rng.uniform(-RAIO, RAIO),
+            rng.uniform(-3, 3), rng.uniform(1, 5), assets
+        )
+        for _ in range(quantidade)
+    ]
+    for meteoro in gerenciador.meteoros:
+        meteoro.frame_atual = rng.randrange(3)
+
+
+def mascara_sem_cache(jogador):
+    """Como seria sem o cache: máscara do dino gerada a cada teste"""
+    jogador.assets._cache_mascaras_dino.clear()
+    return jogador.get_mascara()
+
+
+def medir(gerenciador, jogador, modo):
+    """Tempo médio por tick (µs) e colisões detectadas"""
+    colisoes = []
+    gerenciador.eventos = BarramentoEventos()
+    gerenciador.eventos.emitir = colisoes.append
+    hitbox = jogador.get_hitbox()
+    inicio = time.perf_counter()
+    for tick in range(TICKS):
+        if modo == 'retangulos':
+            mascara = None
+        elif modo == 'mascaras':
+            mascara = jogador.get_mascara()
+        else:
+            mascara = mascara_sem_cache(jogador)
+            for meteoro in gerenciador.meteoros:
+                meteoro.mascaras = [
+                    pygame.mask.from_surface(sprite) for sprite in meteoro.sprites_rotacionados
+                ]
+        gerenciador.verificar_colisao_jogador(hitbox, mascara)
+    duracao = time.perf_counter() - inicio
+    return duracao / TICKS * 1e6, len(colisoes) // TICKS
+
+
+def contar_testes_de_pixel(gerenciador, jogador):
+    """Quantos meteoros passam do teste de retângulos (candidatos à máscara)"""
+    hitbox = jogador.get_hitbox()
+    candidatos = 0
+    for meteoro in gerenciador.meteoros:
+        largura, altura = meteoro.mascaras[meteoro.frame_atual].get_size()
+        x = int(meteoro.x) + meteoro.largura // 2 - largura // 2
+        y = int(meteoro.y) + meteoro.altura // 2 - altura // 2
+        candidatos += hitbox.colliderect((x, y, largura, altura))
+    return candidatos
+
+
+def main():
+    quantidades = [int(n) for n in sys.argv[1:]] or [100, 300, 1000]
+    iniciar_pygame()
+    assets = Assets()
+    jogador = Jogador(100, 100, assets)
+    gerenciador = GerenciadorMeteoros(assets, 10000, BarramentoEventos(), semente=0)
+
+    for quantidade in quantidades:
+        espalhar(gerenciador, assets, quantidade, jogador, random.Random(quantidade))
+        candidatos = contar_testes_de_pixel(gerenciador, jogador)
+        print(f"{quantidade} meteoros ({candidatos} passam do teste de retângulos):")
+        for modo in ('retangulos', 'mascaras', 'sem cache'):
+            # Mesma disposição em todos os modos
+            espalhar(gerenciador, assets, quantidade, jogador, random.Random(quantidade))
+            por_tick, colisoes = medir(gerenciador, jogador, modo)
+            print(f"  {modo:>10}: {por_tick:8.1f} µs/tick, {colisoes} colisões")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
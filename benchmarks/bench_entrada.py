@@ -0,0 +1,107 @@
+"""
+Latência entrada-tela: loop antigo (eventos só no começo do frame e espera
+depois do flip) contra o loop com leitura contínua e início tardio do frame
+
+O driver dummy não tem vsync, então o flip é trocado por um que espera o
+próximo quadro de um monitor de 60 Hz. Uma thread posta teclas de pulo em
+instantes aleatórios com o instante real de cada uma. Depois de um
+aquecimento fora da medida, os dois loops se alternam em RODADAS rodadas
+(a mesma sequência de teclas para os dois em cada rodada). Falha se a
+mediana dos p95 do loop novo passar da do antigo mais MARGEM_MS, para que
+o ruído do escalonador numa rodada não derrube o teste.
+
+Uso: python benchmarks/bench_entrada.py [frames por rodada]
+"""
+import random
+import statistics
+import sys
+import threading
+import time
+
+import comum  # noqa: F401 (modo headless)
+import pygame
+import main
+from main import Jogo
+
+PERIODO_MONITOR = 1 / 60
+AQUECIMENTO = 120  # Frames de cada loop antes das rodadas medidas
+RODADAS = 5
+MARGEM_MS = 1.0  # Folga da mediana dos p95 do loop novo sobre a do antigo
+
+
+def flip_com_vsync(flip_original):
+    """Flip que bloqueia até o próximo quadro do monitor simulado"""
+    def flip():
+        flip_original()
+        agora = time.perf_counter()
+        time.sleep(PERIODO_MONITOR - agora % PERIODO_MONITOR)
+    return flip
+
+
+def postar_teclas(parar, semente):
+    """Posta KEYDOWN/KEYUP de pulo a cada 20-120 ms até `parar`"""
+    rng = random.Random(semente)
+    while not parar.is_set():
+        time.sleep(rng.uniform(0.02, 0.12))
+        instante = time.perf_counter()
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE, instante=instante))
+        pygame.event.post(pygame.event.Event(pygame.KEYUP, key=pygame.K_SPACE, instante=instante))
+
+
+def loop_antigo(jogo, frames):
+    """Frame seguido de Clock.tick, como antes"""
+    relogio = pygame.time.Clock()
+    for _ in range(frames):
+        jogo.executar_frame()
+        relogio.tick(main.FPS)
+
+
+def loop_novo(jogo, frames):
+    jogo.rodar(frames)
+
+
+def medir(jogo, loop, frames, semente=1):
+    """Mediana e p95 (ms) da latência das teclas postadas durante o loop"""
+    jogo.entrada.latencias.clear()
+    parar = threading.Event()
+    thread = threading.Thread(target=postar_teclas, args=(parar, semente))
+    thread.start()
+    try:
+        loop(jogo, frames)
+    finally:
+        parar.set()
+        thread.join()
+    ordenadas = sorted(jogo.entrada.latencias)
+    return len(ordenadas), ordenadas[len(ordenadas) // 2], ordenadas[int(len(ordenadas) * 0.95)]
+
+
+def main_bench():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    pygame.display.flip = flip_com_vsync(pygame.display.flip)
+    main.FPS = 60
+    # O driver dummy não aceita vsync na tela (e só uma tela SCALED pode ser
+    # criada): o mesmo jogo serve às duas medições e o flip acima faz o vsync
+    main.VSYNC = False
+    jogo = Jogo(semente=0)
+    main.VSYNC = True
+
+    loops = (('antigo', loop_antigo), ('novo', loop_novo))
+    for _, loop in loops:
+        medir(jogo, loop, AQUECIMENTO)
+
+    p95s = {nome: [] for nome, _ in loops}
+    for rodada in range(1, RODADAS + 1):
+        for nome, loop in loops:
+            teclas, mediana, p95 = medir(jogo, loop, frames, rodada)
+            p95s[nome].append(p95)
+            print(f"Rodada {rodada}, loop {nome}: {teclas} teclas, mediana {mediana:.1f} ms, p95 {p95:.1f} ms")
+    antigo = statistics.median(p95s['antigo'])
+    novo = statistics.median(p95s['novo'])
+    ok = novo <= antigo + MARGEM_MS
+    print(f"Mediana dos p95: {antigo:.1f} -> {novo:.1f} ms (limite {antigo + MARGEM_MS:.1f} ms) -> "
+          f"{'OK' if ok else 'FALHOU'}")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main_bench())
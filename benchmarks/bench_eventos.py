@@ -0,0 +1,80 @@
+"""
+Vazão do barramento de eventos e coleta de milhares de moedas num único tick
+
+Uso: python benchmarks/bench_eventos.py [eventos]
+"""
+import sys
+import time
+
+from comum import iniciar_pygame
+import pygame
+from assets import Assets
+from eventos import BarramentoEventos, MoedaColetada
+from moeda import GerenciadorMoedas
+from placar import Placar
+from config import PONTOS_POR_MOEDA
+
+MOEDAS_RAJADA = 5000
+
+
+def medir_vazao(total):
+    """Eventos por segundo emitidos e despachados (3 inscritos, lotes de 100)"""
+    eventos = BarramentoEventos()
+    recebidos = [0]
+
+    def contar(lote):
+        recebidos[0] += len(lote)
+
+    for _ in range(3):
+        eventos.inscrever(MoedaColetada, contar)
+
+    evento = MoedaColetada(0, 0, PONTOS_POR_MOEDA)
+    inicio = time.perf_counter()
+    for i in range(total):
+        eventos.emitir(evento)
+        if i % 100 == 99:
+            eventos.despachar()
+    eventos.despachar()
+    duracao = time.perf_counter() - inicio
+
+    assert recebidos[0] == total * 3
+    return total / duracao
+
+
+def verificar_rajada():
+    """Milhares de moedas coletadas no mesmo tick chegam num único lote"""
+    assets = Assets()
+    eventos = BarramentoEventos()
+    moedas = GerenciadorMoedas(assets, 1000, eventos)
+    placar = Placar()
+    lotes = []
+
+    eventos.inscrever(MoedaColetada, lotes.append)
+    eventos.inscrever(MoedaColetada, placar.ao_coletar_moedas)
+
+    for _ in range(MOEDAS_RAJADA):
+        moedas.adicionar_moeda(50, 50)
+
+    inicio = time.perf_counter()
+    moedas.verificar_colisao_jogador(pygame.Rect(40, 40, 20, 20))
+    eventos.despachar()
+    duracao = time.perf_counter() - inicio
+
+    assert len(lotes) == 1, f"esperado 1 lote, recebidos {len(lotes)}"
+    assert len(lotes[0]) == MOEDAS_RAJADA
+    assert placar.pontos == MOEDAS_RAJADA * PONTOS_POR_MOEDA
+    return duracao
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    iniciar_pygame()
+
+    print(f"Vazão: {medir_vazao(total):,.0f} eventos/s")
+    duracao = verificar_rajada()
+    print(f"Rajada de {MOEDAS_RAJADA} moedas: 1 lote em {duracao * 1000:.2f} ms -> OK")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
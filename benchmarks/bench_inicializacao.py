@@ -0,0 +1,112 @@
+"""
+Tempo até o primeiro frame: carregamento antigo (pygame com pkg_resources,
+PNGs e mapa inteiro pré-renderizado) contra o pacote de assets, os chunks
+sob demanda e o pygame sem pkg_resources
+
+Cada medida é a mediana de processos novos (python lancador.py --bench 1).
+Falha (código 1) se, em algum mapa, o carregamento novo não chegar ao
+primeiro frame antes do antigo.
+
+Uso: python benchmarks/bench_inicializacao.py [repetições]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from comum import RAIZ, gerar_mapa
+
+ANTIGA = 'pkg_resources + PNGs + mapa inteiro'
+NOVA = 'pacote + sob demanda'
+CONFIGURACOES = {
+    ANTIGA: {'PACOTE_ASSETS': '', 'MAPA_CHUNKS_SOB_DEMANDA': False, 'PYGAME_SEM_PKG_RESOURCES': False},
+    NOVA: {},
+}
+
+
+def medir(mapa, perfil, repeticoes):
+    """Mediana de cada etapa e do tempo total do processo (ms)"""
+    etapas = {}
+    totais = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        saida = subprocess.run(
+            [sys.executable, os.path.join(RAIZ, 'lancador.py'), '--headless', '--bench', '1',
+             '--linha-do-tempo', '--mapa', mapa, '--perfil', perfil],
+            capture_output=True, text=True, check=True
+        ).stdout
+        totais.append((time.perf_counter() - inicio) * 1000)
+        # Linhas "etapa: X ms" da --linha-do-tempo (as demais são do --bench)
+        for linha in saida.splitlines():
+            etapa, _, valor = linha.partition(': ')
+            numero, _, unidade = valor.partition(' ')
+            if unidade == 'ms' and etapa != 'total':
+                etapas.setdefault(etapa, []).append(float(numero))
+    return {etapa: statistics.median(v) for etapa, v in etapas.items()}, statistics.median(totais)
+
+
+def medir_init(repeticoes):
+    """pygame.init() completo contra só display e fonte, em processos novos (ms)"""
+    codigo = (
+        "import time, pygame\n"
+        "inicio = time.perf_counter()\n"
+        "{}\n"
+        "print((time.perf_counter() - inicio) * 1000)"
+    )
+    resultados = {}
+    for nome, chamada in (
+        ('pygame.init()', 'pygame.init()'),
+        ('display + font', 'pygame.display.init(); pygame.font.init()'),
+    ):
+        tempos = [
+            float(subprocess.run(
+                [sys.executable, '-c', codigo.format(chamada)],
+                capture_output=True, text=True, check=True
+            ).stdout)
+            for _ in range(repeticoes)
+        ]
+        resultados[nome] = statistics.median(tempos)
+    return resultados
+
+
+def main():
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+
+    # O pacote é gerado na primeira execução; essa não entra na medida
+    subprocess.run(
+        [sys.executable, os.path.join(RAIZ, 'pacote_assets.py')], capture_output=True, check=True
+    )
+
+    sem_ganho = []
+    with tempfile.TemporaryDirectory() as pasta:
+        mapas = {'mapa1.txt': 'mapa1.txt', '4000 colunas': gerar_mapa(os.path.join(pasta, 'grande.txt'), 4000)}
+        for nome_mapa, mapa in mapas.items():
+            print(f"Mapa {nome_mapa}:")
+            ate_frame_por_configuracao = {}
+            for nome, valores in CONFIGURACOES.items():
+                perfil = os.path.join(pasta, 'perfil.json')
+                with open(perfil, 'w') as f:
+                    json.dump(valores, f)
+                etapas, total = medir(mapa, perfil, repeticoes)
+                ate_frame = sum(etapas.values())
+                detalhes = '  '.join(f"{etapa} {ms:.1f}" for etapa, ms in etapas.items())
+                print(f"  {nome}: primeiro frame em {ate_frame:.1f} ms (processo {total:.0f} ms)")
+                print(f"    {detalhes}")
+                ate_frame_por_configuracao[nome] = ate_frame
+            if ate_frame_por_configuracao[NOVA] >= ate_frame_por_configuracao[ANTIGA]:
+                sem_ganho.append(nome_mapa)
+
+    for nome, ms in medir_init(repeticoes).items():
+        print(f"{nome}: {ms:.2f} ms")
+
+    if sem_ganho:
+        print(f"FALHA: primeiro frame não ficou mais rápido em: {', '.join(sem_ganho)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
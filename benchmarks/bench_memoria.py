@@ -0,0 +1,61 @@
+"""
+Compara a contabilidade de superfícies com o RSS do processo ao carregar um mapa grande
+
+Uso: python benchmarks/bench_memoria.py [colunas]
+"""
+import resource
+import sys
+import tempfile
+import tracemalloc
+
+from comum import iniciar_pygame, gerar_mapa
+from assets import Assets
+from mapa import Mapa
+
+TOLERANCIA = 0.15
+
+
+def rss_bytes():
+    """RSS atual do processo (Linux)"""
+    with open('/proc/self/statm') as f:
+        paginas = int(f.read().split()[1])
+    return paginas * resource.getpagesize()
+
+
+def main():
+    colunas = int(sys.argv[1]) if len(sys.argv) > 1 else 4000
+    iniciar_pygame()
+    assets = Assets()
+
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+        caminho = gerar_mapa(f.name, colunas)
+
+    tracemalloc.start()
+    antes_contabilidade = assets.memoria.total_bytes
+    antes_rss = rss_bytes()
+
+    mapa = Mapa(caminho, assets)
+    # Todos os chunks, não só os que já apareceram na tela
+    mapa.chunks = mapa._pre_renderizar()
+
+    depois_rss = rss_bytes()
+    python_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    reportado = assets.memoria.total_bytes - antes_contabilidade
+    # Os pixels são alocados pelo SDL (fora do tracemalloc); descontamos
+    # do RSS o que foi alocado pelo Python (dados do mapa, moedas)
+    medido = depois_rss - antes_rss - python_bytes
+    erro = abs(reportado - medido) / max(medido, 1)
+
+    print(f"Mapa: {colunas} colunas ({mapa.largura_px}x{mapa.altura_px} px)")
+    for linha in assets.memoria.relatorio():
+        print(f"  {linha}")
+    print(f"Reportado:  {reportado / 2**20:8.2f} MB")
+    print(f"RSS - heap Python: {medido / 2**20:8.2f} MB (heap Python {python_bytes / 2**20:.2f} MB)")
+    print(f"Diferença: {erro:.1%} -> {'OK' if erro <= TOLERANCIA else 'FALHOU'}")
+    return 0 if erro <= TOLERANCIA else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
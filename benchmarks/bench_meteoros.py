@@ -0,0 +1,58 @@
+"""
+Custo por frame dos meteoros sob uma curva de dificuldade pesada
+
+Uso: python benchmarks/bench_meteoros.py [frames]
+"""
+import sys
+import time
+
+from comum import iniciar_pygame
+from assets import Assets
+from eventos import BarramentoEventos
+from mapa import Mapa
+from meteoro import GerenciadorMeteoros, AgendaMeteoros
+
+# Começa com um spawn a cada 2-6 frames e chega a um por frame
+CURVA_PESADA = ((2, 6), (1, 1), 1200)
+LIMITE = 200
+
+
+def simular(mapa, assets, frames):
+    """Roda os meteoros sobre o mapa e conta as consultas à grade de colisão"""
+    gerenciador = GerenciadorMeteoros(assets, mapa.largura_px, BarramentoEventos(), semente=0)
+    gerenciador.agenda = AgendaMeteoros(gerenciador.rng, *CURVA_PESADA)
+    gerenciador.max_simultaneos = LIMITE
+
+    consultas = [0]
+    consultar = mapa.get_retangulos_colisao
+
+    def contar(rect):
+        consultas[0] += 1
+        return consultar(rect)
+
+    mapa.get_retangulos_colisao = contar
+    camera_x = 0
+    inicio = time.perf_counter()
+    for frame in range(frames):
+        camera_x = (camera_x + 2) % (mapa.largura_px - 320)
+        gerenciador.atualizar(mapa, camera_x)
+    duracao = time.perf_counter() - inicio
+    del mapa.get_retangulos_colisao
+    return duracao / frames, consultas[0] / frames, gerenciador
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    iniciar_pygame()
+    assets = Assets()
+    mapa = Mapa('mapa1.txt', assets)
+
+    por_frame, consultas, gerenciador = simular(mapa, assets, frames)
+    print(f"{por_frame * 1000:.3f} ms/frame, {consultas:.1f} consultas ao mapa/frame")
+    for linha in gerenciador.linhas_estatisticas():
+        print(f"  {linha}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+Memória por moeda e custo por tick: objetos Moeda contra arrays compactos
+
+Uso: python benchmarks/bench_moedas.py [moedas]
+"""
+import math
+import random
+import sys
+import tracemalloc
+
+from comum import iniciar_pygame, cronometrar
+import pygame
+from assets import Assets
+from eventos import BarramentoEventos
+from moeda import GerenciadorMoedas
+from config import LARGURA_VIRTUAL, ALTURA_VIRTUAL
+
+
+class MoedaObjeto:
+    """Referência: uma moeda por objeto, como era antes"""
+
+    def __init__(self, x, y, sprites):
+        self.x = x
+        self.y = y
+        self.y_original = y
+        self.sprites = sprites
+        self.frame_atual = 0
+        self.contador_animacao = 0
+        self.velocidade_animacao = 10
+        self.tempo_flutuacao = 0
+        self.ativo = True
+        self.coletado = False
+
+    def atualizar(self):
+        self.contador_animacao += 1
+        if self.contador_animacao >= self.velocidade_animacao:
+            self.contador_animacao = 0
+            self.frame_atual = (self.frame_atual + 1) % len(self.sprites)
+        self.tempo_flutuacao += 0.1
+        self.y = self.y_original + math.sin(self.tempo_flutuacao) * 2
+
+    def get_hitbox(self):
+        return pygame.Rect(self.x - 8, self.y - 8, 16, 16)
+
+
+def tick_objetos(moedas, hitbox, tela, camera_x):
+    """Um tick da versão antiga: atualiza, colide e desenha todas"""
+    for moeda in moedas:
+        moeda.atualizar()
+    for moeda in moedas:
+        if moeda.ativo and hitbox.colliderect(moeda.get_hitbox()):
+            moeda.ativo = False
+    for moeda in moedas:
+        if moeda.ativo:
+            tela.blit(moeda.sprites[moeda.frame_atual], (int(moeda.x - 8 - camera_x), int(moeda.y - 8)))
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    iniciar_pygame()
+    assets = Assets()
+    tela = pygame.Surface((LARGURA_VIRTUAL, ALTURA_VIRTUAL)).convert()
+
+    rng = random.Random(0)
+    largura = total * 4
+    posicoes = [(rng.randrange(largura), rng.randrange(ALTURA_VIRTUAL)) for _ in range(total)]
+    camera_x = largura // 2
+    hitbox = pygame.Rect(camera_x + 100, 80, 14, 19)
+
+    tracemalloc.start()
+    objetos = [MoedaObjeto(x, y, assets.moeda_sprites) for x, y in posicoes]
+    memoria_objetos = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    gerenciador = GerenciadorMoedas(assets, largura, BarramentoEventos())
+    for x, y in posicoes:
+        gerenciador.adicionar_moeda(x, y)
+    memoria_arrays = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    def tick_arrays():
+        gerenciador.atualizar(camera_x)
+        gerenciador.verificar_colisao_jogador(hitbox)
+        gerenciador.desenhar(tela, camera_x, 0)
+
+    tempo_objetos = cronometrar(lambda: tick_objetos(objetos, hitbox, tela, camera_x), 5)
+    tempo_arrays = cronometrar(tick_arrays, 200)
+
+    print(f"{total:,} moedas")
+    print(f"Memória por moeda: objetos {memoria_objetos / total:6.1f} B | "
+          f"arrays {memoria_arrays / total:6.1f} B ({memoria_objetos / memoria_arrays:.0f}x menos)")
+    print(f"Tick (atualizar + colisão + desenho): objetos {tempo_objetos * 1000:8.3f} ms | "
+          f"arrays {tempo_arrays * 1000:8.3f} ms ({tempo_objetos / tempo_arrays:,.0f}x)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""
+Grafo de navegação: tempo de construção, consultas de caminho (sem e com
+cache), a primeira consulta depois de uma cratera (set_tile) e o piloto
+automático coletando todas as moedas do mapa1. Falha se uma consulta sem
+cache passar de LIMITE_CONSULTA_MS, se a consulta depois de uma cratera
+passar de LIMITE_ALTERACAO_MS ou se o piloto deixar moedas para trás.
+
+Uso: python benchmarks/bench_navegacao.py
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from comum import iniciar_pygame, gerar_mapa, cronometrar
+import pygame
+from assets import Assets
+from mapa import Mapa
+from navegacao import GrafoNavegacao, x_em_pe, y_em_pe
+
+COLUNAS_GERADAS = (1_000, 10_000)
+CONSULTAS = 2000  # Consultas de próxima moeda medidas por mapa
+LIMITE_DEMO = 20_000  # Frames do piloto antes de desistir
+LIMITE_CONSULTA_MS = 1.0  # Teto de uma consulta sem cache, em qualquer mapa
+REPETICOES_PIOR_CASO = 5
+ALTERACOES = 20  # Crateras por mapa na medida da consulta depois de set_tile
+LIMITE_ALTERACAO_MS = 10.0  # Teto da mediana dessa consulta (inclui refazer o grafo)
+
+
+def medir_construcao(mapa):
+    inicio = time.perf_counter()
+    grafo = GrafoNavegacao(mapa)
+    return grafo, (time.perf_counter() - inicio) * 1000
+
+
+def medir_consultas(grafo):
+    """µs por consulta da próxima moeda (todas restantes) a partir de cada
+    segmento, sem e com os caches (média e pior consulta sem cache)"""
+    origens = [(x_em_pe(segmento.inicio), y_em_pe(segmento.linha)) for segmento in grafo.segmentos]
+    moedas = set(grafo.alvos_moedas)
+
+    def consultar_todas():
+        for x, y in origens:
+            grafo.caminho_proxima_moeda(x, y, moedas)
+
+    pior = 0.0
+
+    def sem_cache():
+        nonlocal pior
+        for x, y in origens:
+            grafo.caminhos.clear()
+            grafo.proximas.clear()
+            inicio = time.perf_counter()
+            grafo.caminho_proxima_moeda(x, y, moedas)
+            pior = max(pior, time.perf_counter() - inicio)
+
+    repeticoes = max(1, CONSULTAS // len(origens))
+    sem = cronometrar(sem_cache, repeticoes) / len(origens) * 1e6
+    consultar_todas()
+    com = cronometrar(consultar_todas, repeticoes) / len(origens) * 1e6
+    return sem, com, pior * 1e6
+
+
+def medir_pior_caso(grafo):
+    """ms do caminho do segmento mais à esquerda até a moeda alcançável mais
+    distante (o começo do caminho, se ela estiver além do limite da busca);
+    mediana de REPETICOES_PIOR_CASO consultas"""
+    origem = min(grafo.segmentos, key=lambda segmento: segmento.inicio)
+    x, y = x_em_pe(origem.inicio), y_em_pe(origem.linha)
+    for posicao in sorted(grafo.alvos_moedas, key=lambda p: -grafo.alvos_moedas[p].coluna):
+        tempos = []
+        for _ in range(REPETICOES_PIOR_CASO):
+            grafo.caminhos.clear()
+            grafo.proximas.clear()
+            inicio = time.perf_counter()
+            plano = grafo.caminho_proxima_moeda(x, y, {posicao})
+            tempos.append((time.perf_counter() - inicio) * 1000)
+        if plano is not None:
+            return statistics.median(tempos), len(plano[2])
+    return 0.0, 0
+
+
+def medir_apos_alteracao(mapa, grafo):
+    """ms da próxima moeda logo depois de abrir uma cratera no chão de um
+    segmento (o grafo é refeito na consulta); mediana e pior de ALTERACOES
+    crateras em colunas sorteadas, cada uma desfeita antes da seguinte"""
+    rng = random.Random(0)
+    origem = min(grafo.segmentos, key=lambda segmento: segmento.inicio)
+    x, y = x_em_pe(origem.inicio), y_em_pe(origem.linha)
+    moedas = set(grafo.alvos_moedas)
+    tempos = []
+    for _ in range(ALTERACOES):
+        segmento = rng.choice([s for s in grafo.segmentos if s is not origem and s.linha >= 0])
+        col = rng.randint(segmento.inicio, segmento.fim)
+        original = mapa.dados[segmento.linha][col]
+        mapa.set_tile(col, segmento.linha, '.')
+        inicio = time.perf_counter()
+        grafo.caminho_proxima_moeda(x, y, moedas)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+        mapa.set_tile(col, segmento.linha, original)
+        grafo.segmento_em(x, y)  # Refaz o grafo fora da medida
+    return statistics.median(tempos), max(tempos)
+
+
+def demonstrar_piloto():
+    """Roda o jogo com o piloto no mapa1 (sem meteoros) até coletar todas as moedas"""
+    from main import Jogo
+    from piloto import PilotoAutomatico
+
+    jogo = Jogo('mapa1.txt', 0)
+    jogo.gerenciador_meteoros.spawn_local = False
+    jogo.entrada = piloto = PilotoAutomatico(jogo)
+    total = len(jogo.mapa.posicoes_moedas)
+    for frame in range(1, LIMITE_DEMO + 1):
+        jogo.executar_frame()
+        if not any(jogo.gerenciador_moedas.ativas):
+            break
+    restantes = sum(1 for ativa in jogo.gerenciador_moedas.ativas if ativa)
+    pygame.display.quit()
+    return total, restantes, frame, piloto.planejamentos
+
+
+def main():
+    iniciar_pygame()
+    assets = Assets()
+
+    mapas = [('mapa1', 'mapa1.txt')]
+    diretorio = tempfile.mkdtemp()
+    for colunas in COLUNAS_GERADAS:
+        caminho = gerar_mapa(os.path.join(diretorio, f'{colunas}.txt'), colunas, semente=3)
+        mapas.append((f'{colunas} colunas', caminho))
+
+    lentos = []
+    for nome, caminho in mapas:
+        mapa = Mapa(caminho, assets)
+        grafo, construcao = medir_construcao(mapa)
+        mapa.navegacao = grafo
+        mapa.ouvintes_alteracao.append(grafo.ao_alterar_regiao)
+        arestas = sum(len(segmento.arestas) for segmento in grafo.segmentos)
+        print(f"{nome}: construção {construcao:.1f} ms ({len(grafo.segmentos)} segmentos, "
+              f"{arestas} arestas, {len(grafo.alvos_moedas)} moedas alcançáveis)")
+        sem_cache, com_cache, pior_consulta = medir_consultas(grafo)
+        print(f"  próxima moeda: {sem_cache:.0f} µs sem cache (pior {pior_consulta:.0f} µs), "
+              f"{com_cache:.1f} µs com cache")
+        pior, saltos = medir_pior_caso(grafo)
+        print(f"  moeda mais distante ({saltos} arestas): {pior:.2f} ms sem cache")
+        if max(pior_consulta / 1000, pior) >= LIMITE_CONSULTA_MS:
+            lentos.append(nome)
+        mediana, pior_alteracao = medir_apos_alteracao(mapa, grafo)
+        print(f"  próxima moeda logo após set_tile: {mediana:.2f} ms (pior {pior_alteracao:.2f} ms, "
+              f"{grafo.construcoes} construção completa)")
+        if mediana >= LIMITE_ALTERACAO_MS:
+            lentos.append(f"{nome} (após set_tile)")
+    pygame.display.quit()
+
+    total, restantes, frames, planejamentos = demonstrar_piloto()
+    print(f"Piloto no mapa1: {total - restantes}/{total} moedas em {frames} frames "
+          f"({frames / 60:.1f} s de jogo, {planejamentos} planejamentos)")
+    pygame.quit()
+    if lentos:
+        print(f"FALHOU: consulta acima do limite em {', '.join(lentos)}")
+    return 0 if restantes == 0 and not lentos else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+Custo de atualizar e desenhar 10k e 100k partículas vivas (arrays NumPy)
+contra partículas como objetos Python desenhadas com set_at
+
+Uso: python benchmarks/bench_particulas.py [ticks]
+"""
+import random
+import sys
+import time
+
+from comum import iniciar_pygame
+import pygame
+from config import LARGURA_VIRTUAL, ALTURA_VIRTUAL
+from particulas import SistemaParticulas, CORES_IMPACTO
+
+QUANTIDADES = (10_000, 100_000)
+VIDA_LONGA = (10 ** 6, 10 ** 6 + 1)  # Ninguém morre durante a medição
+
+
+class ParticulaObjeto:
+    """Uma partícula por objeto, como seria sem o sistema vetorizado"""
+
+    __slots__ = ('x', 'y', 'vx', 'vy', 'vida', 'cor')
+
+    def __init__(self, x, y, vx, vy, vida, cor):
+        self.x = x
+        self.y = y
+        self.vx = vx
+        self.vy = vy
+        self.vida = vida
+        self.cor = cor
+
+
+def medir_vetorizado(quantidade, ticks, tela):
+    sistema = SistemaParticulas(quantidade, semente=0)
+    sistema.gravidade = 0.0
+    inicio = time.perf_counter()
+    sistema.emitir(LARGURA_VIRTUAL / 2, ALTURA_VIRTUAL / 2, quantidade, 0.3, CORES_IMPACTO, vida=VIDA_LONGA)
+    emissao = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for _ in range(ticks):
+        sistema.atualizar()
+        sistema.desenhar(tela, 0, 0)
+    duracao = (time.perf_counter() - inicio) / ticks
+    return emissao, duracao
+
+
+def medir_objetos(quantidade, ticks, tela):
+    rng = random.Random(0)
+    particulas = [
+        ParticulaObjeto(
+            LARGURA_VIRTUAL / 2, ALTURA_VIRTUAL / 2, rng.uniform(-0.3, 0.3), rng.uniform(-0.3, 0.3),
+            VIDA_LONGA[0], rng.choice(CORES_IMPACTO)
+        )
+        for _ in range(quantidade)
+    ]
+    inicio = time.perf_counter()
+    for _ in range(ticks):
+        for p in particulas:
+            p.x += p.vx
+            p.y += p.vy
+            p.vida -= 1
+        for p in particulas:
+            if 0 <= p.x < LARGURA_VIRTUAL and 0 <= p.y < ALTURA_VIRTUAL:
+                tela.set_at((int(p.x), int(p.y)), p.cor)
+    return (time.perf_counter() - inicio) / ticks
+
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    iniciar_pygame()
+    # Mesmo formato da superfície virtual do jogo
+    tela = pygame.Surface((LARGURA_VIRTUAL, ALTURA_VIRTUAL))
+
+    for quantidade in QUANTIDADES:
+        emissao, duracao = medir_vetorizado(quantidade, ticks, tela)
+        print(f"{quantidade:>7} partículas: emissão {emissao * 1000:.2f} ms, "
+              f"atualizar+desenhar {duracao * 1000:.3f} ms/tick")
+    duracao = medir_objetos(QUANTIDADES[0], max(1, ticks // 10), tela)
+    print(f"{QUANTIDADES[0]:>7} objetos Python: atualizar+desenhar {duracao * 1000:.3f} ms/tick")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""
+Custo por frame do pós-processamento com LUTs na superfície virtual
+(320x180) contra o overlay de Game Over criado a cada frame
+
+Uso: python benchmarks/bench_posprocessamento.py [repeticoes]
+"""
+import sys
+
+from comum import iniciar_pygame, cronometrar
+import pygame
+from config import LARGURA_VIRTUAL, ALTURA_VIRTUAL, FLASH_DANO_FRAMES
+from posprocessamento import PosProcessamento, numpy
+
+
+def overlay_por_frame(superficie):
+    """O Game Over antigo: uma superfície nova a cada frame"""
+    overlay = pygame.Surface((LARGURA_VIRTUAL, ALTURA_VIRTUAL))
+    overlay.set_alpha(128)
+    overlay.fill((0, 0, 0))
+    superficie.blit(overlay, (0, 0))
+
+
+def main():
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    if numpy is None:
+        print("Sem NumPy: o pós-processamento só escurece o Game Over")
+        return 1
+    iniciar_pygame()
+    # Mesmo formato da superfície virtual do jogo
+    tela = pygame.Surface((LARGURA_VIRTUAL, ALTURA_VIRTUAL))
+    pygame.surfarray.pixels3d(tela)[:] = numpy.random.default_rng(0).integers(
+        0, 256, (LARGURA_VIRTUAL, ALTURA_VIRTUAL, 3), dtype=numpy.uint8
+    )
+
+    pos = PosProcessamento()
+    casos = [
+        ('flash de dano', FLASH_DANO_FRAMES, 0.0, False),
+        ('céu escuro', 0, 1.0, False),
+        ('flash + céu', FLASH_DANO_FRAMES, 0.5, False),
+        ('game over', 0, 0.0, True),
+        ('todos', FLASH_DANO_FRAMES, 1.0, True),
+    ]
+    for nome, flash, densidade, game_over in casos:
+        pos.flash, pos.densidade = flash, densidade
+        pos.luts.clear()
+        primeira = cronometrar(lambda: pos.aplicar(tela, game_over), 1) * 1000
+        ms = cronometrar(lambda: pos.aplicar(tela, game_over), repeticoes) * 1000
+        print(f"{nome:<14} {ms:.3f} ms/frame (primeiro frame, com a LUT: {primeira:.3f} ms)")
+
+    pos.flash, pos.densidade = 0, 0.0
+    ms = cronometrar(lambda: pos.aplicar(tela), repeticoes) * 1000
+    print(f"{'sem efeitos':<14} {ms:.4f} ms/frame")
+    ms = cronometrar(lambda: overlay_por_frame(tela), repeticoes) * 1000
+    print(f"{'overlay antigo':<14} {ms:.3f} ms/frame")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+Latência da recarga do mapa (modo de desenvolvimento) num mapa grande:
+um tile, uma região e moedas, contra recarregar assets e mapa do zero.
+Falha se o frame de alguma recarga passar do orçamento de um quadro.
+
+Uso: python benchmarks/bench_recarga.py [colunas]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from comum import gerar_mapa
+import pygame
+from assets import Assets
+from mapa import Mapa
+from main import Jogo
+from recarga import RecargaMapa
+
+ORCAMENTO_MS = 1000 / 60
+
+
+def ler_linhas(caminho):
+    with open(caminho) as f:
+        return [list(linha.rstrip('\n')) for linha in f]
+
+
+def gravar(caminho, linhas):
+    with open(caminho, 'w') as f:
+        f.write('\n'.join(''.join(linha) for linha in linhas))
+    # Garante um mtime novo mesmo em sistemas de arquivos com resolução baixa
+    estado = os.stat(caminho)
+    os.utime(caminho, ns=(estado.st_atime_ns, estado.st_mtime_ns + 1_000_000))
+
+
+def editar_tile(linhas, col, row, tile):
+    linhas[row][col] = tile
+
+
+def editar_regiao(linhas, col, row, largura, altura):
+    """Inverte sólido/vazio num retângulo (uma plataforma vira buraco e vice-versa)"""
+    for r in range(row, row + altura):
+        for c in range(col, col + largura):
+            linhas[r][c] = '.' if linhas[r][c] in 'GTEDLR<>' else 'T'
+
+
+def editar_moedas(linhas, col, quantidade):
+    """Uma moeda a cada 4 colunas, duas linhas acima do chão"""
+    for c in range(col, col + 4 * quantidade, 4):
+        chao = next(r for r in range(len(linhas)) if linhas[r][c] != '.' and linhas[r][c] != 'C')
+        linhas[chao - 2][c] = 'C'
+
+
+def medir_recarga(jogo, caminho, linhas):
+    """Grava o arquivo e roda frames até a recarga; retorna (ms da recarga, ms do frame)"""
+    recargas = jogo.recarga.recargas
+    gravar(caminho, linhas)
+    for _ in range(60):
+        ms_frame = jogo.executar_frame()
+        if jogo.recarga.recargas != recargas:
+            return jogo.recarga.ultima, ms_frame
+    raise RuntimeError("o arquivo não foi recarregado")
+
+
+def conferir(jogo, caminho):
+    """O mapa recarregado tem que ser igual ao mapa carregado do zero"""
+    novo = Mapa(caminho, jogo.assets)
+    assert jogo.mapa.dados == novo.dados
+    assert jogo.mapa.tiles == novo.tiles
+    assert sorted(jogo.mapa.posicoes_moedas) == sorted(novo.posicoes_moedas)
+    moedas = jogo.gerenciador_moedas
+    assert sorted(zip(moedas.xs, moedas.ys)) == sorted(novo.posicoes_moedas)
+
+
+def main():
+    colunas = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    caminho = gerar_mapa(os.path.join(tempfile.mkdtemp(), 'grande.txt'), colunas, semente=5)
+
+    jogo = Jogo(caminho, 1)
+    jogo.gerenciador_meteoros.spawn_local = False
+    jogo.recarga = RecargaMapa(jogo, caminho)
+    for _ in range(60):
+        jogo.executar_frame()
+
+    linhas = ler_linhas(caminho)
+    altura = len(linhas)
+    edicoes = [
+        ('1 tile visível', lambda: editar_tile(linhas, 10, altura - 8, 'T')),
+        ('1 tile distante', lambda: editar_tile(linhas, colunas - 10, altura - 8, 'T')),
+        ('região 64x8', lambda: editar_regiao(linhas, 5, altura - 8, 64, 8)),
+        ('região 1000x16', lambda: editar_regiao(linhas, colunas // 2, 0, 1000, altura)),
+        ('20 moedas', lambda: editar_moedas(linhas, 40, 20)),
+    ]
+    print(f"Mapa de {colunas}x{altura} tiles")
+    perdidos = 0
+    for nome, editar in edicoes:
+        editar()
+        (ms, alterados, adicionadas, removidas), ms_frame = medir_recarga(jogo, caminho, linhas)
+        conferir(jogo, caminho)
+        print(f"  {nome:<16} recarga {ms:7.2f} ms ({alterados} tiles, +{adicionadas}/-{removidas} moedas), "
+              f"frame {ms_frame:.2f} ms{'' if ms_frame < ORCAMENTO_MS else '  PERDEU O QUADRO'}")
+        perdidos += ms_frame >= ORCAMENTO_MS
+
+    # O que a recarga evita: assets e mapa do zero, com todos os chunks renderizados
+    inicio = time.perf_counter()
+    assets = Assets()
+    mapa = Mapa(caminho, assets)
+    mapa.chunks = mapa._pre_renderizar()
+    print(f"  {'do zero':<16} {(time.perf_counter() - inicio) * 1000:7.2f} ms "
+          f"(Assets + Mapa + _pre_renderizar)")
+    pygame.quit()
+    if perdidos:
+        print(f"FALHOU: {perdidos} recarga(s) perderam o quadro ({ORCAMENTO_MS:.1f} ms)")
+    return 1 if perdidos else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
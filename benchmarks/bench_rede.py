@@ -0,0 +1,91 @@
+"""
+Teste de carga do servidor de corridas: muitos clientes simulados na mesma
+máquina, medindo o tempo de tick do servidor e a banda por cliente
+
+Uso: python benchmarks/bench_rede.py [segundos] [clientes ...]
+"""
+import asyncio
+import random
+import sys
+import time
+
+from comum import iniciar_pygame
+from assets import Assets
+from mapa import Mapa
+from config import REDE_TAXA_SIMULACAO
+from rede import (
+    ServidorCorrida, decodificar_snapshot, TAMANHO, ENTRADA, MSG_ENTRADA, MSG_SNAPSHOT,
+    DIREITA, PULO
+)
+
+PORTA = 50123
+
+
+async def cliente_simulado(segundos, semente, resultado):
+    """Segura a direita, pula de vez em quando e decodifica os snapshots"""
+    rng = random.Random(semente)
+    leitor, escritor = await asyncio.open_connection('127.0.0.1', PORTA)
+    base = {}
+    recebidos = 0
+    enviados = 0
+
+    async def ler():
+        nonlocal recebidos
+        while True:
+            tamanho, = TAMANHO.unpack(await leitor.readexactly(TAMANHO.size))
+            dados = await leitor.readexactly(tamanho)
+            recebidos += TAMANHO.size + tamanho
+            if dados[:1] == MSG_SNAPSHOT:
+                decodificar_snapshot(dados, base)
+
+    leitura = asyncio.ensure_future(ler())
+    fim = time.perf_counter() + segundos
+    quadro = 0
+    while time.perf_counter() < fim:
+        # Como o ClienteCorrida, envia a entrada de todo frame
+        quadro += 1
+        teclas = DIREITA | (PULO if rng.random() < 0.05 else 0)
+        mensagem = TAMANHO.pack(ENTRADA.size) + ENTRADA.pack(MSG_ENTRADA, teclas, quadro)
+        escritor.write(mensagem)
+        enviados += len(mensagem)
+        await asyncio.sleep(1 / REDE_TAXA_SIMULACAO)
+    leitura.cancel()
+    escritor.close()
+    resultado.append((recebidos / segundos, enviados / segundos, len(base)))
+
+
+async def rodada(assets, mapa, clientes, segundos):
+    servidor = ServidorCorrida(assets, mapa, semente=0)
+    await servidor.iniciar('127.0.0.1', PORTA)
+    simulacao = asyncio.ensure_future(servidor.executar())
+    resultados = []
+    await asyncio.gather(*(cliente_simulado(segundos, i, resultados) for i in range(clientes)))
+    simulacao.cancel()
+    servidor.fechar()
+    await asyncio.sleep(0.05)
+
+    tempos = sorted(servidor.tempos_tick)
+    descida = sum(r[0] for r in resultados) / len(resultados)
+    subida = sum(r[1] for r in resultados) / len(resultados)
+    vistos = min(r[2] for r in resultados)
+    economia = 1 - servidor.bytes_snapshots / max(1, servidor.bytes_completos)
+    print(f"{clientes:4d} clientes: tick média {sum(tempos) / len(tempos):.3f} ms "
+          f"p99 {tempos[int(len(tempos) * 0.99)]:.3f} ms | "
+          f"por cliente {descida / 1024:.2f} KB/s descendo, {subida:.0f} B/s subindo | "
+          f"delta {economia:.0%} menor | jogadores vistos {vistos}")
+
+
+def main():
+    segundos = float(sys.argv[1]) if len(sys.argv) > 1 else 3
+    quantidades = [int(n) for n in sys.argv[2:]] or [1, 8, 32, 64]
+    iniciar_pygame()
+    assets = Assets()
+    mapa = Mapa('mapa1.txt', assets)
+    print(f"Servidor a {REDE_TAXA_SIMULACAO} ticks/s, clientes no mesmo processo")
+    for clientes in quantidades:
+        asyncio.run(rodada(assets, mapa, clientes, segundos))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
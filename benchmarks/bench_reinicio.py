@@ -0,0 +1,57 @@
+"""
+Custo de reiniciar a partida: recriar os objetos contra restaurar um snapshot
+
+Uso: python benchmarks/bench_reinicio.py [moedas]
+"""
+import random
+import sys
+
+from comum import cronometrar
+from main import Jogo
+from jogador import Jogador
+from meteoro import GerenciadorMeteoros
+from moeda import GerenciadorMoedas
+
+
+def reiniciar_recriando(jogo):
+    """Reinício como era feito antes dos snapshots"""
+    jogo.jogador = Jogador(50, 100, jogo.assets)
+    jogo.gerenciador_meteoros = GerenciadorMeteoros(jogo.assets, jogo.mapa.largura_px, jogo.eventos)
+    jogo.gerenciador_moedas = GerenciadorMoedas(jogo.assets, jogo.mapa.largura_px, jogo.eventos)
+    jogo._carregar_moedas_do_mapa()
+    jogo.game_over = False
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    jogo = Jogo(semente=0)
+
+    # Nível com muitas moedas espalhadas sobre o mapa
+    rng = random.Random(0)
+    jogo.mapa.posicoes_moedas = [
+        (rng.randrange(jogo.mapa.largura_px), rng.randrange(jogo.mapa.altura_px))
+        for _ in range(total)
+    ]
+    jogo.gerenciador_moedas.reiniciar()
+    jogo._carregar_moedas_do_mapa()
+    jogo.estado_inicial = jogo.capturar_estado()
+
+    # Joga um pouco para o estado divergir do início
+    for _ in range(120):
+        jogo.atualizar()
+
+    antes = cronometrar(lambda: reiniciar_recriando(jogo), 5)
+    captura = cronometrar(jogo.capturar_estado, 200)
+    depois = cronometrar(jogo.reiniciar, 200)
+    tamanho = len(jogo.estado_inicial.serializar())
+
+    print(f"Nível com {total:,} moedas")
+    print(f"Reinício recriando objetos: {antes * 1000:9.3f} ms")
+    print(f"Captura de snapshot:        {captura * 1000:9.3f} ms")
+    print(f"Reinício por snapshot:      {depois * 1000:9.3f} ms ({antes / depois:,.0f}x)")
+    print(f"Snapshot serializado:       {tamanho:,} bytes")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
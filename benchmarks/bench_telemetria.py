@@ -0,0 +1,184 @@
+"""
+Telemetria: custo de um registro na thread principal e os tempos de frame
+do jogo com a thread gravando, comparados com gravar no próprio loop.
+Os frames rodam no ritmo de FPS, como no jogo, e a telemetria usa a
+capacidade e o intervalo do config. Como no ritmo do jogo as gravações
+caem quase sempre no tempo ocioso entre frames, a thread também é acordada
+no começo de um frame a cada GRAVACAO_A_CADA, para que haja frames rodando
+junto com gravações. Falha se o p99 desses frames passar do p99 sem
+telemetria mais TOLERANCIA_MS, ou se nenhum frame coincidir com gravações
+(medida inconclusiva).
+
+Uso: python benchmarks/bench_telemetria.py [frames]
+"""
+import os
+import sys
+import tempfile
+import time
+import zlib
+
+from comum import cronometrar
+import pygame
+from config import (
+    FPS, TILE_SIZE, TELEMETRIA_CAPACIDADE, TELEMETRIA_INTERVALO, TELEMETRIA_REGIAO_TILES,
+    TELEMETRIA_PICO_MS
+)
+from telemetria import Telemetria, REGISTRO, MOEDA, NIVEL_COMPRESSAO, ler_registros
+from main import Jogo
+
+REGISTROS_CUSTO = 200_000
+EXTRAS_POR_FRAME = 200  # Registros sintéticos por frame (carga bem acima do jogo real)
+TOLERANCIA_MS = 1.0  # Folga do p99 dos frames com gravação sobre o p99 sem telemetria
+GRAVACAO_A_CADA = 30  # Frames entre gravações forçadas no começo de um frame
+
+
+class TelemetriaMedida(Telemetria):
+    """Guarda o intervalo (perf_counter) de cada gravação da thread"""
+
+    def __init__(self, *args):
+        self.gravacoes = []
+        super().__init__(*args)
+
+    def _gravar(self):
+        inicio = time.perf_counter()
+        super()._gravar()
+        self.gravacoes.append((inicio, time.perf_counter()))
+
+    def acordar(self):
+        """Faz a thread gravar agora (como quando o anel chega à metade)"""
+        self._acordar.set()
+
+
+class GravacaoSincrona:
+    """O que seria gravar direto do loop: comprime e grava os registros do frame"""
+
+    def __init__(self, caminho):
+        self.arquivo = open(caminho, 'ab')
+        self.pendentes = bytearray()
+        self.tick = 0
+
+    def registrar(self, tipo, x=0.0, y=0.0, valor=0.0):
+        self.pendentes += REGISTRO.pack(self.tick, tipo, x, y, valor)
+
+    def fim_do_frame(self):
+        self.arquivo.write(zlib.compress(bytes(self.pendentes), NIVEL_COMPRESSAO))
+        self.arquivo.flush()
+        self.pendentes.clear()
+        self.tick += 1
+
+
+def criar_telemetria(caminho, classe=Telemetria, capacidade=TELEMETRIA_CAPACIDADE):
+    return classe(
+        caminho, capacidade, TELEMETRIA_INTERVALO, TELEMETRIA_REGIAO_TILES * TILE_SIZE, TELEMETRIA_PICO_MS
+    )
+
+
+def medir_custo(diretorio):
+    """ns por registrar() com a thread gravando em paralelo"""
+    telemetria = criar_telemetria(os.path.join(diretorio, 'custo.dtl'), capacidade=1 << 20)
+    registrar = telemetria.registrar
+
+    def registrar_lote():
+        for i in range(1000):
+            registrar(MOEDA, 12.5, 80.0, 10.0)
+
+    ns = cronometrar(registrar_lote, REGISTROS_CUSTO // 1000) / 1000 * 1e9
+    telemetria.fechar()
+    total = len(ler_registros(telemetria.caminho))
+    return ns, total, telemetria.perdidos
+
+
+def rodar(jogo, frames, registrar, fim_do_frame=None, inicio_do_frame=None):
+    """(início, ms de trabalho) de cada frame, esperando o próximo como Jogo.rodar.
+
+    `inicio_do_frame(frame)` é chamado logo antes de cada frame.
+    """
+    periodo = 1 / FPS if FPS else 0
+    proximo = time.perf_counter()
+    tempos = []
+    for frame in range(frames):
+        espera = proximo - time.perf_counter()
+        if espera > 0:
+            time.sleep(espera)
+        inicio = time.perf_counter()
+        proximo = inicio + periodo
+        if inicio_do_frame is not None:
+            inicio_do_frame(frame)
+        jogo.executar_frame()
+        for i in range(EXTRAS_POR_FRAME):
+            registrar(MOEDA, i, 0.0, 1.0)
+        if fim_do_frame is not None:
+            fim_do_frame()
+        tempos.append((inicio, (time.perf_counter() - inicio) * 1000))
+        if jogo.game_over:
+            jogo.reiniciar()
+    return tempos
+
+
+def percentil(tempos, p):
+    ordenados = sorted(ms for _, ms in tempos)
+    return ordenados[min(len(ordenados) - 1, int(p / 100 * len(ordenados)))]
+
+
+def resumo(tempos):
+    return (f"p50 {percentil(tempos, 50):.3f} ms, p99 {percentil(tempos, 99):.3f} ms, "
+            f"máx {max(ms for _, ms in tempos):.3f} ms")
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 3600
+    diretorio = tempfile.mkdtemp()
+
+    ns, total, perdidos = medir_custo(diretorio)
+    print(f"registrar(): {ns:.0f} ns por registro ({total} gravados, {perdidos} perdidos)")
+
+    jogo = Jogo('mapa1.txt', 1)
+    rodar(jogo, 120, lambda *registro: None)
+
+    base = rodar(jogo, frames, lambda *registro: None)
+    print(f"sem telemetria:     {resumo(base)}")
+
+    telemetria = criar_telemetria(os.path.join(diretorio, 'jogo.dtl'), TelemetriaMedida)
+    jogo.telemetria = telemetria
+    jogo._conectar_eventos()
+
+    def forcar_gravacao(frame):
+        if frame % GRAVACAO_A_CADA == 0:
+            telemetria.acordar()
+
+    com_thread = rodar(jogo, frames, telemetria.registrar, inicio_do_frame=forcar_gravacao)
+    telemetria.fechar()
+    jogo.telemetria = None
+    jogo._conectar_eventos()
+    print(f"thread (+{EXTRAS_POR_FRAME}/frame): {resumo(com_thread)}")
+
+    # Frames que estavam rodando enquanto a thread gravava
+    gravacoes = telemetria.gravacoes
+    durante = [
+        (inicio, ms) for inicio, ms in com_thread
+        if any(de < inicio + ms / 1000 and inicio < ate for de, ate in gravacoes)
+    ]
+    ms_gravacao = sorted((ate - de) * 1000 for de, ate in gravacoes)
+    print(f"  {len(gravacoes)} gravações (mediana {ms_gravacao[len(ms_gravacao) // 2]:.3f} ms), "
+          f"{telemetria.bytes_gravados // 1024} KiB, {telemetria.perdidos} perdidos")
+    if durante:
+        print(f"  frames durante gravações ({len(durante)}): {resumo(durante)}")
+
+    sincrona = GravacaoSincrona(os.path.join(diretorio, 'sincrona.bin'))
+    no_loop = rodar(jogo, frames, sincrona.registrar, sincrona.fim_do_frame)
+    sincrona.arquivo.close()
+    print(f"gravando no loop:   {resumo(no_loop)}")
+    pygame.quit()
+
+    if not durante:
+        print("INCONCLUSIVO: nenhum frame coincidiu com gravações")
+        return 1
+    limite = percentil(base, 99) + TOLERANCIA_MS
+    p99_durante = percentil(durante, 99)
+    print(f"p99 dos frames com gravação: {p99_durante:.3f} ms (limite {limite:.3f} ms) -> "
+          f"{'OK' if p99_durante <= limite else 'FALHOU'}")
+    return 0 if p99_durante <= limite else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
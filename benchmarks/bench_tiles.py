@@ -0,0 +1,59 @@
+"""
+Custo de editar tiles em tempo de execução contra re-renderizar o mapa inteiro
+
+Uso: python benchmarks/bench_tiles.py [colunas]
+"""
+import random
+import sys
+import tempfile
+import time
+
+from comum import iniciar_pygame, gerar_mapa, cronometrar
+import pygame
+from assets import Assets
+from mapa import Mapa
+from config import LARGURA_VIRTUAL, ALTURA_VIRTUAL
+
+EDICOES = 20000
+EDICOES_POR_FRAME = 50
+
+
+def main():
+    colunas = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    iniciar_pygame()
+    assets = Assets()
+
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+        mapa = Mapa(gerar_mapa(f.name, colunas), assets)
+    tela = pygame.Surface((LARGURA_VIRTUAL, ALTURA_VIRTUAL)).convert()
+
+    rng = random.Random(0)
+    # Edições concentradas perto da câmera, desenhando um frame a cada lote
+    camera_x = mapa.largura_px // 2
+    col_base = camera_x // 16
+    # Renderiza os chunks visíveis (o mapa os cria sob demanda)
+    mapa.desenhar(tela, camera_x, 0)
+    edicoes = [
+        (col_base + rng.randrange(20), rng.randrange(mapa.linhas), rng.choice('.GT'))
+        for _ in range(EDICOES)
+    ]
+
+    inicio = time.perf_counter()
+    for i, (col, row, tile) in enumerate(edicoes):
+        mapa.set_tile(col, row, tile)
+        if i % EDICOES_POR_FRAME == EDICOES_POR_FRAME - 1:
+            mapa.desenhar(tela, camera_x, 0)
+    duracao = time.perf_counter() - inicio
+
+    completo = cronometrar(mapa._pre_renderizar, 3)
+
+    print(f"Mapa: {colunas} colunas")
+    print(f"Edições: {EDICOES / duracao:,.0f} tiles/s "
+          f"({duracao / EDICOES * 1e6:.1f} us por edição, incluindo desenho)")
+    print(f"Re-renderização completa: {completo * 1000:.1f} ms")
+    print(f"Uma re-renderização completa custa {completo / (duracao / EDICOES):,.0f} edições")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+Trajetórias pré-calculadas dos meteoros: custo do cálculo no spawn, custo por
+meteoro por frame e conferência do frame de pouso contra o teste por frame
+(get_retangulos_colisao em todo frame, como era antes)
+
+Uso: python benchmarks/bench_trajetorias.py [meteoros]
+"""
+import random
+import sys
+import time
+
+from comum import iniciar_pygame
+from assets import Assets
+from eventos import BarramentoEventos
+from mapa import Mapa
+from meteoro import Meteoro, GerenciadorMeteoros
+
+
+def fim_por_frame(meteoro, mapa):
+    """Simula o meteoro testando o mapa em todo frame; retorna (frames, pousou)"""
+    frames = 0
+    while True:
+        frames += 1
+        meteoro.x += meteoro.vel_x
+        meteoro.y += meteoro.vel_y
+        if mapa.get_retangulos_colisao(meteoro.get_hitbox()):
+            return frames, True
+        if meteoro.y > mapa.altura_px:
+            return frames, False
+
+
+def gerar(assets, mapa, quantidade, semente=0):
+    """Meteoros com posições e velocidades como as da agenda"""
+    rng = random.Random(semente)
+    return [
+        Meteoro(rng.randrange(0, mapa.largura_px - 10), -40,
+                rng.uniform(-1.5, 1.5), rng.uniform(1.5, 3.5), assets)
+        for _ in range(quantidade)
+    ]
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    iniciar_pygame()
+    assets = Assets()
+    mapa = Mapa('mapa1.txt', assets)
+    gerenciador = GerenciadorMeteoros(assets, mapa.largura_px, BarramentoEventos(), semente=0)
+
+    # Cálculo da trajetória (uma vez por meteoro, no spawn)
+    meteoros = gerar(assets, mapa, quantidade)
+    inicio = time.perf_counter()
+    for meteoro in meteoros:
+        gerenciador._calcular_trajetoria(meteoro, mapa)
+    calculo = (time.perf_counter() - inicio) / quantidade
+    frames_total = sum(m.frames_ate_pouso for m in meteoros)
+    print(f"Cálculo da trajetória: {calculo * 1e6:.1f} us/meteoro "
+          f"({frames_total / quantidade:.0f} frames de voo em média)")
+
+    # Conferência contra o teste por frame
+    divergencias = 0
+    referencia = gerar(assets, mapa, quantidade)
+    inicio = time.perf_counter()
+    fins = [fim_por_frame(meteoro, mapa) for meteoro in referencia]
+    por_frame = (time.perf_counter() - inicio) / frames_total
+    for meteoro, (frames, pousou) in zip(meteoros, fins):
+        if (meteoro.frames_ate_pouso, meteoro.vai_pousar) != (frames, pousou):
+            divergencias += 1
+    print(f"Divergências de pouso: {divergencias} de {quantidade}")
+
+    # Voo com a trajetória pronta (nenhuma consulta ao mapa)
+    consultas = [0]
+    consultar = mapa.get_retangulos_colisao
+
+    def contar(rect):
+        consultas[0] += 1
+        return consultar(rect)
+
+    mapa.get_retangulos_colisao = contar
+    inicio = time.perf_counter()
+    ativos = meteoros
+    while ativos:
+        for meteoro in ativos:
+            meteoro.atualizar()
+        ativos = [m for m in ativos if m.ativo]
+    voo = (time.perf_counter() - inicio) / frames_total
+    del mapa.get_retangulos_colisao
+
+    print(f"Teste por frame: {por_frame * 1e6:.2f} us/meteoro/frame")
+    print(f"Trajetória pronta: {voo * 1e6:.2f} us/meteoro/frame, "
+          f"{consultas[0]} consultas ao mapa")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""
+Utilidades compartilhadas pelos benchmarks (modo headless, mapas gerados)
+"""
+import os
+import sys
+import random
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Rodar sem janela e sem áudio (funciona numa máquina Linux sem display)
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+# Os assets usam caminhos relativos à raiz do projeto
+sys.path.insert(0, RAIZ)
+os.chdir(RAIZ)
+
+import pygame
+
+
+def iniciar_pygame():
+    """Inicializa o vídeo com uma tela mínima (necessária para convert())"""
+    pygame.display.init()
+    pygame.font.init()
+    pygame.display.set_mode((1, 1))
+
+
+def gerar_mapa(caminho, colunas, linhas=16, semente=0, densidade_moedas=0.05, automatico=False):
+    """Gera um mapa de texto com relevo simples e moedas.
+
+    Com `automatico`, o terreno é escrito como '#' (sprites pelo autotiling).
+    """
+    rng = random.Random(semente)
+    grade = [['.'] * colunas for _ in range(linhas)]
+
+    altura = linhas // 4
+    for col in range(colunas):
+        if rng.random() < 0.1:
+            altura = max(2, min(linhas - 6, altura + rng.choice((-1, 1))))
+        for row in range(linhas - altura, linhas):
+            grade[row][col] = '#' if automatico else 'T'
+        if not automatico:
+            grade[linhas - altura][col] = 'G'
+        if rng.random() < densidade_moedas:
+            grade[linhas - altura - 2][col] = 'C'
+
+    with open(caminho, 'w') as f:
+        f.write('\n'.join(''.join(linha) for linha in grade))
+    return caminho
+
+
+def cronometrar(funcao, repeticoes):
+    """Executa `funcao` várias vezes e retorna o tempo médio em segundos"""
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao()
+    return (time.perf_counter() - inicio) / repeticoes
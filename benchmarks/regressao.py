@@ -0,0 +1,267 @@
+"""
+Teste de regressão do tempo de frame: reproduz sessões roteirizadas no jogo
+(sem janela, semente fixa) e compara p50/p99 com as linhas de base salvas
+
+Cada cenário junta um mapa (mapa1.txt ou um mapa gerado) e uma sessão de
+teclas. São medidos, por frame, os tempos de atualizar e desenhar (o trace do
+Profiler) e, numa passada à parte, as coletas da geração 0 do gc (proxy do
+número de alocações) e os blocos de memória retidos no fim.
+
+Os tempos são guardados e comparados em unidades de calibração: a razão
+para o tempo de uma carga fixa (Python puro e blits) medida logo antes e
+logo depois dos frames de cada cenário. Assim as linhas de base valem em
+máquinas mais lentas ou mais rápidas que a que as gerou; numa máquina muito
+diferente (outra versão do Python, do SDL), gere-as de novo com
+--salvar-base.
+
+Uso: python benchmarks/regressao.py [--frames N] [--cenario NOME ...]
+                                    [--salvar-base] [--tolerancia X]
+                                    [--calibracao MS]
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+
+from comum import RAIZ, gerar_mapa
+import pygame
+from config import LARGURA_VIRTUAL, ALTURA_VIRTUAL, TILE_SIZE
+from entrada import Entrada, TeclasSimuladas
+from meteoro import AgendaMeteoros
+from main import Jogo
+
+BASE = os.path.join(RAIZ, 'benchmarks', 'linhas_base.json')
+SEMENTE = 1234
+AQUECIMENTO = 60  # Frames iniciais fora da medição (chunks, caches)
+
+# Folgas absolutas somadas à tolerância relativa (ruído de medidas pequenas)
+FOLGA_CALIBRACOES = 0.02  # Em unidades de calibração
+FOLGA_COLETAS = 2  # Coletas da geração 0 por 1000 frames
+FOLGA_BLOCOS = 2000
+
+# Sessões: segmentos (frames, teclas seguradas, intervalo entre pulos; 0 = sem pulo)
+SESSOES = {
+    'corrida': [(600, (pygame.K_RIGHT,), 40)],
+    'ida e volta': [(90, (pygame.K_RIGHT,), 25), (90, (pygame.K_LEFT,), 25)],
+    'parado': [(300, (), 0), (60, (), 10)],
+}
+
+# Cenários: nome -> (mapa, sessão, chuva de meteoros)
+CENARIOS = {
+    'mapa1/corrida': ('mapa1.txt', 'corrida', False),
+    'mapa1/ida e volta': ('mapa1.txt', 'ida e volta', False),
+    'mapa1/parado': ('mapa1.txt', 'parado', False),
+    'longo/corrida': ('longo', 'corrida', False),
+    'longo/chuva': ('longo', 'corrida', True),
+}
+
+# Mapas gerados: nome -> argumentos de gerar_mapa
+MAPAS_GERADOS = {
+    'longo': {'colunas': 4000, 'semente': 7, 'densidade_moedas': 0.2},
+}
+
+# Um spawn a cada 2-6 frames chegando a um por frame (como bench_meteoros)
+CURVA_CHUVA = ((2, 6), (1, 1), 1200)
+LIMITE_CHUVA = 200
+
+CALIBRACAO_REPETICOES = 51
+CHAVE_CALIBRACAO = 'calibração (ms)'  # Informativa (não é comparada)
+
+
+class EntradaRoteirizada(Entrada):
+    """Entrada que segue uma sessão em vez do teclado"""
+
+    def __init__(self, segmentos):
+        super().__init__()
+        self.frames = []
+        for frames, teclas, intervalo_pulo in segmentos:
+            seguradas = TeclasSimuladas(teclas)
+            for i in range(frames):
+                self.frames.append((seguradas, intervalo_pulo and i % intervalo_pulo == 0))
+        self.frame = 0
+
+    def eventos_do_tick(self):
+        self.bombear()
+        self.pendentes = []
+        self._seguradas, pulo = self.frames[self.frame % len(self.frames)]
+        self.frame += 1
+        if pulo:
+            return [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE)]
+        return []
+
+    def teclas(self):
+        return self._seguradas
+
+
+def calibrar():
+    """ms da carga de referência: a mais rápida de CALIBRACAO_REPETICOES
+    execuções (a carga é fixa, então o mínimo é o que menos varia com o
+    que mais roda na máquina)"""
+    destino = pygame.Surface((LARGURA_VIRTUAL, ALTURA_VIRTUAL))
+    sprite = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+    sprite.fill((200, 100, 50, 128))
+    tempos = []
+    for _ in range(CALIBRACAO_REPETICOES):
+        inicio = time.perf_counter()
+        total = 0
+        for i in range(20_000):
+            total += i * i % 7
+        for i in range(400):
+            destino.blit(sprite, (i * 7 % LARGURA_VIRTUAL, i * 13 % ALTURA_VIRTUAL))
+        pygame.transform.scale(destino, (LARGURA_VIRTUAL * 2, ALTURA_VIRTUAL * 2))
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return min(tempos)
+
+
+def percentil(ordenados, p):
+    return ordenados[min(len(ordenados) - 1, int(p / 100 * len(ordenados)))]
+
+
+def rodar_frames(jogo, frames):
+    for _ in range(frames):
+        jogo.executar_frame()
+        if jogo.game_over:
+            # Mesmo efeito da tecla R, sem depender de quando a partida acaba
+            jogo.reiniciar()
+
+
+def rodar_cenario(jogo, nome, frames, calibracao=None):
+    """Roda um cenário e retorna suas métricas (tempos em unidades de calibração).
+
+    Sem `calibracao` (ms), ela é medida em volta da passada com o trace.
+    """
+    _, sessao, chuva = CENARIOS[nome]
+    jogo.entrada = EntradaRoteirizada(SESSOES[sessao])
+    if chuva:
+        meteoros = jogo.gerenciador_meteoros
+        meteoros.agenda = AgendaMeteoros(meteoros.rng, *CURVA_CHUVA)
+        meteoros.max_simultaneos = LIMITE_CHUVA
+
+    rodar_frames(jogo, AQUECIMENTO)
+
+    # Alocações numa passada sem o trace (que também aloca a cada frame)
+    gc.collect()
+    coletas = gc.get_stats()[0]['collections']
+    blocos = sys.getallocatedblocks()
+    rodar_frames(jogo, frames)
+    coletas = gc.get_stats()[0]['collections'] - coletas
+    blocos = sys.getallocatedblocks() - blocos
+
+    antes = calibracao or calibrar()
+    jogo.profiler.iniciar_trace()
+    rodar_frames(jogo, frames)
+    calibracao = calibracao or (antes + calibrar()) / 2
+
+    tempos = {'atualizar': [], 'desenhar': []}
+    for secao, _, ms in jogo.profiler.trace:
+        if secao in tempos:
+            tempos[secao].append(ms)
+    metricas = {}
+    for secao, lista in tempos.items():
+        lista.sort()
+        metricas[f'{secao} p50'] = percentil(lista, 50) / calibracao
+        metricas[f'{secao} p99'] = percentil(lista, 99) / calibracao
+    metricas['gc0 por 1000 frames'] = coletas * 1000 / frames
+    metricas['blocos retidos'] = blocos
+    metricas[CHAVE_CALIBRACAO] = calibracao
+    return metricas
+
+
+def criar_jogo(nome, arquivos_gerados):
+    arquivo_mapa = CENARIOS[nome][0]
+    if arquivo_mapa in MAPAS_GERADOS:
+        arquivo_mapa = arquivos_gerados[arquivo_mapa]
+    return Jogo(arquivo_mapa, SEMENTE)
+
+
+def comparar(atual, base, tolerancia):
+    """Retorna as linhas do relatório e se todas as métricas passaram"""
+    linhas = []
+    passou = True
+    for nome, metricas in atual.items():
+        referencia = base.get(nome)
+        linhas.append(nome)
+        for metrica, valor in metricas.items():
+            if referencia is None or metrica not in referencia:
+                linhas.append(f"  {metrica:<20} {valor:10.3f}  (sem linha de base)")
+                continue
+            valor_base = referencia[metrica]
+            if metrica == CHAVE_CALIBRACAO:
+                linhas.append(f"  {metrica:<20} {valor:10.3f}  base {valor_base:10.3f}")
+                continue
+            if metrica == 'blocos retidos':
+                # Vazamentos: qualquer crescimento grande é falha, ruído pequeno não
+                limite = max(valor_base, 0) + FOLGA_BLOCOS
+            elif metrica.startswith('gc0'):
+                limite = valor_base * (1 + tolerancia) + FOLGA_COLETAS
+            else:
+                limite = valor_base * (1 + tolerancia) + FOLGA_CALIBRACOES
+            ok = valor <= limite
+            passou = passou and ok
+            linhas.append(
+                f"  {metrica:<20} {valor:10.3f}  base {valor_base:10.3f}  "
+                f"limite {limite:10.3f}  {'ok' if ok else 'FALHOU'}"
+            )
+    return linhas, passou
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Regressão do tempo de frame")
+    parser.add_argument('--frames', type=int, default=1200, help="frames medidos por cenário")
+    parser.add_argument('--cenario', action='append', choices=sorted(CENARIOS),
+                        help="rodar só este cenário (pode repetir)")
+    parser.add_argument('--salvar-base', action='store_true',
+                        help="gravar os resultados como novas linhas de base")
+    parser.add_argument('--tolerancia', type=float, default=0.25,
+                        help="aumento relativo permitido nos tempos e coletas (0.25 = 25%%)")
+    parser.add_argument('--calibracao', type=float, metavar='MS',
+                        help="usar este tempo de calibração em todos os cenários em vez de medi-lo")
+    opcoes = parser.parse_args()
+
+    nomes = opcoes.cenario or list(CENARIOS)
+    diretorio = tempfile.mkdtemp()
+    arquivos_gerados = {
+        nome: gerar_mapa(os.path.join(diretorio, f'{nome}.txt'), **argumentos)
+        for nome, argumentos in MAPAS_GERADOS.items()
+    }
+
+    atual = {}
+    for nome in nomes:
+        jogo = criar_jogo(nome, arquivos_gerados)
+        metricas = atual[nome] = rodar_cenario(jogo, nome, opcoes.frames, opcoes.calibracao)
+        calibracao = metricas[CHAVE_CALIBRACAO]
+        print(f"{nome}: atualizar p50 {metricas['atualizar p50'] * calibracao:.3f} ms, "
+              f"desenhar p50 {metricas['desenhar p50'] * calibracao:.3f} ms "
+              f"(calibração {calibracao:.3f} ms)")
+        # O driver dummy não cria uma segunda tela SCALED sem reiniciar o vídeo
+        pygame.display.quit()
+    pygame.quit()
+
+    if opcoes.salvar_base:
+        base = {}
+        if os.path.exists(BASE):
+            with open(BASE) as f:
+                base = json.load(f)
+        base.update(atual)
+        base.pop(CHAVE_CALIBRACAO, None)
+        with open(BASE, 'w') as f:
+            json.dump(base, f, indent=2, ensure_ascii=False)
+        print(f"Linhas de base salvas em {BASE}")
+        return 0
+
+    if not os.path.exists(BASE):
+        print(f"Sem linhas de base em {BASE} (rode com --salvar-base)")
+        return 1
+    with open(BASE) as f:
+        base = json.load(f)
+    linhas, passou = comparar(atual, base, opcoes.tolerancia)
+    print('\n'.join(linhas))
+    print("PASSOU" if passou else "FALHOU")
+    return 0 if passou else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -7,7 +7,8 @@ LARGURA = 1280
 ALTURA = 720
 LARGURA_VIRTUAL = 320
 ALTURA_VIRTUAL = 180
-FPS = 60
+FPS = 60  # 0 = sem limite
+VSYNC = True  # Sincronia vertical (limita o FPS à taxa do monitor)
 
 # Tiles
 TILE_SIZE = 16
@@ -56,4 +57,72 @@ FRAMES_MOEDA = 4
 MOEDA_LARGURA = 16
 MOEDA_ALTURA = 16
 MOEDA_VELOCIDADE_FLUTUACAO = 0.1
-MOEDA_AMPLITUDE_FLUTUACAO = 2
\ No newline at end of file
+MOEDA_AMPLITUDE_FLUTUACAO = 2
+
+# Parallax do fundo
+PARALLAX_MARGEM_WRAP = 64  # Largura extra de cada faixa além da viewport
+PARALLAX_FATORES = (0.15, 0.35, 0.6)  # Velocidade de cada camada em relação à câmera
+COR_CHAVE_MAPA = (255, 0, 255)  # Cor transparente da superfície do mapa
+
+# Inicialização
+PACOTE_ASSETS = 'assets/pacote.bin'  # Imagens já decodificadas, gerado na primeira execução ('' = carregar os PNGs)
+MAPA_CHUNKS_SOB_DEMANDA = True  # Renderiza cada chunk do mapa só quando ele aparece
+PYGAME_SEM_PKG_RESOURCES = True  # Importa o pygame sem carregar o pkg_resources (~100 ms a menos)
+
+# Memória
+ORCAMENTO_MEMORIA_MB = 64  # Acima disso, superfícies de cache são liberadas
+ROTACAO_METEORO_PASSO = 5  # Graus por balde no cache de sprites rotacionados
+
+# Mapa
+MAPA_CHUNK_TILES = 16  # Largura (em tiles) de cada faixa pré-renderizada do mapa
+METEORO_DESTROI_TILES = False  # Meteoros abrem crateras no tile onde pousam
+MAPA_NAVEGACAO = False  # Constrói o grafo de navegação ao carregar (senão, no primeiro uso, como no --piloto)
+MAPA_RECARGA = False  # Desenvolvimento: aplica as mudanças salvas no arquivo do mapa com o jogo rodando
+MAPA_RECARGA_INTERVALO = 15  # Frames entre verificações do arquivo do mapa
+
+# Meteoros
+METEORO_MAX_SIMULTANEOS = 20  # Spawns além disso são descartados
+METEORO_HORIZONTE_AGENDA = 180  # Frames de spawns calculados com antecedência
+METEORO_INTERVALO_INICIAL = (15, 50)  # Frames entre spawns no começo da partida
+METEORO_INTERVALO_FINAL = (15, 50)  # Frames entre spawns no fim da curva de dificuldade
+METEORO_FRAMES_DIFICULDADE = 3600  # Duração da curva de dificuldade
+COLISAO_POR_PIXEL = True  # Máscaras dos sprites depois do teste de retângulos (False = só hitboxes)
+
+# Rede (corridas com fantasmas)
+REDE_PORTA = 50007
+REDE_TAXA_SIMULACAO = 60  # Ticks por segundo do servidor
+REDE_TICKS_POR_SNAPSHOT = 3  # Um snapshot a cada N ticks (20 por segundo)
+REDE_SUBPIXELS = 4  # Posições enviadas em 1/N de pixel
+REDE_ATRASO_INTERPOLACAO = 6  # Ticks de atraso dos fantasmas (dois snapshots)
+REDE_MAX_JOGADORES = 128
+REDE_ALFA_FANTASMA = 110  # Opacidade dos outros jogadores (0-255)
+REDE_ENTRADAS_POR_TICK = 2  # Frames de um cliente simulados por tick (deixa o servidor alcançar)
+
+# Entrada
+PULO_BUFFER_FRAMES = 6  # Um pulo apertado até N frames antes de tocar o chão ainda vale
+PULO_COYOTE_FRAMES = 6  # Ainda dá para pular até N frames depois de sair de uma borda
+ENTRADA_FOLGA_MS = 2.0  # Margem antes do vsync ao começar o frame o mais tarde possível
+ENTRADA_JANELA_FRAMES = 120  # Frames cujo tempo máximo decide quando começar o próximo
+
+# Partículas
+PARTICULAS_CAPACIDADE = 4096  # Tamanho do anel (as mais antigas são sobrescritas)
+PARTICULAS_GRAVIDADE = 0.15
+PARTICULAS_VIDA = (20, 45)  # Frames de vida sorteados em [mínimo, máximo)
+PARTICULAS_POR_IMPACTO = 24
+PARTICULAS_POR_MOEDA = 12
+
+# Pós-processamento (LUTs sobre a superfície virtual)
+POSPROCESSAMENTO_NIVEIS = 16  # Intensidades distintas por efeito (uma LUT por combinação)
+FLASH_DANO_FRAMES = 20  # Duração do flash vermelho ao levar dano
+FLASH_DANO_INTENSIDADE = 0.6
+CEU_METEOROS_ESCURO = 10  # Meteoros na tela para o céu mais escuro
+CEU_ESCURECIMENTO_MAXIMO = 0.4
+CEU_SUAVIZACAO = 0.02  # Peso da média móvel da densidade de meteoros
+GAME_OVER_ESCURECIMENTO = 0.5  # Igual ao antigo overlay preto com alpha 128
+
+# Telemetria
+TELEMETRIA_ARQUIVO = ''  # Arquivo onde gravar a telemetria das partidas (vazio = desligada)
+TELEMETRIA_CAPACIDADE = 16384  # Registros no anel em memória
+TELEMETRIA_INTERVALO = 5.0  # Segundos entre gravações da thread (blocos maiores e mais raros)
+TELEMETRIA_REGIAO_TILES = 32  # Largura (em tiles) de cada região do mapa
+TELEMETRIA_PICO_MS = 25.0  # Frames mais longos que isso são registrados
\ No newline at end of file
@@ -0,0 +1,80 @@
+"""
+Entrada: eventos com o instante de chegada e latência até a tela
+"""
+import time
+from collections import deque
+import pygame
+
+# Teclas de jogo cuja latência é medida
+TECLAS_JOGO = (pygame.K_SPACE, pygame.K_UP, pygame.K_LEFT, pygame.K_RIGHT)
+
+
+class TeclasSimuladas:
+    """Imita o retorno de pygame.key.get_pressed para as teclas dadas"""
+
+    def __init__(self, teclas=()):
+        self.teclas = teclas
+
+    def __getitem__(self, tecla):
+        return tecla in self.teclas
+
+
+class Entrada:
+    """Fila de eventos do SDL lida continuamente enquanto o jogo espera.
+
+    Os eventos recebem o instante em que foram retirados da fila e são
+    entregues juntos no começo do próximo tick. Depois do flip, o tempo
+    entre cada tecla de jogo e a apresentação do frame que a usou é guardado
+    como estimativa de latência entrada-tela.
+    """
+
+    def __init__(self):
+        self.pendentes = []  # (evento, instante de chegada)
+        self._aguardando_tela = []  # Instantes das teclas usadas no tick atual
+        self.latencias = deque(maxlen=600)  # ms, das últimas teclas de jogo
+
+    def bombear(self):
+        """Retira os eventos da fila do SDL marcando o instante de chegada"""
+        agora = time.perf_counter()
+        for evento in pygame.event.get():
+            # Eventos sintéticos (benchmarks) podem trazer o instante real
+            self.pendentes.append((evento, getattr(evento, 'instante', agora)))
+
+    def esperar_ate(self, instante):
+        """Espera até `instante` (perf_counter) lendo eventos a cada ~1 ms"""
+        while True:
+            self.bombear()
+            restante = instante - time.perf_counter()
+            if restante <= 0:
+                return
+            time.sleep(min(restante, 0.001))
+
+    def eventos_do_tick(self):
+        """Entrega os eventos pendentes ao tick que vai começar"""
+        self.bombear()
+        pendentes = self.pendentes
+        self.pendentes = []
+        for evento, instante in pendentes:
+            if evento.type == pygame.KEYDOWN and evento.key in TECLAS_JOGO:
+                self._aguardando_tela.append(instante)
+        return [evento for evento, _ in pendentes]
+
+    def teclas(self):
+        """Estado das teclas seguradas no começo do tick"""
+        return pygame.key.get_pressed()
+
+    def frame_apresentado(self):
+        """Chamado logo depois do flip: registra a latência das teclas do tick"""
+        if self._aguardando_tela:
+            agora = time.perf_counter()
+            self.latencias.extend((agora - instante) * 1000 for instante in self._aguardando_tela)
+            self._aguardando_tela.clear()
+
+    def linhas_estatisticas(self):
+        """Latência entrada-tela das últimas teclas (overlay F3)"""
+        if not self.latencias:
+            return ["Latência entrada: -"]
+        ordenadas = sorted(self.latencias)
+        mediana = ordenadas[len(ordenadas) // 2]
+        p95 = ordenadas[int(len(ordenadas) * 0.95)]
+        return [f"Latência entrada: mediana {mediana:.1f} ms  p95 {p95:.1f} ms"]
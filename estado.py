@@ -0,0 +1,28 @@
+"""
+Snapshot do estado completo do jogo (reinício instantâneo, checkpoints e simulações)
+"""
+import pickle
+
+
+class EstadoJogo:
+    """Estado de todos os subsistemas num instante (apenas dados simples)"""
+
+    __slots__ = ('jogador', 'meteoros', 'moedas', 'placar', 'mapa', 'game_over')
+
+    def __init__(self, jogador, meteoros, moedas, placar, mapa, game_over):
+        self.jogador = jogador
+        self.meteoros = meteoros
+        self.moedas = moedas
+        self.placar = placar
+        self.mapa = mapa
+        self.game_over = game_over
+
+    def serializar(self):
+        """Converte o estado em bytes (para salvar em disco ou enviar)"""
+        dados = tuple(getattr(self, campo) for campo in self.__slots__)
+        return pickle.dumps(dados, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def desserializar(cls, dados):
+        """Reconstrói um estado a partir de serializar()"""
+        return cls(*pickle.loads(dados))
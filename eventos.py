@@ -0,0 +1,43 @@
+"""
+Barramento de eventos do jogo (entregues em lote uma vez por tick)
+"""
+from collections import namedtuple
+
+# Eventos tipados
+MoedaColetada = namedtuple('MoedaColetada', 'x y pontos')
+MeteoroAtingiu = namedtuple('MeteoroAtingiu', 'x y')
+MeteoroPousou = namedtuple('MeteoroPousou', 'x y')  # Ponto de impacto (centro da base da hitbox)
+
+
+class BarramentoEventos:
+    """Acumula os eventos emitidos durante o tick e os despacha por tipo"""
+
+    def __init__(self):
+        self.inscritos = {}  # tipo -> lista de callbacks
+        self.lotes = {}  # tipo -> eventos emitidos neste tick
+
+    def inscrever(self, tipo, callback):
+        """Registra `callback(lote)` para receber a lista de eventos do tipo"""
+        self.inscritos.setdefault(tipo, []).append(callback)
+        self.lotes.setdefault(tipo, [])
+
+    def emitir(self, evento):
+        """Adiciona um evento ao lote do tick atual"""
+        lote = self.lotes.get(type(evento))
+        if lote is not None:
+            lote.append(evento)
+
+    def despachar(self):
+        """Entrega cada lote não vazio aos inscritos (uma chamada por tipo)"""
+        for tipo, lote in self.lotes.items():
+            if not lote:
+                continue
+            # Eventos emitidos pelos próprios inscritos ficam para o próximo tick
+            self.lotes[tipo] = []
+            for callback in self.inscritos[tipo]:
+                callback(lote)
+
+    def limpar(self):
+        """Remove todos os inscritos e descarta eventos pendentes"""
+        self.inscritos = {}
+        self.lotes = {}
@@ -0,0 +1,36 @@
+"""
+Interface na tela (vidas e moedas)
+"""
+from config import (
+    LARGURA_VIRTUAL, ICONE_VIDA_ESPACAMENTO, ICONE_VIDA_MARGEM_X, ICONE_VIDA_MARGEM_Y
+)
+
+
+class HUD:
+    """Desenha o HUD, renderizando o texto só quando o valor muda"""
+
+    def __init__(self, assets, fonte):
+        self.assets = assets
+        self.fonte = fonte
+        self._texto_moedas = None
+
+    def invalidar(self, eventos=None):
+        """Marca o texto para ser renderizado de novo no próximo desenho"""
+        self._texto_moedas = None
+
+    def desenhar(self, superficie, jogador):
+        """Desenha vidas e moedas coletadas"""
+        # Desenhar vidas
+        x = ICONE_VIDA_MARGEM_X
+        y = ICONE_VIDA_MARGEM_Y
+
+        for i in range(jogador.vidas):
+            superficie.blit(self.assets.icone_vida, (x, y))
+            x += ICONE_VIDA_ESPACAMENTO
+
+        # Desenhar moedas coletadas
+        if self._texto_moedas is None:
+            self._texto_moedas = self.fonte.render(
+                f"Moedas: {jogador.moedas_coletadas}", True, (255, 215, 0)
+            )
+        superficie.blit(self._texto_moedas, (LARGURA_VIRTUAL - 80, ICONE_VIDA_MARGEM_Y))
@@ -2,15 +2,38 @@
 Classe do jogador (Dino)
 """
 import pygame
+from operator import attrgetter
 from config import (
     DINO_VELOCIDADE, DINO_GRAVIDADE, DINO_FORCA_PULO,
     HITBOX_OFFSET_X, HITBOX_OFFSET_Y, HITBOX_LARGURA, HITBOX_ALTURA,
     VELOCIDADE_ANIMACAO_IDLE, VELOCIDADE_ANIMACAO_MOVE, VELOCIDADE_ANIMACAO_JUMP,
     VELOCIDADE_ANIMACAO_HURT, VELOCIDADE_ANIMACAO_DEAD, DURACAO_HURT, 
-    DURACAO_INVENCIBILIDADE, VIDAS_INICIAIS
+    DURACAO_INVENCIBILIDADE, VIDAS_INICIAIS, PULO_BUFFER_FRAMES, PULO_COYOTE_FRAMES
 )
 
 
+# Campos que mudam durante o jogo (física, animação, dano, vidas e moedas)
+CAMPOS_ESTADO = (
+    'x', 'y', 'vel_y', 'no_chao', 'direcao', 'pulo_pedido', 'coyote',
+    'frame_atual', 'contador_animacao', 'estado', 'estado_anterior', 'frame_pulo',
+    'levou_dano', 'contador_hurt', 'invencivel', 'contador_invencibilidade',
+    'animacao_hurt_completa', 'vidas', 'morto', 'animacao_morte_completa',
+    'moedas_coletadas',
+)
+_ler_estado = attrgetter(*CAMPOS_ESTADO)
+
+# Animações na ordem dos códigos de codigo_animacao (usados também pela rede)
+IDLE, MOVENDO, PULANDO, HURT, MORTO = range(5)
+
+
+def sprite_animacao(assets, codigo, frame):
+    """Retorna o sprite de uma animação (código de codigo_animacao) e frame"""
+    frames = (
+        assets.dino_idle, assets.dino_move, assets.dino_jump, assets.dino_hurt, assets.dino_dead
+    )[codigo]
+    return frames[min(frame, len(frames) - 1)]
+
+
 class Jogador:
     """Classe que representa o jogador (dinossauro)"""
     
@@ -25,6 +48,11 @@ class Jogador:
         self.no_chao = False
         self.direcao = 1  # 1 = direita, -1 = esquerda
         
+        # Pulo pedido ainda válido (frames restantes) e frames de "coyote time"
+        # em que ainda dá para pular depois de sair do chão sem pular
+        self.pulo_pedido = 0
+        self.coyote = 0
+        
         # Animação
         self.frame_atual = 0
         self.contador_animacao = 0
@@ -56,13 +84,25 @@ class Jogador:
             HITBOX_ALTURA
         )
     
+    def get_mascara(self):
+        """Retorna (máscara do sprite atual, posição) para a colisão por pixel"""
+        sprite = sprite_animacao(self.assets, *self.codigo_animacao())
+        mascara = self.assets.mascara_dino(sprite, self.direcao == -1)
+        return mascara, (int(self.x), int(self.y))
+    
     def pular(self):
-        """Faz o jogador pular se estiver no chão"""
-        if self.no_chao and not self.levou_dano and not self.morto:
+        """Faz o jogador pular se estiver no chão (ou acabou de sair dele)"""
+        if (self.no_chao or self.coyote) and not self.levou_dano and not self.morto:
             self.vel_y = self.forca_pulo
             self.estado = "pulando"
             self.frame_pulo = 0
             self.no_chao = False
+            self.pulo_pedido = 0
+            self.coyote = 0
+    
+    def pedir_pulo(self):
+        """Guarda um pulo para os próximos PULO_BUFFER_FRAMES ticks"""
+        self.pulo_pedido = PULO_BUFFER_FRAMES
     
     def receber_dano(self):
         """Aplica dano ao jogador"""
@@ -89,6 +129,11 @@ class Jogador:
     
     def atualizar(self, teclas, mapa):
         """Atualiza o estado do jogador (movimento, colisão, animação)"""
+        # Pulo pedido há pouco: acontece assim que for possível
+        if self.pulo_pedido:
+            self.pulo_pedido -= 1
+            self.pular()
+        
         # Se está morto, apenas atualiza animação de morte
         if self.morto:
             # Aplica gravidade
@@ -208,6 +253,11 @@ class Jogador:
                     self.vel_y = 0
                 hitbox.y = self.y + HITBOX_OFFSET_Y
         
+        if self.no_chao:
+            self.coyote = PULO_COYOTE_FRAMES
+        elif self.coyote:
+            self.coyote -= 1
+        
         # Atualizar estado
         if not self.no_chao:
             self.estado = "pulando"
@@ -290,30 +340,52 @@ class Jogador:
         tela_x = int(self.x - camera_x)
         tela_y = int(self.y - camera_y)
         
+        # Efeito de piscar durante invencibilidade (não aplica se morto)
+        if self.piscando():
+            return  # Não desenha (cria efeito de piscar)
+        
         # Selecionar sprite correto
-        if self.morto:
-            sprite = self.assets.dino_dead[min(self.frame_atual, 4)]
-        elif self.levou_dano or self.estado == "hurt":
-            sprite = self.assets.dino_hurt[min(self.frame_atual, 3)]
-        elif self.estado == "idle":
-            sprite = self.assets.dino_idle[min(self.frame_atual, 2)]
-        elif self.estado == "movendo":
-            sprite = self.assets.dino_move[min(self.frame_atual, 5)]
-        elif self.estado == "pulando":
-            sprite = self.assets.dino_jump[min(self.frame_pulo, 3)]
-        else:
-            sprite = self.assets.dino_idle[0]
+        sprite = sprite_animacao(self.assets, *self.codigo_animacao())
         
         # Flipar sprite se estiver virado para esquerda
         if self.direcao == -1:
-            sprite = pygame.transform.flip(sprite, True, False)
-        
-        # Efeito de piscar durante invencibilidade (não aplica se morto)
-        if not self.morto and self.invencivel and (self.contador_invencibilidade // 5) % 2 == 0:
-            return  # Não desenha (cria efeito de piscar)
+            sprite = self.assets.espelhado(sprite)
         
         superficie.blit(sprite, (tela_x, tela_y))
     
+    def codigo_animacao(self):
+        """Retorna (código da animação, frame) do sprite a desenhar"""
+        if self.morto:
+            return MORTO, self.frame_atual
+        if self.levou_dano or self.estado == "hurt":
+            return HURT, self.frame_atual
+        if self.estado == "movendo":
+            return MOVENDO, self.frame_atual
+        if self.estado == "pulando":
+            return PULANDO, self.frame_pulo
+        return IDLE, self.frame_atual if self.estado == "idle" else 0
+    
+    def piscando(self):
+        """Indica se o sprite está apagado pelo piscar da invencibilidade"""
+        return not self.morto and self.invencivel and (self.contador_invencibilidade // 5) % 2 == 0
+    
     def adicionar_moeda(self):
         """Incrementa o contador de moedas coletadas"""
-        self.moedas_coletadas += 1
\ No newline at end of file
+        self.moedas_coletadas += 1
+    
+    def ao_coletar_moedas(self, eventos):
+        """Recebe o lote de moedas coletadas no tick"""
+        self.moedas_coletadas += len(eventos)
+    
+    def ao_ser_atingido(self, eventos):
+        """Recebe o lote de meteoros que atingiram o jogador no tick"""
+        self.receber_dano()
+    
+    def capturar_estado(self):
+        """Retorna uma tupla com os campos de CAMPOS_ESTADO"""
+        return _ler_estado(self)
+    
+    def restaurar_estado(self, estado):
+        """Restaura um estado capturado por capturar_estado"""
+        for campo, valor in zip(CAMPOS_ESTADO, estado):
+            setattr(self, campo, valor)
@@ -0,0 +1,261 @@
+"""
+Dino Runner - Linha de comando
+Lê um perfil de configuração (TOML/JSON) e as opções, sobrescreve os valores
+de config.py e só então importa o jogo, para que todos os módulos vejam os
+valores finais. Cada modo importa apenas o que usa.
+
+Exemplos:
+    python lancador.py
+    python lancador.py --perfil perfis/desempenho.toml --escala 2
+    python lancador.py --headless --bench 1000 --trace trace.json
+    python lancador.py --piloto --profiler
+    python lancador.py --servidor   (e em outros terminais: --conectar 127.0.0.1)
+"""
+import argparse
+import os
+import sys
+import time
+import config
+
+
+def carregar_perfil(caminho):
+    """Lê um perfil TOML ou JSON e retorna o dicionário de valores"""
+    if caminho.endswith('.toml'):
+        try:
+            import tomllib
+        except ImportError:
+            raise ValueError("perfis TOML precisam do Python 3.11 ou mais novo (use JSON)")
+        with open(caminho, 'rb') as f:
+            return tomllib.load(f)
+
+    import json
+
+    with open(caminho, 'r') as f:
+        return json.load(f)
+
+
+def aplicar_valores(valores):
+    """Sobrescreve constantes de config.py (nomes desconhecidos são erro)"""
+    for nome, valor in valores.items():
+        if not nome.isupper() or not hasattr(config, nome):
+            raise ValueError(f"configuração desconhecida: {nome}")
+        atual = getattr(config, nome)
+        # TOML e JSON não têm tuplas
+        if isinstance(atual, tuple) and isinstance(valor, list):
+            valor = tuple(valor)
+        if type(valor) is not type(atual) and not (isinstance(atual, float) and isinstance(valor, int)):
+            raise ValueError(f"{nome} deve ser {type(atual).__name__}, não {type(valor).__name__}")
+        setattr(config, nome, valor)
+
+
+def importar_pygame():
+    """Importa o pygame (sem o pkg_resources, se configurado).
+
+    O pygame.pkgdata só usa o pkg_resources para achar arquivos de dados e
+    cai para o caminho do pacote quando ele não existe; importá-lo custa
+    mais de 100 ms na abertura.
+    """
+    if not config.PYGAME_SEM_PKG_RESOURCES or 'pkg_resources' in sys.modules:
+        import pygame
+        return pygame
+
+    sys.modules['pkg_resources'] = None  # Faz o import dele falhar
+    try:
+        import pygame
+    finally:
+        del sys.modules['pkg_resources']
+    return pygame
+
+
+def valores_das_opcoes(opcoes):
+    """Traduz as opções da linha de comando em valores de config.py"""
+    valores = {}
+    if opcoes.sem_limite_fps:
+        valores['FPS'] = 0
+    if opcoes.vsync is not None:
+        valores['VSYNC'] = opcoes.vsync
+    elif opcoes.bench is not None:
+        # O benchmark mede o frame, não a espera pelo monitor
+        valores['VSYNC'] = False
+    if opcoes.escala is not None:
+        valores['LARGURA'] = config.LARGURA_VIRTUAL * opcoes.escala
+        valores['ALTURA'] = config.ALTURA_VIRTUAL * opcoes.escala
+    if opcoes.recarregar_mapa:
+        valores['MAPA_RECARGA'] = True
+    if opcoes.telemetria is not None:
+        valores['TELEMETRIA_ARQUIVO'] = opcoes.telemetria
+    if opcoes.densidade_meteoros is not None:
+        # Densidade 2 = o dobro de meteoros (metade do intervalo entre spawns)
+        for nome in ('METEORO_INTERVALO_INICIAL', 'METEORO_INTERVALO_FINAL'):
+            valores[nome] = tuple(
+                max(1, round(frames / opcoes.densidade_meteoros)) for frames in getattr(config, nome)
+            )
+    return valores
+
+
+def inteiro_positivo(texto):
+    """Tipo do argparse para inteiros >= 1"""
+    try:
+        valor = int(texto)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"inteiro inválido: {texto!r}")
+    if valor < 1:
+        raise argparse.ArgumentTypeError(f"deve ser pelo menos 1, não {valor}")
+    return valor
+
+
+def criar_parser():
+    """Define as opções da linha de comando"""
+    parser = argparse.ArgumentParser(
+        prog='lancador.py', description="Dino Runner - jogo de plataforma"
+    )
+    parser.add_argument('--perfil', metavar='ARQUIVO',
+                        help="perfil TOML/JSON com valores de config.py (ex.: {\"FPS\": 30})")
+    parser.add_argument('--mapa', default='mapa1.txt', metavar='ARQUIVO', help="arquivo do mapa")
+    parser.add_argument('--semente', type=int, help="semente dos meteoros (partida reproduzível)")
+    parser.add_argument('--headless', action='store_true',
+                        help="sem janela e sem áudio (drivers dummy do SDL)")
+    parser.add_argument('--sem-limite-fps', action='store_true', help="não limitar o FPS")
+    parser.add_argument('--vsync', dest='vsync', action='store_true', default=None,
+                        help="ligar a sincronia vertical")
+    parser.add_argument('--sem-vsync', dest='vsync', action='store_false',
+                        help="desligar a sincronia vertical")
+    parser.add_argument('--escala', type=inteiro_positivo, metavar='N',
+                        help="tamanho da janela em múltiplos da resolução virtual")
+    parser.add_argument('--densidade-meteoros', type=float, metavar='X',
+                        help="multiplicador da frequência de meteoros")
+    parser.add_argument('--recarregar-mapa', action='store_true',
+                        help="aplicar as mudanças salvas no arquivo do mapa sem reiniciar")
+    parser.add_argument('--profiler', action='store_true', help="abrir com o overlay F3 visível")
+    parser.add_argument('--piloto', action='store_true',
+                        help="o piloto automático joga, coletando as moedas")
+    parser.add_argument('--trace', metavar='ARQUIVO',
+                        help="salvar os tempos de cada seção (formato chrome://tracing)")
+    parser.add_argument('--telemetria', metavar='ARQUIVO',
+                        help="gravar a telemetria das partidas (leia com python telemetria.py ARQUIVO)")
+    parser.add_argument('--bench', type=inteiro_positivo, metavar='N',
+                        help="rodar N frames sem limite de FPS e mostrar estatísticas")
+    parser.add_argument('--servidor', action='store_true',
+                        help="rodar o servidor de corridas em rede (sem janela)")
+    parser.add_argument('--conectar', metavar='HOST',
+                        help="entrar na corrida do servidor em HOST")
+    parser.add_argument('--porta', type=int, default=config.REDE_PORTA,
+                        help="porta do servidor de corridas")
+    parser.add_argument('--linha-do-tempo', action='store_true',
+                        help="mostrar o tempo de cada etapa da inicialização")
+    parser.add_argument('--mostrar-config', action='store_true',
+                        help="mostrar a configuração final e sair (não carrega o pygame)")
+    return parser
+
+
+def imprimir_estatisticas(tempos):
+    """Mostra as estatísticas dos tempos de frame (ms) do modo --bench"""
+    ordenados = sorted(tempos)
+
+    def percentil(p):
+        return ordenados[min(len(ordenados) - 1, int(p / 100 * len(ordenados)))]
+
+    media = sum(ordenados) / len(ordenados)
+    print(f"Frames: {len(ordenados)}")
+    print(f"Média: {media:.3f} ms ({1000 / media:.0f} FPS)")
+    print(f"p50: {percentil(50):.3f} ms  p95: {percentil(95):.3f} ms  "
+          f"p99: {percentil(99):.3f} ms  máx: {ordenados[-1]:.3f} ms")
+
+
+def executar_servidor(opcoes):
+    """Modo --servidor: simulação autoritativa sem janela"""
+    import asyncio
+    pygame = importar_pygame()
+    from assets import Assets
+    from mapa import Mapa
+    from rede import servir
+
+    # A tela mínima é necessária para converter as imagens
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    assets = Assets()
+    mapa = Mapa(opcoes.mapa, assets)
+    try:
+        asyncio.run(servir(assets, mapa, opcoes.semente, '127.0.0.1', opcoes.porta))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def main(argv=None):
+    parser = criar_parser()
+    opcoes = parser.parse_args(argv)
+    if opcoes.bench is not None and opcoes.bench <= 0:
+        parser.error("--bench precisa de um número positivo de frames")
+    if opcoes.densidade_meteoros is not None and opcoes.densidade_meteoros <= 0:
+        parser.error("--densidade-meteoros precisa ser maior que zero")
+
+    try:
+        if opcoes.perfil:
+            aplicar_valores(carregar_perfil(opcoes.perfil))
+        aplicar_valores(valores_das_opcoes(opcoes))
+    except (OSError, ValueError) as erro:
+        parser.error(str(erro))
+
+    if opcoes.mostrar_config:
+        for nome in dir(config):
+            if nome.isupper():
+                print(f"{nome} = {getattr(config, nome)!r}")
+        return 0
+
+    # Precisa valer antes do pygame ser importado
+    if opcoes.headless or opcoes.servidor:
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        os.environ['SDL_AUDIODRIVER'] = 'dummy'
+
+    if opcoes.servidor:
+        return executar_servidor(opcoes)
+
+    cliente = None
+    if opcoes.conectar:
+        importar_pygame()
+        from rede import ClienteCorrida
+
+        try:
+            cliente = ClienteCorrida(opcoes.conectar, opcoes.porta)
+        except OSError as erro:
+            parser.error(f"não foi possível conectar a {opcoes.conectar}:{opcoes.porta}: {erro}")
+
+    inicio = time.perf_counter()
+    importar_pygame()
+    from main import Jogo
+    importacao = (time.perf_counter() - inicio) * 1000
+
+    jogo = Jogo(opcoes.mapa, opcoes.semente, cliente)
+    jogo.linha_do_tempo.insert(0, ('import', importacao))
+    if opcoes.piloto:
+        from piloto import PilotoAutomatico
+
+        jogo.entrada = PilotoAutomatico(jogo)
+    if opcoes.profiler:
+        jogo.profiler.alternar()
+    if opcoes.trace:
+        jogo.profiler.iniciar_trace()
+
+    if opcoes.bench is None:
+        jogo.executar()
+    else:
+        import pygame
+
+        tempos = [jogo.executar_frame() for _ in range(opcoes.bench)]
+        if jogo.telemetria is not None:
+            jogo.telemetria.fechar()
+        pygame.quit()
+        imprimir_estatisticas(tempos)
+
+    if opcoes.trace:
+        jogo.profiler.salvar_trace(opcoes.trace)
+    if opcoes.linha_do_tempo:
+        for etapa, ms in jogo.linha_do_tempo:
+            print(f"{etapa}: {ms:.2f} ms")
+        print(f"total: {sum(ms for _, ms in jogo.linha_do_tempo):.2f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
\ No newline at end of file
@@ -2,41 +2,66 @@
 Dino Runner - Jogo de plataforma
 Arquivo principal
 """
+import time
+from collections import deque
 import pygame
 from config import (
-    LARGURA, ALTURA, LARGURA_VIRTUAL, ALTURA_VIRTUAL, FPS,
-    ICONE_VIDA_ESPACAMENTO, ICONE_VIDA_MARGEM_X, ICONE_VIDA_MARGEM_Y,
-    PONTOS_POR_MOEDA
+    LARGURA, ALTURA, LARGURA_VIRTUAL, ALTURA_VIRTUAL, FPS, VSYNC, METEORO_DESTROI_TILES,
+    ENTRADA_FOLGA_MS, ENTRADA_JANELA_FRAMES, COLISAO_POR_PIXEL, MAPA_RECARGA, TILE_SIZE, TELEMETRIA_ARQUIVO, TELEMETRIA_CAPACIDADE,
+    TELEMETRIA_INTERVALO, TELEMETRIA_REGIAO_TILES, TELEMETRIA_PICO_MS
 )
 from assets import Assets
 from mapa import Mapa
 from jogador import Jogador
 from camera import Camera
+from parallax import Parallax
 from meteoro import GerenciadorMeteoros
 from moeda import GerenciadorMoedas
+from profiler import Profiler
+from eventos import BarramentoEventos, MoedaColetada, MeteoroAtingiu, MeteoroPousou
+from placar import Placar
+from hud import HUD
+from estado import EstadoJogo
+from entrada import Entrada
+from particulas import SistemaParticulas
+from posprocessamento import PosProcessamento
 
 class Jogo:
     """Classe principal do jogo"""
     
-    def __init__(self):
-        pygame.init()
+    def __init__(self, arquivo_mapa='mapa1.txt', semente=None, cliente=None):
+        # Linha do tempo da inicialização: (etapa, ms)
+        self.linha_do_tempo = []
+        self._inicio_etapa = time.perf_counter()
+        
+        # Só os subsistemas usados (sem áudio e joystick)
+        pygame.display.init()
+        pygame.font.init()
         
         # Configurar tela
         self.tela = pygame.display.set_mode(
             (LARGURA, ALTURA),
             pygame.SCALED | pygame.RESIZABLE,
-            vsync=1
+            vsync=1 if VSYNC else 0
         )
         pygame.display.set_caption("Dino Runner - Modular")
-        
-        # Superfície virtual para pixel art
-        self.superficie_virtual = pygame.Surface((LARGURA_VIRTUAL, ALTURA_VIRTUAL))
+        self._marcar_etapa('init')
         
         # Carregar recursos
         self.assets = Assets()
+        self._marcar_etapa('assets')
+        
+        # Superfície virtual para pixel art
+        self.superficie_virtual = self.assets.memoria.registrar(
+            pygame.Surface((LARGURA_VIRTUAL, ALTURA_VIRTUAL)), 'tela'
+        )
         
         # Criar mapa
-        self.mapa = Mapa('mapa1.txt', self.assets)
+        self.mapa = Mapa(arquivo_mapa, self.assets)
+        self._marcar_etapa('mapa')
+        
+        # Criar fundo com parallax
+        self.parallax = Parallax(self.assets)
         
         # Criar jogador
         self.jogador = Jogador(50, 100, self.assets)
@@ -44,61 +69,211 @@ class Jogo:
         # Criar câmera
         self.camera = Camera(self.mapa.largura_px, self.mapa.altura_px)
         
+        # Barramento de eventos (colisões são entregues em lote por tick)
+        self.eventos = BarramentoEventos()
+        
         # Criar gerenciador de meteoros
-        self.gerenciador_meteoros = GerenciadorMeteoros(self.assets, self.mapa.largura_px)
+        self.semente = semente
+        self.gerenciador_meteoros = GerenciadorMeteoros(
+            self.assets, self.mapa.largura_px, self.eventos, semente
+        )
+        # Trajetórias são recalculadas quando tiles no caminho mudam
+        self.mapa.ouvintes_alteracao.append(
+            lambda *regiao: self.gerenciador_meteoros.ao_alterar_regiao(*regiao, self.mapa)
+        )
         
         # Criar gerenciador de moedas
-        self.gerenciador_moedas = GerenciadorMoedas(self.assets, self.mapa.largura_px)
+        self.gerenciador_moedas = GerenciadorMoedas(self.assets, self.mapa.largura_px, self.eventos)
         
         # Carregar moedas do mapa
         self._carregar_moedas_do_mapa()
         
-        # Fonte para Game Over
+        # Detritos dos impactos e brilho das moedas coletadas
+        self.particulas = SistemaParticulas(semente=semente)
+        
+        # Flash de dano, céu escurecendo e fundo do Game Over
+        self.posprocessamento = PosProcessamento()
+        
+        # Fonte e textos do Game Over (renderizados uma vez)
         self.fonte_game_over = pygame.font.Font(None, 20)
+        self.textos_game_over = []
+        for texto, dy in (("GAME OVER", -15), ("Pressione R para reiniciar", 5)):
+            imagem = self.fonte_game_over.render(texto, True, (255, 255, 255))
+            self.textos_game_over.append(
+                (imagem, imagem.get_rect(center=(LARGURA_VIRTUAL // 2, ALTURA_VIRTUAL // 2 + dy)))
+            )
         
         # Fonte para HUD (moedas, pontos)
         self.fonte_hud = pygame.font.Font(None, 16)
         
-        # Controles
-        self.relogio = pygame.time.Clock()
+        # Pontuação e HUD
+        self.placar = Placar()
+        self.hud = HUD(self.assets, self.fonte_hud)
+        
+        # Telemetria das partidas (gravada por uma thread, sem I/O no loop)
+        self.telemetria = None
+        if TELEMETRIA_ARQUIVO:
+            from telemetria import Telemetria
+
+            self.telemetria = Telemetria(
+                TELEMETRIA_ARQUIVO, TELEMETRIA_CAPACIDADE, TELEMETRIA_INTERVALO,
+                TELEMETRIA_REGIAO_TILES * TILE_SIZE, TELEMETRIA_PICO_MS
+            )
+            self.telemetria.nova_partida(semente)
+        self._conectar_eventos()
+        
+        # Medição de tempos e overlay de depuração
+        self.profiler = Profiler(self.assets.memoria)
+        self.profiler.geradores_linhas.append(self.gerenciador_meteoros.linhas_estatisticas)
+        self.profiler.geradores_linhas.append(self.particulas.linhas_estatisticas)
+        self.profiler.geradores_linhas.append(self.posprocessamento.linhas_estatisticas)
+        if self.telemetria is not None:
+            self.profiler.geradores_linhas.append(self.telemetria.linhas_estatisticas)
+        
+        # Corrida em rede: meteoros vêm do servidor e os outros jogadores são fantasmas
+        self.cliente = cliente
+        self.pulou = False
+        if cliente is not None:
+            from rede import Fantasmas
+            
+            self.gerenciador_meteoros.spawn_local = False
+            self.fantasmas = Fantasmas(self.assets)
+        
+        # Controles (eventos lidos também durante a espera entre frames)
+        self.entrada = Entrada()
+        # A entrada pode ser trocada depois (piloto automático, sessões gravadas)
+        self.profiler.geradores_linhas.append(lambda: self.entrada.linhas_estatisticas())
         self.rodando = True
+        self.trabalho_ms = 0  # Duração do último frame até o flip
         self.game_over = False
+        
+        # Snapshot do início (reinício instantâneo) e checkpoint manual (F5/F9)
+        self.estado_inicial = self.capturar_estado()
+        self.checkpoint = None
+        
+        # Modo de desenvolvimento: o mapa acompanha o arquivo salvo
+        self.recarga = None
+        if MAPA_RECARGA:
+            from recarga import RecargaMapa
+
+            self.recarga = RecargaMapa(self, arquivo_mapa)
+            self.profiler.geradores_linhas.append(self.recarga.linhas_estatisticas)
+        self._marcar_etapa('objetos')
+    
+    def _marcar_etapa(self, etapa):
+        """Registra na linha do tempo o tempo desde a etapa anterior"""
+        agora = time.perf_counter()
+        self.linha_do_tempo.append((etapa, (agora - self._inicio_etapa) * 1000))
+        self._inicio_etapa = agora
     
     def _carregar_moedas_do_mapa(self):
         """Carrega todas as moedas definidas no mapa"""
         for x, y in self.mapa.posicoes_moedas:
             self.gerenciador_moedas.adicionar_moeda(x, y)
     
+    def _conectar_eventos(self):
+        """Inscreve jogador, placar e HUD nos eventos do jogo"""
+        self.eventos.limpar()
+        self.eventos.inscrever(MoedaColetada, self.jogador.ao_coletar_moedas)
+        self.eventos.inscrever(MoedaColetada, self.placar.ao_coletar_moedas)
+        self.eventos.inscrever(MoedaColetada, self.hud.invalidar)
+        self.eventos.inscrever(MeteoroAtingiu, self.jogador.ao_ser_atingido)
+        self.eventos.inscrever(MoedaColetada, self.particulas.ao_coletar_moedas)
+        self.eventos.inscrever(MeteoroPousou, self.particulas.ao_pousar_meteoros)
+        if METEORO_DESTROI_TILES:
+            self.eventos.inscrever(MeteoroPousou, self.mapa.ao_pousar_meteoros)
+        if self.telemetria is not None:
+            self.eventos.inscrever(MoedaColetada, self.telemetria.ao_coletar_moedas)
+            self.eventos.inscrever(
+                MeteoroAtingiu, lambda lote: self.telemetria.ao_ser_atingido(self.jogador, lote)
+            )
+    
     def processar_eventos(self):
         """Processa eventos do pygame"""
-        for evento in pygame.event.get():
+        for evento in self.entrada.eventos_do_tick():
             if evento.type == pygame.QUIT:
                 self.rodando = False
             
             if evento.type == pygame.KEYDOWN:
                 if evento.key == pygame.K_ESCAPE:
                     self.rodando = False
+                if evento.key == pygame.K_F3:
+                    self.profiler.alternar()
+                if evento.key == pygame.K_F5 and not self.game_over:
+                    self.checkpoint = self.capturar_estado()
+                    if self.cliente is not None:
+                        from rede import SALVAR_CHECKPOINT
+                        
+                        self.cliente.enviar_reinicio(SALVAR_CHECKPOINT)
+                if evento.key == pygame.K_F9 and self.checkpoint is not None:
+                    self.restaurar_estado(self.checkpoint)
+                    if self.cliente is not None:
+                        from rede import VOLTAR_CHECKPOINT
+                        
+                        self.cliente.enviar_reinicio(VOLTAR_CHECKPOINT)
                 if evento.key in (pygame.K_SPACE, pygame.K_UP):
                     if not self.game_over:
-                        self.jogador.pular()
+                        self.jogador.pedir_pulo()
+                        self.pulou = True
                 if evento.key == pygame.K_r and self.game_over:
                     self.reiniciar()
     
+    def capturar_estado(self):
+        """Captura o estado completo do jogo"""
+        return EstadoJogo(
+            self.jogador.capturar_estado(),
+            self.gerenciador_meteoros.capturar_estado(),
+            self.gerenciador_moedas.capturar_estado(),
+            self.placar.capturar_estado(),
+            self.mapa.capturar_estado(),
+            self.game_over
+        )
+    
+    def restaurar_estado(self, estado):
+        """Restaura um estado capturado por capturar_estado"""
+        self.mapa.restaurar_estado(estado.mapa)
+        self.jogador.restaurar_estado(estado.jogador)
+        # Em rede, os meteoros são do servidor (compartilhados pela corrida)
+        if self.cliente is None:
+            self.gerenciador_meteoros.restaurar_estado(estado.meteoros, self.mapa)
+        self.gerenciador_moedas.restaurar_estado(estado.moedas)
+        self.placar.restaurar_estado(estado.placar)
+        self.particulas.limpar()
+        self.posprocessamento.limpar()
+        self.game_over = estado.game_over
+        self.camera.atualizar(self.jogador.x, self.jogador.y)
+        self.hud.invalidar()
+    
     def reiniciar(self):
         """Reinicia o jogo"""
-        self.jogador = Jogador(50, 100, self.assets)
-        self.gerenciador_meteoros = GerenciadorMeteoros(self.assets, self.mapa.largura_px)
-        self.gerenciador_moedas = GerenciadorMoedas(self.assets, self.mapa.largura_px)
-        self._carregar_moedas_do_mapa()
-        self.game_over = False
+        self.restaurar_estado(self.estado_inicial)
+        # Sem semente fixa, cada partida tem uma nova sequência de meteoros
+        if self.semente is None:
+            self.gerenciador_meteoros.rng.seed()
+        if self.telemetria is not None:
+            self.telemetria.nova_partida(self.semente)
+        if self.cliente is not None:
+            from rede import REINICIAR
+            
+            self.cliente.enviar_reinicio(REINICIAR)
+    
+    def _sincronizar_rede(self, teclas):
+        """Envia as teclas, cria os meteoros do servidor e aplica as correções ao jogador"""
+        self.cliente.enviar_entrada(teclas[pygame.K_LEFT], teclas[pygame.K_RIGHT], self.pulou)
+        self.pulou = False
+        for x, y, vel_x, vel_y in self.cliente.receber():
+            self.gerenciador_meteoros.adicionar_meteoro(x, y, vel_x, vel_y, self.mapa)
+        self.cliente.reconciliar(self.jogador, self.mapa)
     
     def atualizar(self):
         """Atualiza a lógica do jogo"""
+        teclas = self.entrada.teclas()
+        if self.cliente is not None:
+            self._sincronizar_rede(teclas)
+        
         if self.game_over:
             return
         
-        teclas = pygame.key.get_pressed()
-        
         # 1. Atualiza jogador
         self.jogador.atualizar(teclas, self.mapa)
         
@@ -111,58 +286,49 @@ class Jogo:
         # 4. Atualiza moedas
         self.gerenciador_moedas.atualizar(self.camera.x)
         
-        # 5. Verifica colisão com meteoros
-        if self.gerenciador_meteoros.verificar_colisao_jogador(self.jogador.get_hitbox()):
-            self.jogador.receber_dano()
+        # 5. Verifica colisões (emitem eventos)
+        hitbox = self.jogador.get_hitbox()
+        mascara = self.jogador.get_mascara() if COLISAO_POR_PIXEL else None
+        self.gerenciador_meteoros.verificar_colisao_jogador(hitbox, mascara)
+        self.gerenciador_moedas.verificar_colisao_jogador(hitbox)
+        
+        # 6. Entrega os eventos do tick em lote
+        self.eventos.despachar()
+        if self.cliente is not None:
+            # Conferida com o estado do servidor quando o snapshot chegar
+            self.cliente.prever(self.jogador)
         
-        # 6. Verifica colisão com moedas
-        pontos_moedas = self.gerenciador_moedas.verificar_colisao_jogador(self.jogador.get_hitbox())
-        for _ in range(pontos_moedas // PONTOS_POR_MOEDA):
-            self.jogador.adicionar_moeda()
+        # 7. Partículas (inclusive as emitidas pelos eventos acima)
+        self.particulas.atualizar()
         
-        # 7. Verifica Game Over (espera animação terminar)
+        # 8. Intensidade dos efeitos de tela
+        self.posprocessamento.atualizar(
+            self.jogador, self.gerenciador_meteoros.quantidade_visivel(self.camera.x, self.camera.y)
+        )
+        
+        # 9. Telemetria (tempo por região, morte)
+        if self.telemetria is not None:
+            self.telemetria.ao_tick(self.jogador)
+        
+        # 10. Verifica Game Over (espera animação terminar)
         if self.jogador.morto and self.jogador.animacao_morte_completa:
             self.game_over = True
     
-    def desenhar_hud(self):
-        """Desenha a interface (vidas, moedas, pontos)"""
-        # Desenhar vidas
-        x = ICONE_VIDA_MARGEM_X
-        y = ICONE_VIDA_MARGEM_Y
-        
-        for i in range(self.jogador.vidas):
-            self.superficie_virtual.blit(self.assets.icone_vida, (x, y))
-            x += ICONE_VIDA_ESPACAMENTO
-        
-        # Desenhar moedas coletadas
-        texto_moedas = self.fonte_hud.render(f"Moedas: {self.jogador.moedas_coletadas}", True, (255, 215, 0))
-        self.superficie_virtual.blit(texto_moedas, (LARGURA_VIRTUAL - 80, ICONE_VIDA_MARGEM_Y))
-    
     def desenhar_game_over(self):
-        """Desenha a tela de Game Over"""
-        # Overlay semi-transparente
-        overlay = pygame.Surface((LARGURA_VIRTUAL, ALTURA_VIRTUAL))
-        overlay.set_alpha(128)
-        overlay.fill((0, 0, 0))
-        self.superficie_virtual.blit(overlay, (0, 0))
-        
-        # Texto Game Over
-        texto_go = self.fonte_game_over.render("GAME OVER", True, (255, 255, 255))
-        texto_rect_go = texto_go.get_rect(center=(LARGURA_VIRTUAL // 2, ALTURA_VIRTUAL // 2 - 15))
-        self.superficie_virtual.blit(texto_go, texto_rect_go)
-        
-        # Texto reiniciar
-        texto_r = self.fonte_game_over.render("Pressione R para reiniciar", True, (255, 255, 255))
-        texto_rect_r = texto_r.get_rect(center=(LARGURA_VIRTUAL // 2, ALTURA_VIRTUAL // 2 + 5))
-        self.superficie_virtual.blit(texto_r, texto_rect_r)
+        """Desenha os textos da tela de Game Over (o fundo escurece no pós-processamento)"""
+        for imagem, rect in self.textos_game_over:
+            self.superficie_virtual.blit(imagem, rect)
     
     def desenhar(self):
         """Desenha todos os elementos do jogo"""
+        # Desenhar fundo (céu e camadas de parallax)
+        self.parallax.desenhar(self.superficie_virtual, self.camera.x)
+        
         # Desenhar mapa na superfície virtual
-        self.superficie_virtual.blit(
-            self.mapa.superficie,
-            (0, 0),
-            (self.camera.x, self.camera.y, LARGURA_VIRTUAL, ALTURA_VIRTUAL)
+        self.mapa.desenhar(
+            self.superficie_virtual,
+            self.camera.x,
+            self.camera.y
         )
         
         # Desenhar meteoros
@@ -179,6 +345,22 @@ class Jogo:
             self.camera.y
         )
         
+        # Desenhar partículas
+        self.particulas.desenhar(
+            self.superficie_virtual,
+            self.camera.x,
+            self.camera.y
+        )
+        
+        # Desenhar os outros jogadores da corrida
+        if self.cliente is not None:
+            self.fantasmas.desenhar(
+                self.superficie_virtual,
+                self.camera.x,
+                self.camera.y,
+                self.cliente.posicoes_fantasmas()
+            )
+        
         # Desenhar jogador
         self.jogador.desenhar(
             self.superficie_virtual,
@@ -187,29 +369,93 @@ class Jogo:
         )
         
         # Desenhar HUD
-        self.desenhar_hud()
+        self.hud.desenhar(self.superficie_virtual, self.jogador)
+        
+        # Efeitos de tela inteira (LUTs)
+        inicio = time.perf_counter()
+        if self.posprocessamento.aplicar(self.superficie_virtual, self.game_over):
+            self.profiler.registrar('pos', inicio)
         
         # Desenhar Game Over se necessário
         if self.game_over:
             self.desenhar_game_over()
         
-        # Escalar e desenhar na tela real
-        superficie_zoom = pygame.transform.scale(
+        # Overlay de depuração (F3)
+        self.profiler.desenhar(self.superficie_virtual)
+        
+        # Escalar direto na tela real (sem criar uma superfície por frame)
+        pygame.transform.scale(
             self.superficie_virtual,
-            (LARGURA, ALTURA)
+            (LARGURA, ALTURA),
+            self.tela
         )
-        self.tela.blit(superficie_zoom, (0, 0))
-        
+    
+    def executar_frame(self):
+        """Processa, atualiza e desenha um frame; retorna sua duração em ms"""
+        inicio_frame = time.perf_counter()
+        self.processar_eventos()
+        if self.recarga is not None:
+            self.recarga.verificar()
+        
+        inicio = time.perf_counter()
+        self.atualizar()
+        self.profiler.registrar('atualizar', inicio)
+        
+        inicio = time.perf_counter()
+        self.desenhar()
+        self.profiler.registrar('desenhar', inicio)
+        
+        # Com vsync, o flip espera o próximo quadro do monitor
+        inicio = time.perf_counter()
+        self.trabalho_ms = (inicio - inicio_frame) * 1000
         pygame.display.flip()
+        self.profiler.registrar('apresentar', inicio)
+        self.entrada.frame_apresentado()
+        
+        if self._inicio_etapa is not None:
+            # A inicialização termina com o primeiro frame na tela
+            self._marcar_etapa('primeiro frame')
+            self._inicio_etapa = None
+        
+        duracao = (time.perf_counter() - inicio_frame) * 1000
+        if self.telemetria is not None:
+            self.telemetria.ao_frame(duracao)
+        return duracao
+    
+    def rodar(self, frames=None):
+        """Roda frames no ritmo de FPS até sair (ou até `frames` frames).
+        
+        A espera entre frames acontece antes de ler a entrada, não depois do
+        flip: com vsync, o frame começa o mais tarde possível, para que as
+        teclas cheguem à tela no quadro seguinte. A antecedência é o frame
+        mais longo dos últimos ENTRADA_JANELA_FRAMES (até o flip) mais
+        ENTRADA_FOLGA_MS: com a média, todo frame acima dela perdia o vsync
+        e ficava um quadro inteiro a mais na fila.
+        """
+        periodo = 1 / FPS if FPS else 0
+        proximo = time.perf_counter()
+        trabalhos = deque(maxlen=ENTRADA_JANELA_FRAMES)
+        while self.rodando and frames != 0:
+            self.entrada.esperar_ate(proximo)
+            inicio = time.perf_counter()
+            self.executar_frame()
+            if VSYNC and periodo:
+                trabalhos.append(self.trabalho_ms)
+                antecedencia = min(max(trabalhos) + ENTRADA_FOLGA_MS, periodo * 1000)
+                proximo = time.perf_counter() + periodo - antecedencia / 1000
+            else:
+                proximo = inicio + periodo
+            if frames is not None:
+                frames -= 1
     
     def executar(self):
         """Loop principal do jogo"""
-        while self.rodando:
-            self.processar_eventos()
-            self.atualizar()
-            self.desenhar()
-            self.relogio.tick(FPS)
+        self.rodar()
         
+        if self.cliente is not None:
+            self.cliente.fechar()
+        if self.telemetria is not None:
+            self.telemetria.fechar()
         pygame.quit()
 
 if __name__ == "__main__":
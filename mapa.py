@@ -2,8 +2,59 @@
 Gerenciamento do mapa e colisões
 """
 import pygame
-# Removemos COR_CEU da importação
-from config import TILE_SIZE
+from config import TILE_SIZE, COR_CHAVE_MAPA, MAPA_CHUNK_TILES, MAPA_CHUNKS_SOB_DEMANDA, MAPA_NAVEGACAO
+from autotile import TILES, VAZIO, TERRA, autotile, autotile_celula
+
+TILE_VAZIO = '.'
+# '#' marca um tile sólido cujo sprite é escolhido pelo autotiling
+TILE_AUTOMATICO = '#'
+# Caractere do arquivo -> ID do tile (qualquer outro caractere é vazio)
+ID_POR_TILE = {tile: indice for indice, tile in enumerate(TILES) if indice != VAZIO}
+TILE_MOEDA = 'C'
+# Tabelas para bytes.translate, que converte uma linha inteira sem laço em Python:
+# byte do caractere (latin-1) -> ID do tile, e ID do tile -> 1 se sólido
+ID_POR_BYTE = bytes(ID_POR_TILE.get(chr(codigo), VAZIO) for codigo in range(256))
+SOLIDEZ = bytes([0]) + bytes([1]) * 255
+
+
+def _janela_diferente(linha, nova):
+    """[inicio, fim) que cobre todas as posições em que duas linhas (bytes) diferem.
+    
+    Prefixo e sufixo iguais são achados por busca binária comparando fatias.
+    """
+    tamanho = len(linha)
+    baixo, alto = 0, tamanho
+    while baixo < alto:
+        meio = (baixo + alto + 1) // 2
+        if linha[:meio] == nova[:meio]:
+            baixo = meio
+        else:
+            alto = meio - 1
+    inicio = baixo
+    baixo, alto = 0, tamanho - inicio
+    while baixo < alto:
+        meio = (baixo + alto + 1) // 2
+        if linha[tamanho - meio:] == nova[tamanho - meio:]:
+            baixo = meio
+        else:
+            alto = meio - 1
+    return inicio, tamanho - baixo
+
+
+def _quantos_diferentes(linha, nova):
+    """Quantos bytes diferem entre duas fatias do mesmo tamanho"""
+    xor = int.from_bytes(linha, 'little') ^ int.from_bytes(nova, 'little')
+    return len(linha) - xor.to_bytes(len(linha), 'little').count(0)
+
+
+def _posicoes(texto, caractere):
+    """Índices de `caractere` (um byte) em `texto`"""
+    posicoes = set()
+    indice = texto.find(caractere)
+    while indice != -1:
+        posicoes.add(indice)
+        indice = texto.find(caractere, indice + 1)
+    return posicoes
 
 
 class Mapa:
@@ -12,17 +63,66 @@ class Mapa:
     def __init__(self, arquivo, assets):
         self.assets = assets
         self.dados = self._carregar_mapa(arquivo)
-        self.largura_px = len(self.dados[0]) * TILE_SIZE
-        self.altura_px = len(self.dados) * TILE_SIZE
-        self.superficie = self._pre_renderizar()
+        self.colunas = len(self.dados[0])
+        self.linhas = len(self.dados)
+        self.largura_px = self.colunas * TILE_SIZE
+        self.altura_px = self.linhas * TILE_SIZE
+        # IDs dos tiles (0 = vazio); também servem como grade de colisão
+        self.tiles = [
+            bytearray(ID_POR_TILE.get(tile, VAZIO) for tile in linha) for linha in self.dados
+        ]
+        if any(TILE_AUTOMATICO in linha for linha in self.dados):
+            self.tiles = self._autotile_completo(self.tiles, self.dados)
+        
+        # Sprite de cada ID de tile (na ordem de autotile.TILES)
+        self.sprites_tiles = [
+            None,
+            assets.tile_grama,
+            assets.tile_terra,
+            assets.tile_ponta_esq,
+            assets.tile_ponta_dir,
+            assets.tile_terra_esq_dir,  # Terra Esquerda-Direita
+            assets.tile_terra_dir_esq,  # Terra Direita-Esquerda
+            assets.tile_terra_lateral_esq,  # Terra Lateral Esquerda
+            assets.tile_terra_lateral_dir,  # Terra Lateral Direita
+        ]
+        if MAPA_CHUNKS_SOB_DEMANDA:
+            # Cada chunk é renderizado no primeiro desenho em que aparece
+            self.chunks = [None] * -(-self.colunas // MAPA_CHUNK_TILES)
+        else:
+            self.chunks = self._pre_renderizar()
+        self.chunks_editados = set()
+        
+        # Tiles como carregados, para restaurar o mapa depois de edições
+        self.tiles_originais = b''.join(self.tiles)
+        self.editado = False
+        # Funções chamadas com (col início, row início, col fim, row fim),
+        # inclusivos, quando a solidez de tiles da região muda
+        self.ouvintes_alteracao = []
+        self.chunks_visiveis = range(0)  # Chunks do último desenhar()
         self.posicoes_moedas = self._extrair_moedas()
+        
+        # Plataformas ligadas por pulos e quedas (bots e piloto automático),
+        # construídas no primeiro grafo_navegacao() se não forem pedidas já aqui
+        self.navegacao = None
+        if MAPA_NAVEGACAO:
+            self.grafo_navegacao()
+    
+    def grafo_navegacao(self):
+        """Grafo de navegação do mapa, construído na primeira chamada"""
+        if self.navegacao is None:
+            from navegacao import GrafoNavegacao
+
+            self.navegacao = GrafoNavegacao(self)
+            self.ouvintes_alteracao.append(self.navegacao.ao_alterar_regiao)
+        return self.navegacao
     
     def _extrair_moedas(self):
         """Extrai posições de moedas do mapa"""
         moedas = []
         for linha_idx, linha in enumerate(self.dados):
             for coluna_idx, tile in enumerate(linha):
-                if tile == 'C':  # C = Coin (moeda)
+                if tile == TILE_MOEDA:
                     x = coluna_idx * TILE_SIZE + TILE_SIZE // 2
                     y = linha_idx * TILE_SIZE + TILE_SIZE // 2
                     moedas.append((x, y))
@@ -33,15 +133,18 @@ class Mapa:
         pass
     
     def _carregar_mapa(self, arquivo):
-        """Carrega o mapa de um arquivo de texto"""
+        """Carrega o mapa de um arquivo de texto como uma grade mutável"""
+        return [list(linha) for linha in self._ler_linhas(arquivo)]
+    
+    def _ler_linhas(self, arquivo):
+        """Linhas do arquivo do mapa, todas com a largura da primeira"""
         try:
             with open(arquivo, 'r') as f:
                 linhas = f.readlines()
             mapa = [linha.rstrip('\n') for linha in linhas]
-            return mapa
         except FileNotFoundError:
             # Mapa padrão caso o arquivo não exista
-            return [
+            mapa = [
                 "                        ",
                 "                        ",
                 "      EGGGGGGGGGD       ",
@@ -51,48 +154,286 @@ class Mapa:
                 "EGGGGGGGGGGGGGGGGGGGGGGD",
                 "LLLLLLRRRRRRLLLLL<><>><>"
             ]
+        
+        largura = len(mapa[0])
+        return [linha[:largura].ljust(largura, TILE_VAZIO) for linha in mapa]
+    
+    def _autotile_completo(self, tiles, dados):
+        """Escolhe o sprite de todos os tiles sólidos a partir dos vizinhos.
+        
+        Retorna os novos IDs e atualiza os caracteres de `dados`.
+        """
+        for ids, linha in zip(tiles, dados):
+            for col, tile in enumerate(linha):
+                if tile == TILE_AUTOMATICO:
+                    ids[col] = TERRA
+        tiles = autotile(tiles)
+        for row, ids in enumerate(tiles):
+            linha = dados[row]
+            for col, tile_id in enumerate(ids):
+                if tile_id:
+                    linha[col] = TILES[tile_id]
+                elif linha[col] == TILE_AUTOMATICO:
+                    linha[col] = TILE_VAZIO
+        return tiles
     
     def _pre_renderizar(self):
-        """Renderiza o mapa completo antecipadamente para otimização"""
-        superficie = pygame.Surface((self.largura_px, self.altura_px))
+        """Renderiza os tiles do mapa antecipadamente, em faixas verticais (chunks)"""
+        return [
+            self._renderizar_chunk(indice)
+            for indice in range(-(-self.colunas // MAPA_CHUNK_TILES))
+        ]
+    
+    def _renderizar_chunk(self, indice):
+        """Renderiza uma faixa de MAPA_CHUNK_TILES colunas do mapa"""
+        inicio = indice * MAPA_CHUNK_TILES
+        largura = min(MAPA_CHUNK_TILES, self.colunas - inicio) * TILE_SIZE
+        # O fundo é desenhado pelo parallax; aqui ficam só os tiles
+        superficie = pygame.Surface((largura, self.altura_px)).convert()
+        superficie.fill(COR_CHAVE_MAPA)
+        superficie.set_colorkey(COR_CHAVE_MAPA, pygame.RLEACCEL)
         
-        # --- NOVO: Desenhar o background repetido (Tiling) ---
-        # Em vez de preencher com cor sólida, desenhamos a imagem.
-        bg = self.assets.background
-        bg_w = bg.get_width()
-        bg_h = bg.get_height()
+        sprites = self.sprites_tiles
+        blits = []
+        for linha_idx, linha in enumerate(self.tiles):
+            y = linha_idx * TILE_SIZE
+            for x, tile_id in enumerate(linha[inicio:inicio + MAPA_CHUNK_TILES]):
+                if tile_id:
+                    blits.append((sprites[tile_id], (x * TILE_SIZE, y)))
+        superficie.blits(blits, doreturn=False)
         
-        # Calcula quantas vezes a imagem cabe horizontalmente e verticalmente
-        cols = (self.largura_px // bg_w) + 1
-        rows = (self.altura_px // bg_h) + 1
+        return self.assets.memoria.registrar(superficie, 'mapa')
+    
+    def _renderizar_tile(self, col, row):
+        """Redesenha um único tile no chunk que o contém"""
+        chunk, x = divmod(col, MAPA_CHUNK_TILES)
+        posicao = (x * TILE_SIZE, row * TILE_SIZE)
+        superficie = self.chunks[chunk]
+        if superficie is None:
+            # Ainda não renderizado: sairá com o tile novo quando aparecer
+            return
         
-        for r in range(rows):
-            for c in range(cols):
-                superficie.blit(bg, (c * bg_w, r * bg_h))
+        # O SDL recodifica o RLE a cada alteração de uma superfície RLE, então
+        # editamos uma cópia sem RLE e voltamos a usar RLE no próximo desenho
+        if chunk not in self.chunks_editados:
+            editavel = pygame.Surface(superficie.get_size()).convert()
+            editavel.fill(COR_CHAVE_MAPA)
+            editavel.blit(superficie, (0, 0))
+            editavel.set_colorkey(COR_CHAVE_MAPA)
+            superficie = self.assets.memoria.registrar(editavel, 'mapa')
+            self.chunks[chunk] = superficie
+            self.chunks_editados.add(chunk)
         
-        for linha_idx, linha in enumerate(self.dados):
-            for coluna_idx, tile in enumerate(linha):
-                x = coluna_idx * TILE_SIZE
-                y = linha_idx * TILE_SIZE
-                
-                if tile == 'G':
-                    superficie.blit(self.assets.tile_grama, (x, y))
-                elif tile == 'T':
-                    superficie.blit(self.assets.tile_terra, (x, y))
-                elif tile == 'E':
-                    superficie.blit(self.assets.tile_ponta_esq, (x, y))
-                elif tile == 'D':
-                    superficie.blit(self.assets.tile_ponta_dir, (x, y))
-                elif tile == 'L':  # Terra Esquerda-Direita
-                    superficie.blit(self.assets.tile_terra_esq_dir, (x, y))
-                elif tile == 'R':  # Terra Direita-Esquerda
-                    superficie.blit(self.assets.tile_terra_dir_esq, (x, y))
-                elif tile == '<':  # Terra Lateral Esquerda
-                    superficie.blit(self.assets.tile_terra_lateral_esq, (x, y))
-                elif tile == '>':  # Terra Lateral Direita
-                    superficie.blit(self.assets.tile_terra_lateral_dir, (x, y))
-        
-        return superficie.convert()
+        superficie.fill(COR_CHAVE_MAPA, (posicao, (TILE_SIZE, TILE_SIZE)))
+        tile_id = self.tiles[row][col]
+        if tile_id:
+            superficie.blit(self.sprites_tiles[tile_id], posicao)
+    
+    def get_tile(self, col, row):
+        """Retorna o tile na posição (ou vazio fora do mapa)"""
+        if 0 <= row < self.linhas and 0 <= col < self.colunas:
+            return self.dados[row][col]
+        return TILE_VAZIO
+    
+    def set_tile(self, col, row, tile, ajustar_bordas=True):
+        """Altera um tile em tempo de execução, redesenhando só o necessário.
+        
+        `tile` é um caractere do formato do mapa ('#' = sólido automático);
+        qualquer outro caractere é mantido como dado. Com `ajustar_bordas`,
+        os oito vizinhos sólidos passam pelo autotiling.
+        """
+        if not (0 <= row < self.linhas and 0 <= col < self.colunas):
+            return
+        if self.dados[row][col] == tile:
+            return
+        
+        era_solido = bool(self.tiles[row][col])
+        self.dados[row][col] = tile
+        self.tiles[row][col] = TERRA if tile == TILE_AUTOMATICO else ID_POR_TILE.get(tile, VAZIO)
+        self.editado = True
+        if era_solido != bool(self.tiles[row][col]):
+            self._notificar_alteracao(col, row, col, row)
+        
+        if tile == TILE_AUTOMATICO:
+            self._autotile_local(col, row, col, row)
+        self._renderizar_tile(col, row)
+        
+        if ajustar_bordas:
+            self._autotile_local(col - 1, row - 1, col + 1, row + 1, pular=(col, row))
+    
+    def _autotile_local(self, col_inicio, row_inicio, col_fim, row_fim, pular=None):
+        """Refaz o autotiling dos tiles sólidos de uma região (inclusiva).
+        
+        `pular` é uma célula (col, row) da região que mantém o seu tile.
+        """
+        for r in range(max(0, row_inicio), min(self.linhas, row_fim + 1)):
+            for c in range(max(0, col_inicio), min(self.colunas, col_fim + 1)):
+                if not self.tiles[r][c] or (c, r) == pular:
+                    continue
+                tile_id = autotile_celula(self.tiles, c, r)
+                if tile_id != self.tiles[r][c] or self.dados[r][c] != TILES[tile_id]:
+                    self.tiles[r][c] = tile_id
+                    self.dados[r][c] = TILES[tile_id]
+                    self._renderizar_tile(c, r)
+    
+    def _notificar_alteracao(self, col_inicio, row_inicio, col_fim, row_fim):
+        """Avisa os ouvintes de que tiles da região passaram a ser sólidos ou vazios"""
+        for ouvinte in self.ouvintes_alteracao:
+            ouvinte(col_inicio, row_inicio, col_fim, row_fim)
+    
+    def capturar_estado(self):
+        """Retorna os IDs dos tiles (None se o mapa não foi alterado)"""
+        if not self.editado:
+            return None
+        return b''.join(self.tiles)
+    
+    def restaurar_estado(self, estado):
+        """Restaura os tiles capturados, redesenhando só os que mudaram"""
+        if estado is None:
+            if not self.editado:
+                return
+            estado = self.tiles_originais
+        
+        for row, linha in enumerate(self.tiles):
+            inicio = row * self.colunas
+            nova = estado[inicio:inicio + self.colunas]
+            if linha == nova:
+                continue
+            for col, tile_id in enumerate(nova):
+                if linha[col] != tile_id:
+                    era_solido = bool(linha[col])
+                    linha[col] = tile_id
+                    self.dados[row][col] = TILES[tile_id]
+                    self._renderizar_tile(col, row)
+                    if era_solido != bool(tile_id):
+                        self._notificar_alteracao(col, row, col, row)
+        self.editado = estado != self.tiles_originais
+    
+    def recarregar(self, arquivo):
+        """Aplica as mudanças do arquivo do mapa sem carregá-lo do zero.
+        
+        O arquivo novo é comparado com Mapa.dados: linhas iguais são puladas
+        inteiras e, nas outras, a janela entre o prefixo e o sufixo iguais é
+        copiada de uma vez (IDs por bytes.translate). Os chunks alterados na
+        tela são renderizados de novo uma vez cada; os fora dela são
+        descartados e saem renderizados quando aparecerem. Os ouvintes
+        recebem uma única região, a que cobre os tiles cuja solidez mudou.
+        Edições feitas durante o jogo (crateras) dão lugar ao conteúdo do
+        arquivo, que passa a ser o mapa do reinício. O tamanho do mapa não
+        pode mudar (ValueError).
+        
+        Retorna (tiles alterados, moedas adicionadas, moedas removidas).
+        """
+        textos = self._ler_linhas(arquivo)
+        if len(textos) != self.linhas or len(textos[0]) != self.colunas:
+            raise ValueError(
+                f"o mapa mudou de tamanho ({len(textos[0])}x{len(textos)}, era "
+                f"{self.colunas}x{self.linhas}): reinicie o jogo"
+            )
+        tiles = None
+        if any(TILE_AUTOMATICO in texto for texto in textos):
+            dados = [list(texto) for texto in textos]
+            tiles = [bytearray(ID_POR_TILE.get(tile, VAZIO) for tile in linha) for linha in dados]
+            tiles = self._autotile_completo(tiles, dados)
+            textos = [''.join(linha) for linha in dados]
+        
+        alterados = 0
+        adicionadas = []
+        removidas = []
+        sujos = set()
+        regiao = None  # [col início, row início, col fim, row fim] da solidez alterada
+        moeda = TILE_MOEDA.encode()
+        for row, (linha, nova) in enumerate(zip(self.dados, textos)):
+            atual = ''.join(linha)
+            if atual == nova:
+                continue
+            # Caracteres fora do latin-1 viram '?', que também é vazio
+            antiga = atual.encode('latin-1', 'replace')
+            texto = nova.encode('latin-1', 'replace')
+            inicio, fim = _janela_diferente(antiga, texto)
+            if inicio == fim:
+                # Só caracteres fora do latin-1 mudaram
+                linha[:] = nova
+                continue
+            antiga = antiga[inicio:fim]
+            texto = texto[inicio:fim]
+            ids = self.tiles[row]
+            novos = tiles[row][inicio:fim] if tiles is not None else bytearray(texto.translate(ID_POR_BYTE))
+            
+            alterados += _quantos_diferentes(antiga, texto)
+            if ids[inicio:fim].translate(SOLIDEZ) != novos.translate(SOLIDEZ):
+                if regiao is None:
+                    regiao = [inicio, row, fim - 1, row]
+                else:
+                    regiao[0] = min(regiao[0], inicio)
+                    regiao[2] = max(regiao[2], fim - 1)
+                    regiao[3] = row
+            linha[inicio:fim] = nova[inicio:fim]
+            ids[inicio:fim] = novos
+            primeiro = inicio - inicio % MAPA_CHUNK_TILES
+            for col in range(primeiro, fim, MAPA_CHUNK_TILES):
+                faixa = slice(max(0, col - inicio), col - inicio + MAPA_CHUNK_TILES)
+                if antiga[faixa] != texto[faixa]:
+                    sujos.add(col // MAPA_CHUNK_TILES)
+            
+            if moeda in antiga or moeda in texto:
+                antes = _posicoes(antiga, moeda)
+                depois = _posicoes(texto, moeda)
+                y = row * TILE_SIZE + TILE_SIZE // 2
+                for indice in sorted(antes - depois):
+                    removidas.append(((inicio + indice) * TILE_SIZE + TILE_SIZE // 2, y))
+                for indice in sorted(depois - antes):
+                    adicionadas.append(((inicio + indice) * TILE_SIZE + TILE_SIZE // 2, y))
+        
+        if removidas:
+            # Um único filtro em vez de um list.remove (linear) por moeda
+            descartadas = set(removidas)
+            self.posicoes_moedas[:] = [
+                posicao for posicao in self.posicoes_moedas if posicao not in descartadas
+            ]
+        self.posicoes_moedas.extend(adicionadas)
+        
+        for indice in sujos:
+            if self.chunks[indice] is None:
+                continue
+            self.chunks_editados.discard(indice)
+            if indice in self.chunks_visiveis:
+                self.chunks[indice] = self._renderizar_chunk(indice)
+            else:
+                self.chunks[indice] = None
+        if regiao is not None:
+            self._notificar_alteracao(*regiao)
+        
+        self.tiles_originais = b''.join(self.tiles)
+        self.editado = False
+        if (adicionadas or removidas) and self.navegacao is not None:
+            self.navegacao.ao_alterar_moedas(adicionadas, removidas)
+        return alterados, adicionadas, removidas
+    
+    def ao_pousar_meteoros(self, eventos):
+        """Abre uma cratera no tile onde cada meteoro pousou"""
+        for evento in eventos:
+            col = int(evento.x // TILE_SIZE)
+            row = int(evento.y // TILE_SIZE)
+            if 0 <= row < self.linhas and 0 <= col < self.colunas and self.tiles[row][col]:
+                self.set_tile(col, row, TILE_VAZIO)
+    
+    def desenhar(self, superficie, camera_x, camera_y):
+        """Desenha os chunks visíveis (no máximo três com a viewport padrão)"""
+        # Chunks alterados voltam a usar RLE (uma recodificação por chunk)
+        for indice in self.chunks_editados:
+            self.chunks[indice].set_colorkey(COR_CHAVE_MAPA, pygame.RLEACCEL)
+        self.chunks_editados.clear()
+        
+        largura_chunk = MAPA_CHUNK_TILES * TILE_SIZE
+        primeiro = max(0, camera_x // largura_chunk)
+        ultimo = min(len(self.chunks) - 1, (camera_x + superficie.get_width()) // largura_chunk)
+        self.chunks_visiveis = range(primeiro, ultimo + 1)
+        for indice in self.chunks_visiveis:
+            chunk = self.chunks[indice]
+            if chunk is None:
+                chunk = self.chunks[indice] = self._renderizar_chunk(indice)
+            superficie.blit(chunk, (indice * largura_chunk - camera_x, -camera_y))
     
     def get_retangulos_colisao(self, rect):
         """Retorna lista de retângulos de colisão próximos ao rect dado"""
@@ -100,22 +441,21 @@ class Mapa:
         
         # Calcular apenas os tiles próximos (otimização)
         start_col = max(0, int(rect.left // TILE_SIZE))
-        end_col = min(len(self.dados[0]), int(rect.right // TILE_SIZE) + 1)
+        end_col = min(self.colunas, int(rect.right // TILE_SIZE) + 1)
         start_row = max(0, int(rect.top // TILE_SIZE))
-        end_row = min(len(self.dados), int(rect.bottom // TILE_SIZE) + 1)
+        end_row = min(self.linhas, int(rect.bottom // TILE_SIZE) + 1)
         
         for row in range(start_row, end_row):
+            tiles = self.tiles[row]
             for col in range(start_col, end_col):
-                if row < len(self.dados) and col < len(self.dados[row]):
-                    tile = self.dados[row][col]
-                    # Tiles sólidos
-                    if tile in ['G', 'T', 'E', 'D', 'L', 'R', '<', '>']:
-                        tile_rect = pygame.Rect(
-                            col * TILE_SIZE,
-                            row * TILE_SIZE,
-                            TILE_SIZE,
-                            TILE_SIZE
-                        )
-                        retangulos.append(tile_rect)
+                # Tiles sólidos
+                if tiles[col]:
+                    tile_rect = pygame.Rect(
+                        col * TILE_SIZE,
+                        row * TILE_SIZE,
+                        TILE_SIZE,
+                        TILE_SIZE
+                    )
+                    retangulos.append(tile_rect)
         
         return retangulos
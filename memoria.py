@@ -0,0 +1,128 @@
+"""
+Contabilidade de memória das superfícies (Surfaces) criadas pelo jogo
+"""
+import weakref
+import pygame
+
+
+class RegistroSuperficie:
+    """Informações de uma superfície registrada"""
+
+    __slots__ = ('dono', 'tamanho', 'formato', 'bytes', 'liberar')
+
+    def __init__(self, superficie, dono, liberar):
+        self.dono = dono
+        self.tamanho = superficie.get_size()
+        self.formato = self._descrever_formato(superficie)
+        # Subsuperfícies compartilham os pixels da superfície mãe
+        if superficie.get_parent() is None:
+            self.bytes = superficie.get_pitch() * superficie.get_height()
+        else:
+            self.bytes = 0
+        self.liberar = liberar
+
+    def _descrever_formato(self, superficie):
+        """Resume o formato de pixel (bits e tipo de transparência)"""
+        formato = f"{superficie.get_bitsize()}bpp"
+        if superficie.get_flags() & pygame.SRCALPHA:
+            formato += " alpha"
+        elif superficie.get_colorkey() is not None:
+            formato += " colorkey"
+        if superficie.get_parent() is not None:
+            formato += " sub"
+        return formato
+
+
+class ContabilidadeMemoria:
+    """Rastreia as superfícies do jogo por subsistema e aplica um orçamento"""
+
+    def __init__(self, orcamento_bytes=None):
+        self.orcamento_bytes = orcamento_bytes
+        self.registros = {}
+        self.total_bytes = 0
+        self.liberacoes = 0
+        self._proximo_id = 0
+        # Registros que ainda podem ser liberados (mais antigos primeiro) e seus bytes
+        self._liberaveis = {}
+        self.bytes_liberaveis = 0
+
+    def registrar(self, superficie, dono, liberar=None):
+        """Registra uma superfície e devolve a própria superfície.
+
+        `liberar` é chamado para descartar superfícies de cache quando o
+        orçamento é excedido; superfícies sem ele nunca são liberadas.
+        """
+        chave = self._proximo_id
+        self._proximo_id += 1
+
+        registro = RegistroSuperficie(superficie, dono, liberar)
+        self.registros[chave] = registro
+        self.total_bytes += registro.bytes
+        if liberar is not None:
+            self._liberaveis[chave] = registro
+            self.bytes_liberaveis += registro.bytes
+
+        # Remove o registro quando a superfície for coletada
+        weakref.finalize(superficie, self._remover, chave)
+
+        # Só superfícies de cache entram no orçamento; as demais nunca disparam varreduras
+        if (liberar is not None and self.orcamento_bytes is not None
+                and self.total_bytes > self.orcamento_bytes):
+            self.aplicar_orcamento()
+
+        return superficie
+
+    def _remover(self, chave):
+        registro = self.registros.pop(chave, None)
+        if registro is not None:
+            self.total_bytes -= registro.bytes
+        if self._liberaveis.pop(chave, None) is not None:
+            self.bytes_liberaveis -= registro.bytes
+
+    def aplicar_orcamento(self):
+        """Libera superfícies de cache (mais antigas primeiro) até caber no orçamento.
+
+        Só conta o que o cache realmente libera: uma superfície ainda usada
+        em outro lugar (um meteoro vivo segurando a rotação) sai do cache,
+        mas continua no total até ser coletada. Cada registro é visitado uma
+        vez, e nada é liberado se nem o cache inteiro faria caber (o excesso
+        é de superfícies que nunca são liberadas, como os chunks do mapa).
+        """
+        if self.orcamento_bytes is None:
+            return
+        excesso = self.total_bytes - self.orcamento_bytes
+        if excesso <= 0 or excesso > self.bytes_liberaveis:
+            return
+        liberados = 0
+        while liberados < excesso and self._liberaveis:
+            chave = next(iter(self._liberaveis))
+            registro = self._liberaveis.pop(chave)
+            self.bytes_liberaveis -= registro.bytes
+            antes = self.total_bytes
+            liberar = registro.liberar
+            registro.liberar = None
+            liberar()
+            self.liberacoes += 1
+            # Superfícies sem outras referências são coletadas na hora
+            liberados += antes - self.total_bytes
+
+    def totais_por_dono(self):
+        """Retorna {dono: (quantidade, bytes)}"""
+        totais = {}
+        for registro in self.registros.values():
+            quantidade, total = totais.get(registro.dono, (0, 0))
+            totais[registro.dono] = (quantidade + 1, total + registro.bytes)
+        return totais
+
+    def relatorio(self):
+        """Retorna linhas de texto com o uso de memória por subsistema"""
+        linhas = []
+        totais = self.totais_por_dono()
+        for dono in sorted(totais, key=lambda d: -totais[d][1]):
+            quantidade, total = totais[dono]
+            linhas.append(f"{dono}: {total // 1024} KB ({quantidade})")
+        linha_total = f"Total: {self.total_bytes // 1024} KB"
+        if self.orcamento_bytes is not None:
+            linha_total += f" / {self.orcamento_bytes // 1024} KB"
+        linhas.append(linha_total)
+        return linhas
@@ -4,20 +4,31 @@ Sistema de meteoros que caem do céu (Com rotação correta)
 import pygame
 import random
 import math  # --- NOVO: Necessário para calcular o ângulo ---
-from config import LARGURA_VIRTUAL
+from collections import deque
+from config import (
+    LARGURA_VIRTUAL, ALTURA_VIRTUAL, TILE_SIZE, METEORO_MAX_SIMULTANEOS, METEORO_HORIZONTE_AGENDA,
+    METEORO_INTERVALO_INICIAL, METEORO_INTERVALO_FINAL, METEORO_FRAMES_DIFICULDADE
+)
+from eventos import MeteoroAtingiu, MeteoroPousou
 
 class Meteoro:
     """Classe que representa um meteoro individual"""
     
-    def __init__(self, x, y, sprites):
+    def __init__(self, x, y, vel_x, vel_y, assets):
         self.x = x
         self.y = y
         
         # Velocidades
-        self.vel_y = random.uniform(1.5, 3.5)
-        self.vel_x = random.uniform(-1.5, 1.5)
+        self.vel_y = vel_y
+        self.vel_x = vel_x
         
         self.ativo = True
+        self.pousou = False
+        
+        # Trajetória pré-calculada: o meteoro só conta os frames até o fim
+        self.frames_ate_pouso = 0
+        self.vai_pousar = False  # False = sai pelo fundo do mapa
+        self.alvo = None  # Ponto do chão onde vai cair (para o aviso)
         
         # Animação
         self.frame_atual = 0
@@ -30,20 +41,38 @@ class Meteoro:
         
         # Calculamos o ângulo baseado na velocidade horizontal e vertical
         # Math.atan2 retorna o ângulo em radianos, convertemos para graus.
+        # Como nossa imagem aponta para baixo, o ângulo calculado já funciona bem
         angulo = math.degrees(math.atan2(self.vel_x, self.vel_y))
         
-        self.sprites_rotacionados = []
-        for sprite in sprites:
-            # pygame.transform.rotate gira no sentido anti-horário
-            # Como nossa imagem aponta para baixo, o ângulo calculado já funciona bem
-            sprite_rot = pygame.transform.rotate(sprite, angulo)
-            self.sprites_rotacionados.append(sprite_rot)
-            
+        # Sprites girados vêm do cache compartilhado dos assets
+        self.sprites_rotacionados = assets.meteoro_rotacionado(angulo)
+        self.mascaras = assets.mascaras_meteoro(angulo)
+    
     def get_hitbox(self):
         """Retorna o retângulo de colisão (lógica)"""
         return pygame.Rect(self.x, self.y, self.largura, self.altura)
     
-    def atualizar(self, mapa):
+    def atinge(self, jogador_rect, mascara_jogador=None):
+        """Indica se o meteoro atinge o jogador.
+        
+        Sem máscara, compara só as hitboxes. Com `mascara_jogador`
+        ((máscara, (x, y)) de Jogador.get_mascara), o retângulo do sprite
+        girado filtra os candidatos e só eles comparam os pixels.
+        """
+        if mascara_jogador is None:
+            return self.get_hitbox().colliderect(jogador_rect)
+        
+        # Mesmo posicionamento do desenho: sprite centrado na hitbox
+        mascara = self.mascaras[self.frame_atual]
+        largura, altura = mascara.get_size()
+        x = int(self.x) + self.largura // 2 - largura // 2
+        y = int(self.y) + self.altura // 2 - altura // 2
+        if not jogador_rect.colliderect((x, y, largura, altura)):
+            return False
+        mascara_dino, (jogador_x, jogador_y) = mascara_jogador
+        return mascara_dino.overlap(mascara, (x - jogador_x, y - jogador_y)) is not None
+    
+    def atualizar(self):
         if not self.ativo:
             return
         
@@ -51,17 +80,11 @@ class Meteoro:
         self.x += self.vel_x
         self.y += self.vel_y
         
-        # Verificar colisão com o chão
-        hitbox = self.get_hitbox()
-        colisoes = mapa.get_retangulos_colisao(hitbox)
-        
-        if colisoes:
-            self.ativo = False
-            return
-            
-        # Limites do mapa
-        if self.y > mapa.altura_px:
+        # Fim da trajetória (chão ou fundo do mapa), calculado no spawn
+        self.frames_ate_pouso -= 1
+        if self.frames_ate_pouso <= 0:
             self.ativo = False
+            self.pousou = self.vai_pousar
             return
         
         # Atualizar animação
@@ -90,20 +113,71 @@ class Meteoro:
             superficie.blit(imagem, rect_imagem)
 
 
+class AgendaMeteoros:
+    """Linha do tempo de spawns calculada alguns segundos à frente.
+    
+    Cada entrada é (tick, fração horizontal da área de spawn, vel_x, vel_y).
+    O intervalo entre spawns segue a curva de dificuldade.
+    """
+    
+    def __init__(self, rng, intervalo_inicial=METEORO_INTERVALO_INICIAL,
+                 intervalo_final=METEORO_INTERVALO_FINAL,
+                 frames_dificuldade=METEORO_FRAMES_DIFICULDADE):
+        self.rng = rng
+        self.intervalo_inicial = intervalo_inicial
+        self.intervalo_final = intervalo_final
+        self.frames_dificuldade = frames_dificuldade
+        self.spawns = deque()
+        self.ultimo_tick = 0
+    
+    def intervalo(self, tick):
+        """Intervalo (mínimo, máximo) entre spawns no tick dado"""
+        t = min(1.0, tick / self.frames_dificuldade)
+        minimo = self.intervalo_inicial[0] + (self.intervalo_final[0] - self.intervalo_inicial[0]) * t
+        maximo = self.intervalo_inicial[1] + (self.intervalo_final[1] - self.intervalo_inicial[1]) * t
+        return max(1, round(minimo)), max(1, round(maximo))
+    
+    def preencher(self, tick):
+        """Gera spawns até METEORO_HORIZONTE_AGENDA frames depois do tick"""
+        while self.ultimo_tick <= tick + METEORO_HORIZONTE_AGENDA:
+            self.ultimo_tick += self.rng.randint(*self.intervalo(self.ultimo_tick))
+            self.spawns.append((
+                self.ultimo_tick,
+                self.rng.random(),
+                self.rng.uniform(-1.5, 1.5),
+                self.rng.uniform(1.5, 3.5)
+            ))
+    
+    def vencidos(self, tick):
+        """Remove e retorna os spawns marcados até o tick"""
+        while self.spawns and self.spawns[0][0] <= tick:
+            yield self.spawns.popleft()
+
+
 class GerenciadorMeteoros:
     """Classe que gerencia todos os meteoros do jogo"""
     
-    def __init__(self, assets, largura_mapa):
+    def __init__(self, assets, largura_mapa, eventos, semente=None):
         self.assets = assets
         self.largura_mapa = largura_mapa
+        self.eventos = eventos
         self.meteoros = []
+        self.max_simultaneos = METEORO_MAX_SIMULTANEOS
         
-        self.contador_spawn = 0
-        self.spawn_aleatorio_min = 15 
-        self.spawn_aleatorio_max = 50
-        self.proximo_spawn = random.randint(self.spawn_aleatorio_min, self.spawn_aleatorio_max)
+        # Gerador próprio, para que o estado possa ser salvo e reproduzido
+        self.rng = random.Random(semente)
+        self.agenda = AgendaMeteoros(self.rng)
+        self.tick = 0
+        # Desligado quando os spawns vêm de fora (cliente de uma corrida em rede)
+        self.spawn_local = True
+        
+        # Estatísticas de spawn
+        self.gerados = 0
+        self.descartados = 0
+        self.pousados = 0
+        self.pico_simultaneos = 0
     
-    def spawn_meteoro(self, camera_x):
+    def spawn_meteoro(self, camera_x, mapa, fracao_x, vel_x, vel_y):
         # Área de spawn estendida para permitir diagonais
         min_x = int(camera_x - 100)
         max_x = int(camera_x + LARGURA_VIRTUAL + 100)
@@ -112,29 +186,156 @@ class GerenciadorMeteoros:
         max_x = min(self.largura_mapa - 10, max_x)
         
         if max_x > min_x:
-            x = random.randint(min_x, max_x)
-            y = -40
-            meteoro = Meteoro(x, y, self.assets.meteoro_sprites)
-            self.meteoros.append(meteoro)
+            x = min_x + int(fracao_x * (max_x - min_x + 1))
+            return self.adicionar_meteoro(x, -40, vel_x, vel_y, mapa)
+        return None
+    
+    def adicionar_meteoro(self, x, y, vel_x, vel_y, mapa):
+        """Cria um meteoro na posição dada, já com a trajetória calculada"""
+        meteoro = Meteoro(x, y, vel_x, vel_y, self.assets)
+        self._calcular_trajetoria(meteoro, mapa)
+        self.meteoros.append(meteoro)
+        self.gerados += 1
+        return meteoro
+    
+    def _calcular_trajetoria(self, meteoro, mapa):
+        """Percorre a trajetória reta do meteoro até o fim.
+        
+        Encontra o primeiro frame em que a hitbox toca um tile sólido (os
+        mesmos tiles que get_retangulos_colisao retornaria) ou passa do fundo
+        do mapa. A grade só é consultada quando a hitbox muda de tiles.
+        """
+        tiles = mapa.tiles
+        x = meteoro.x
+        y = meteoro.y
+        frames = 0
+        regiao_anterior = None
+        # Acima da primeira linha com tiles sólidos não há o que testar
+        linha_minima = next((row for row, linha in enumerate(tiles) if any(linha)), mapa.linhas)
+        topo_livre = linha_minima * TILE_SIZE - meteoro.altura
+        while True:
+            frames += 1
+            x += meteoro.vel_x
+            y += meteoro.vel_y
+            if int(y) < topo_livre:
+                continue
+            
+            # Região de tiles de get_retangulos_colisao(get_hitbox()); o fim
+            # nunca é negativo, para não virar índice a partir do fim na fatia
+            esquerda = int(x)
+            topo = int(y)
+            regiao = (
+                max(0, topo // TILE_SIZE),
+                min(mapa.linhas, (topo + meteoro.altura) // TILE_SIZE + 1),
+                max(0, esquerda // TILE_SIZE),
+                max(0, min(mapa.colunas, (esquerda + meteoro.largura) // TILE_SIZE + 1))
+            )
+            if regiao != regiao_anterior:
+                regiao_anterior = regiao
+                row_inicio, row_fim, col_inicio, col_fim = regiao
+                for row in range(row_inicio, row_fim):
+                    if any(tiles[row][col_inicio:col_fim]):
+                        meteoro.frames_ate_pouso = frames
+                        meteoro.vai_pousar = True
+                        meteoro.alvo = (x + meteoro.largura // 2, row * TILE_SIZE)
+                        return
+            
+            if y > mapa.altura_px:
+                # Cai para fora do mapa sem tocar em nada
+                meteoro.frames_ate_pouso = frames
+                meteoro.vai_pousar = False
+                meteoro.alvo = None
+                return
+    
+    def ao_alterar_regiao(self, col_inicio, row_inicio, col_fim, row_fim, mapa):
+        """Recalcula as trajetórias que passam pela região alterada (tiles inclusivos)"""
+        esquerda = col_inicio * TILE_SIZE
+        direita = col_fim * TILE_SIZE
+        topo = row_inicio * TILE_SIZE
+        base = row_fim * TILE_SIZE
+        for meteoro in self.meteoros:
+            # Retângulo varrido pela hitbox até o fim previsto (com folga)
+            x_fim = meteoro.x + meteoro.vel_x * meteoro.frames_ate_pouso
+            y_fim = meteoro.y + meteoro.vel_y * meteoro.frames_ate_pouso
+            if (min(meteoro.x, x_fim) - TILE_SIZE - 1 <= direita
+                    and esquerda <= max(meteoro.x, x_fim) + meteoro.largura
+                    and meteoro.y - TILE_SIZE - 1 <= base and topo <= y_fim + meteoro.altura):
+                self._calcular_trajetoria(meteoro, mapa)
     
     def atualizar(self, mapa, camera_x):
         for meteoro in self.meteoros:
-            meteoro.atualizar(mapa)
+            meteoro.atualizar()
+            if meteoro.pousou:
+                self.pousados += 1
+                self.eventos.emitir(MeteoroPousou(
+                    meteoro.x + meteoro.largura / 2, meteoro.y + meteoro.altura
+                ))
         
         self.meteoros = [m for m in self.meteoros if m.ativo]
         
-        self.contador_spawn += 1
-        if self.contador_spawn >= self.proximo_spawn:
-            self.spawn_meteoro(camera_x)
-            self.contador_spawn = 0
-            self.proximo_spawn = random.randint(self.spawn_aleatorio_min, self.spawn_aleatorio_max)
+        self.tick += 1
+        if self.spawn_local:
+            self.agenda.preencher(self.tick)
+            for _, fracao_x, vel_x, vel_y in self.agenda.vencidos(self.tick):
+                if len(self.meteoros) >= self.max_simultaneos:
+                    self.descartados += 1
+                    continue
+                self.spawn_meteoro(camera_x, mapa, fracao_x, vel_x, vel_y)
+        self.pico_simultaneos = max(self.pico_simultaneos, len(self.meteoros))
     
     def desenhar(self, superficie, camera_x, camera_y):
         for meteoro in self.meteoros:
             meteoro.desenhar(superficie, camera_x, camera_y)
+            
+            # Aviso piscando no ponto do chão onde o meteoro vai cair
+            if meteoro.alvo is not None and (meteoro.frames_ate_pouso // 6) % 2 == 0:
+                alvo_x = int(meteoro.alvo[0] - camera_x)
+                alvo_y = int(meteoro.alvo[1] - camera_y) - 1
+                pygame.draw.line(superficie, (255, 60, 30), (alvo_x - 3, alvo_y), (alvo_x + 3, alvo_y))
+    
+    def quantidade_visivel(self, camera_x, camera_y):
+        """Meteoros cuja hitbox cruza a área da câmera"""
+        direita = camera_x + LARGURA_VIRTUAL
+        baixo = camera_y + ALTURA_VIRTUAL
+        quantidade = 0
+        for meteoro in self.meteoros:
+            if (camera_x - meteoro.largura < meteoro.x < direita
+                    and camera_y - meteoro.altura < meteoro.y < baixo):
+                quantidade += 1
+        return quantidade
+    
+    def linhas_estatisticas(self):
+        """Linhas de texto com as estatísticas de spawn (overlay F3)"""
+        return [
+            f"Meteoros: {len(self.meteoros)}/{self.max_simultaneos} (pico {self.pico_simultaneos})",
+            f"Gerados {self.gerados} descartados {self.descartados} pousados {self.pousados}",
+        ]
+    
+    def capturar_estado(self):
+        """Retorna o estado dos meteoros, da agenda e do gerador aleatório"""
+        meteoros = tuple(
+            (m.x, m.y, m.vel_x, m.vel_y, m.frame_atual, m.contador_animacao)
+            for m in self.meteoros
+        )
+        agenda = (tuple(self.agenda.spawns), self.agenda.ultimo_tick)
+        return (meteoros, self.tick, agenda, self.rng.getstate())
+    
+    def restaurar_estado(self, estado, mapa):
+        """Restaura um estado capturado por capturar_estado"""
+        meteoros, self.tick, (spawns, ultimo_tick), rng = estado
+        self.rng.setstate(rng)
+        self.agenda.spawns = deque(spawns)
+        self.agenda.ultimo_tick = ultimo_tick
+        self.meteoros = []
+        for x, y, vel_x, vel_y, frame_atual, contador_animacao in meteoros:
+            meteoro = Meteoro(x, y, vel_x, vel_y, self.assets)
+            meteoro.frame_atual = frame_atual
+            meteoro.contador_animacao = contador_animacao
+            self._calcular_trajetoria(meteoro, mapa)
+            self.meteoros.append(meteoro)
     
-    def verificar_colisao_jogador(self, jogador_rect):
+    def verificar_colisao_jogador(self, jogador_rect, mascara_jogador=None):
+        """Emite um evento para cada meteoro que atinge o jogador"""
         for meteoro in self.meteoros:
-            if meteoro.ativo and meteoro.get_hitbox().colliderect(jogador_rect):
-                return True
-        return False
\ No newline at end of file
+            if meteoro.ativo and meteoro.atinge(jogador_rect, mascara_jogador):
+                self.eventos.emitir(MeteoroAtingiu(meteoro.x, meteoro.y))
\ No newline at end of file
@@ -1,120 +1,136 @@
 """
 Sistema de moedas coletáveis
 """
-import pygame
 import math
+from array import array
+from bisect import bisect_left, bisect_right
 from config import (
-    VELOCIDADE_ANIMACAO_MOEDA, FRAMES_MOEDA,
+    VELOCIDADE_ANIMACAO_MOEDA, LARGURA_VIRTUAL,
     MOEDA_LARGURA, MOEDA_ALTURA, MOEDA_VELOCIDADE_FLUTUACAO,
-    MOEDA_AMPLITUDE_FLUTUACAO
+    MOEDA_AMPLITUDE_FLUTUACAO, PONTOS_POR_MOEDA
 )
-
-
-class Moeda:
-    """Classe que representa uma moeda coletável"""
-    
-    def __init__(self, x, y, sprites_moeda):
-        self.x = x
-        self.y = y
-        self.y_original = y  # Usado para animação de flutuação
-        self.sprites = sprites_moeda
-        
-        # Animação
-        self.frame_atual = 0
-        self.contador_animacao = 0
-        self.velocidade_animacao = VELOCIDADE_ANIMACAO_MOEDA
-        
-        # Flutuação vertical (efeito bobbing)
-        self.tempo_flutuacao = 0
-        
-        # Estado
-        self.ativo = True
-        self.coletado = False
-    
-    def get_hitbox(self):
-        """Retorna o retângulo de colisão da moeda"""
-        return pygame.Rect(
-            self.x - MOEDA_LARGURA // 2,
-            self.y - MOEDA_ALTURA // 2,
-            MOEDA_LARGURA,
-            MOEDA_ALTURA
-        )
-    
-    def atualizar(self):
-        """Atualiza a animação e flutuação da moeda"""
-        if not self.ativo:
-            return
-        
-        # Animação de frame
-        self.contador_animacao += 1
-        if self.contador_animacao >= self.velocidade_animacao:
-            self.contador_animacao = 0
-            self.frame_atual = (self.frame_atual + 1) % len(self.sprites)
-        
-        # Efeito de flutuação vertical (sine wave)
-        self.tempo_flutuacao += MOEDA_VELOCIDADE_FLUTUACAO
-        self.y = self.y_original + math.sin(self.tempo_flutuacao) * MOEDA_AMPLITUDE_FLUTUACAO
-    
-    def desenhar(self, superficie, camera_x=0, camera_y=0):
-        """Desenha a moeda na tela"""
-        if not self.ativo:
-            return
-        
-        sprite = self.sprites[self.frame_atual]
-        
-        # Calcular posição na tela (subtraindo offset da câmera)
-        tela_x = int(self.x - MOEDA_LARGURA // 2 - camera_x)
-        tela_y = int(self.y - MOEDA_ALTURA // 2 - camera_y)
-        
-        # Desenhar sprite
-        superficie.blit(sprite, (tela_x, tela_y))
-    
-    def coletar(self):
-        """Marca a moeda como coletada"""
-        self.coletado = True
-        self.ativo = False
+from eventos import MoedaColetada
 
 
 class GerenciadorMoedas:
-    """Gerenciador de moedas no mapa"""
+    """Gerenciador de moedas no mapa.
     
-    def __init__(self, assets, largura_mapa_px):
+    As moedas não são objetos: as posições ficam em arrays compactos
+    ordenados por x, o estado em um byte por moeda e a animação é a mesma
+    para todas, calculada uma vez por tick a partir de um relógio global.
+    """
+    
+    def __init__(self, assets, largura_mapa_px, eventos):
         self.assets = assets
         self.largura_mapa_px = largura_mapa_px
-        self.moedas = []
-        self.pontos_totais = 0
+        self.eventos = eventos
+        self.sprites = assets.moeda_sprites
+        self.reiniciar()
     
     def adicionar_moeda(self, x, y):
         """Adiciona uma moeda ao mapa"""
-        moeda = Moeda(x, y, self.assets.moeda_sprites)
-        self.moedas.append(moeda)
+        self.xs.append(x)
+        self.ys.append(y)
+        self.ativas.append(1)
+        self._ordenado = False
+    
+    def remover_moeda(self, x, y):
+        """Remove a moeda em (x, y), coletada ou não (recarga do mapa)"""
+        for indice in self._indices_entre(x, x):
+            if self.xs[indice] == x and self.ys[indice] == y:
+                del self.xs[indice]
+                del self.ys[indice]
+                del self.ativas[indice]
+                return True
+        return False
+    
+    def _ordenar(self):
+        """Ordena as moedas por x (feito uma vez, antes da primeira consulta)"""
+        ordem = sorted(range(len(self.xs)), key=self.xs.__getitem__)
+        self.xs = array('f', (self.xs[i] for i in ordem))
+        self.ys = array('f', (self.ys[i] for i in ordem))
+        self.ativas = bytearray(self.ativas[i] for i in ordem)
+        self._ordenado = True
+    
+    def __len__(self):
+        return len(self.xs)
     
     def atualizar(self, camera_x):
-        """Atualiza todas as moedas"""
-        for moeda in self.moedas:
-            moeda.atualizar()
+        """Avança o relógio e calcula a animação compartilhada"""
+        self.tempo += 1
+        self._animar()
+    
+    def _animar(self):
+        """Frame e deslocamento de flutuação (sine wave) no tempo atual"""
+        self.frame_atual = (self.tempo // VELOCIDADE_ANIMACAO_MOEDA) % len(self.sprites)
+        self.deslocamento_y = math.sin(self.tempo * MOEDA_VELOCIDADE_FLUTUACAO) * MOEDA_AMPLITUDE_FLUTUACAO
+    
+    def _indices_entre(self, x_inicio, x_fim):
+        """Intervalo de índices das moedas que podem cruzar [x_inicio, x_fim]"""
+        if not self._ordenado:
+            self._ordenar()
+        # Uma moeda ocupa meia largura para cada lado do centro
+        inicio = bisect_left(self.xs, x_inicio - MOEDA_LARGURA)
+        fim = bisect_right(self.xs, x_fim + MOEDA_LARGURA)
+        return range(inicio, fim)
     
     def verificar_colisao_jogador(self, jogador_hitbox):
-        """Verifica colisão com o jogador e retorna pontos coletados"""
-        pontos = 0
-        for moeda in self.moedas:
-            if moeda.ativo and jogador_hitbox.colliderect(moeda.get_hitbox()):
-                moeda.coletar()
-                pontos += 10  # Valor padrão por moeda
-                self.pontos_totais += pontos
-        
-        return pontos
+        """Coleta as moedas tocadas pelo jogador, emitindo um evento por moeda"""
+        ativas = self.ativas
+        meia_largura = MOEDA_LARGURA // 2
+        meia_altura = MOEDA_ALTURA // 2
+        for indice in self._indices_entre(jogador_hitbox.left, jogador_hitbox.right):
+            if not ativas[indice]:
+                continue
+            x = self.xs[indice]
+            y = self.ys[indice]
+            # Mesmo teste de pygame.Rect.colliderect, sem criar o Rect
+            esquerda = int(x - meia_largura)
+            topo = int(y + self.deslocamento_y - meia_altura)
+            if (esquerda < jogador_hitbox.right and jogador_hitbox.left < esquerda + MOEDA_LARGURA
+                    and topo < jogador_hitbox.bottom and jogador_hitbox.top < topo + MOEDA_ALTURA):
+                ativas[indice] = 0
+                self.eventos.emitir(MoedaColetada(x, y, PONTOS_POR_MOEDA))
     
     def desenhar(self, superficie, camera_x, camera_y):
-        """Desenha todas as moedas ativas"""
-        for moeda in self.moedas:
-            if moeda.ativo:
-                moeda.desenhar(superficie, camera_x, camera_y)
+        """Desenha as moedas ativas visíveis com um único blits()"""
+        sprite = self.sprites[self.frame_atual]
+        ativas = self.ativas
+        xs = self.xs
+        ys = self.ys
+        deslocamento_x = MOEDA_LARGURA // 2 + camera_x
+        deslocamento_y = MOEDA_ALTURA // 2 + camera_y - self.deslocamento_y
+        
+        superficie.blits(
+            [
+                (sprite, (int(xs[i] - deslocamento_x), int(ys[i] - deslocamento_y)))
+                for i in self._indices_entre(camera_x, camera_x + LARGURA_VIRTUAL)
+                if ativas[i]
+            ],
+            doreturn=False
+        )
+    
+    def capturar_estado(self):
+        """Retorna o estado das moedas (bytes das ativas e relógio da animação)"""
+        if not self._ordenado:
+            self._ordenar()
+        return (bytes(self.ativas), self.tempo)
+    
+    def restaurar_estado(self, estado):
+        """Restaura um estado capturado por capturar_estado"""
+        ativas, self.tempo = estado
+        self.ativas[:] = ativas
+        self._animar()
     
     def reiniciar(self):
         """Reinicia o gerenciador de moedas"""
-        self.moedas = []
-        self.pontos_totais = 0
+        self.xs = array('f')
+        self.ys = array('f')
+        # Estado de cada moeda (1 = ativa, 0 = coletada)
+        self.ativas = bytearray()
+        self._ordenado = True
+        self.tempo = 0
+        self._animar()
     
     def debug_info(self):
         """Exibe informações de debug do gerenciador de moedas"""
@@ -0,0 +1,760 @@
+"""
+Grafo de navegação sobre a grade de tiles (plataformas, pulos e quedas)
+"""
+import bisect
+import heapq
+import math
+from collections import namedtuple
+from config import (
+    TILE_SIZE, DINO_VELOCIDADE, DINO_GRAVIDADE, DINO_FORCA_PULO,
+    HITBOX_OFFSET_X, HITBOX_OFFSET_Y, HITBOX_LARGURA, HITBOX_ALTURA,
+    MOEDA_LARGURA, MOEDA_ALTURA, MOEDA_AMPLITUDE_FLUTUACAO
+)
+
+# Saída do segmento por um pulo (com a direção segurada no ar) ou andando pela borda
+Aresta = namedtuple('Aresta', 'decolagem direcao pulo destino pouso frames')
+# Onde ficar (e se é preciso pular parado) para pegar uma moeda
+AlvoMoeda = namedtuple('AlvoMoeda', 'segmento coluna pulo')
+
+# Frames de voo simulados antes de desistir de uma trajetória
+LIMITE_FRAMES = 240
+# Nós expandidos por consulta; além disso o A* devolve o começo do caminho
+LIMITE_EXPANSOES = 32
+# Frames para andar um tile (custo de andar no A*)
+FRAMES_POR_TILE = TILE_SIZE / DINO_VELOCIDADE
+
+
+def _alcance_pulo():
+    """Colunas percorridas enquanto o pulo está acima do chão de partida"""
+    vel_y = DINO_FORCA_PULO
+    altura = 0
+    frames = 0
+    while True:
+        vel_y += DINO_GRAVIDADE
+        altura += vel_y
+        frames += 1
+        if altura >= 0:
+            break
+    # +1 pela largura da hitbox, que pode ocupar duas colunas
+    return -(-frames * DINO_VELOCIDADE // TILE_SIZE) + 1
+
+
+ALCANCE_PULO = _alcance_pulo()
+
+
+def _alcance_voo(altura_px):
+    """Colunas que qualquer pulo ou queda pode percorrer num mapa da altura dada.
+
+    O voo mais longo é um pulo da linha 0 que cai até o fundo do mapa.
+    """
+    vel_y = DINO_FORCA_PULO
+    y = 0
+    frames = 0
+    while y <= altura_px and frames < LIMITE_FRAMES:
+        vel_y += DINO_GRAVIDADE
+        y += vel_y
+        frames += 1
+    return max(-(-frames * DINO_VELOCIDADE // TILE_SIZE) + 1, ALCANCE_PULO + 1)
+
+
+def _celulas(x, y):
+    """Tiles (col, row) que a hitbox em (x, y) toca"""
+    esquerda = math.floor(x) + HITBOX_OFFSET_X
+    topo = math.floor(y) + HITBOX_OFFSET_Y
+    return {
+        (col, row)
+        for row in range(topo // TILE_SIZE, (topo + HITBOX_ALTURA - 1) // TILE_SIZE + 1)
+        for col in range(esquerda // TILE_SIZE, (esquerda + HITBOX_LARGURA - 1) // TILE_SIZE + 1)
+    }
+
+
+def _trajetoria_livre(direcao):
+    """Pulo sem obstáculos a partir da coluna 0 sobre a linha 0.
+
+    Cada frame guarda (x, y, vel_y, tiles tocados pela primeira vez). Como
+    x_em_pe e y_em_pe andam em múltiplos de TILE_SIZE, a mesma trajetória
+    vale para qualquer (coluna, linha) deslocando os tiles.
+    """
+    x = x_em_pe(0)
+    y = y_em_pe(0)
+    vel_y = DINO_FORCA_PULO
+    vistos = set()
+    frames = []
+    for _ in range(LIMITE_FRAMES):
+        x += direcao * DINO_VELOCIDADE
+        tocados = _celulas(x, y)
+        vel_y += DINO_GRAVIDADE
+        y += vel_y
+        tocados |= _celulas(x, y)
+        novos = tocados - vistos
+        vistos |= novos
+        frames.append((x, y, vel_y, tuple(sorted(novos))))
+    return frames
+
+
+class Segmento:
+    """Trecho contínuo de chão em que o dino cabe em pé (colunas inicio..fim)"""
+
+    __slots__ = ('indice', 'linha', 'inicio', 'fim', 'arestas')
+
+    def __init__(self, indice, linha, inicio, fim):
+        self.indice = indice
+        self.linha = linha  # Linha do tile de chão
+        self.inicio = inicio
+        self.fim = fim
+        self.arestas = []
+
+
+def x_em_pe(coluna):
+    """x do jogador com a hitbox centrada na coluna"""
+    return coluna * TILE_SIZE + (TILE_SIZE - HITBOX_LARGURA) // 2 - HITBOX_OFFSET_X
+
+
+def y_em_pe(linha):
+    """y do jogador em pé sobre um tile da linha dada"""
+    return linha * TILE_SIZE - HITBOX_OFFSET_Y - HITBOX_ALTURA
+
+
+def coluna_do_jogador(x):
+    """Coluna do centro da hitbox"""
+    return (int(x) + HITBOX_OFFSET_X + HITBOX_LARGURA // 2) // TILE_SIZE
+
+
+class GrafoNavegacao:
+    """Segmentos de chão ligados por pulos e quedas, com consultas A*.
+
+    As arestas saem de uma simulação da física do Jogador (mesmas
+    constantes, mesma resolução de colisões) a partir de colunas perto de
+    bordas de segmentos, então a construção é linear no tamanho do mapa.
+    Alterações de tiles ficam pendentes até a próxima consulta, que refaz
+    só os segmentos e as arestas ao alcance de um pulo delas (veja
+    _reconstruir_regiao) e a alcançabilidade.
+
+    As consultas têm custo limitado: a alcançabilidade entre segmentos é
+    pré-calculada (alvos inalcançáveis são descartados sem busca e o A* não
+    entra em becos sem saída), e cada busca expande no máximo
+    LIMITE_EXPANSOES nós. Um alvo mais longe que isso recebe o começo do
+    caminho, que termina fora do segmento alvo; quem o segue planeja de
+    novo ao chegar ao fim dele.
+    """
+
+    def __init__(self, mapa):
+        self.mapa = mapa
+        self.invalido = True
+        self.construcoes = 0
+        self.reconstrucoes_locais = 0
+        self.regioes_pendentes = []  # (col_inicio, row_inicio, col_fim, row_fim) ainda não aplicadas
+        self.moedas_pendentes = []  # (adicionadas, removidas) ainda não aplicadas
+        self.caminhos = {}  # (segmento, coluna, segmento alvo, coluna alvo) -> (arestas, custo)
+        self.proximas = {}  # (segmento, coluna, moedas) -> resultado de caminho_proxima_moeda
+        self.construir()
+
+    def ao_alterar_regiao(self, col_inicio, row_inicio, col_fim, row_fim):
+        """Ouvinte de Mapa.ouvintes_alteracao (aplicado na próxima consulta)"""
+        self.regioes_pendentes.append((col_inicio, row_inicio, col_fim, row_fim))
+
+    def ao_alterar_moedas(self, adicionadas, removidas):
+        """Moedas adicionadas e removidas do mapa (aplicadas na próxima consulta)"""
+        self.moedas_pendentes.append((adicionadas, removidas))
+
+    def _atualizar(self):
+        if self.invalido:
+            self.construir()
+            return
+        if not (self.regioes_pendentes or self.moedas_pendentes):
+            return
+        for regiao in self.regioes_pendentes:
+            if regiao[2] - regiao[0] > self.mapa.colunas // 4:
+                # Região grande (recarga do arquivo): mais barato refazer tudo
+                self.construir()
+                return
+        for regiao in self.regioes_pendentes:
+            self._reconstruir_regiao(*regiao)
+        for adicionadas, removidas in self.moedas_pendentes:
+            for posicao in removidas:
+                self.alvos_moedas.pop(posicao, None)
+            self._calcular_alvos_moedas(adicionadas)
+        self.regioes_pendentes.clear()
+        self.moedas_pendentes.clear()
+        self._ordenar_moedas()
+        self._calcular_alcance()
+        self.caminhos.clear()
+        self.proximas.clear()
+
+    # Construção
+    def construir(self):
+        """Encontra os segmentos, simula as saídas de cada um e os alvos das moedas"""
+        colunas = self.mapa.colunas
+        self.segmentos = []
+        self.livres = []  # Índices de segmentos removidos, reaproveitados pelos novos
+        self.por_coluna = [[] for _ in range(colunas)]
+        self.bordas = [0] * colunas  # Início ou fim de quantos segmentos em cada coluna
+        self.alcance_voo = _alcance_voo(self.mapa.altura_px)
+
+        for row in range(self.mapa.linhas):
+            for inicio, fim in self._trechos(row, 0, colunas - 1):
+                self._novo_segmento(row, inicio, fim)
+        for segmento in self.segmentos:
+            self._gerar_arestas(segmento, segmento.inicio, segmento.fim)
+
+        self._calcular_alcance()
+
+        self.alvos_moedas = {}
+        self._calcular_alvos_moedas(self.mapa.posicoes_moedas)
+        self._ordenar_moedas()
+
+        self.caminhos.clear()
+        self.proximas.clear()
+        self.regioes_pendentes.clear()
+        self.moedas_pendentes.clear()
+        self.invalido = False
+        self.construcoes += 1
+
+    def _trechos(self, row, col_inicio, col_fim):
+        """(início, fim) de cada trecho da linha, entre as colunas dadas, em que o dino fica em pé"""
+        tiles = self.mapa.tiles
+        chao = tiles[row]
+        acima = tiles[row - 1] if row >= 1 else None
+        acima2 = tiles[row - 2] if row >= 2 else None
+        trechos = []
+        inicio = None
+        for col in range(col_inicio, col_fim + 2):
+            em_pe = (
+                col <= col_fim and chao[col]
+                and not (acima is not None and acima[col])
+                and not (acima2 is not None and acima2[col])
+            )
+            if em_pe and inicio is None:
+                inicio = col
+            elif not em_pe and inicio is not None:
+                trechos.append((inicio, col - 1))
+                inicio = None
+        return trechos
+
+    def _novo_segmento(self, linha, inicio, fim):
+        indice = self.livres.pop() if self.livres else len(self.segmentos)
+        segmento = Segmento(indice, linha, inicio, fim)
+        if indice == len(self.segmentos):
+            self.segmentos.append(segmento)
+        else:
+            self.segmentos[indice] = segmento
+        for col in range(inicio, fim + 1):
+            self.por_coluna[col].append(segmento)
+        self.bordas[inicio] += 1
+        self.bordas[fim] += 1
+        return segmento
+
+    def _remover_segmento(self, segmento):
+        """Libera o índice do segmento (o lugar fica com um segmento vazio, sem colunas)"""
+        for col in range(segmento.inicio, segmento.fim + 1):
+            self.por_coluna[col].remove(segmento)
+        self.bordas[segmento.inicio] -= 1
+        self.bordas[segmento.fim] -= 1
+        self.segmentos[segmento.indice] = Segmento(segmento.indice, -1, 0, -1)
+        self.livres.append(segmento.indice)
+
+    def _borda_a_frente(self, col, direcao):
+        """Indica se há borda de segmento a até ALCANCE_PULO colunas na direção"""
+        if direcao > 0:
+            return any(self.bordas[col:col + ALCANCE_PULO + 1])
+        return any(self.bordas[max(0, col - ALCANCE_PULO):col + 1])
+
+    def _gerar_arestas(self, segmento, col_inicio, col_fim):
+        """Simula as saídas do segmento que decolam entre as colunas dadas"""
+        col_inicio = max(col_inicio, segmento.inicio)
+        col_fim = min(col_fim, segmento.fim)
+        if col_inicio > col_fim:
+            return
+        for col in range(col_inicio, col_fim + 1):
+            for direcao in (-1, 1):
+                if self._borda_a_frente(col, direcao):
+                    self._adicionar_aresta(segmento, col, direcao, True)
+        if col_inicio == segmento.inicio:
+            self._adicionar_aresta(segmento, segmento.inicio, -1, False)
+        if col_fim == segmento.fim:
+            self._adicionar_aresta(segmento, segmento.fim, 1, False)
+
+    def _reconstruir_regiao(self, col_inicio, row_inicio, col_fim, row_fim):
+        """Refaz só o que os tiles da região (inclusiva) podem ter mudado.
+
+        Um tile decide o chão da sua linha e das duas de baixo, então os
+        segmentos dessas linhas que tocam a região (ou encostam nela) são
+        trocados pelos trechos encontrados de novo. Arestas que decolam a
+        até alcance_voo colunas da região são simuladas de novo; as mais
+        distantes ficam, e as que pousavam num segmento trocado passam para
+        o segmento novo sob o mesmo ponto de pouso.
+        """
+        colunas = self.mapa.colunas
+        por_coluna = self.por_coluna
+        removidos = {}  # índice -> segmento removido
+        novos = []
+        col_min, col_max = col_inicio, col_fim
+        for row in range(max(0, row_inicio), min(self.mapa.linhas - 1, row_fim + 2) + 1):
+            antigos = {
+                segmento
+                for col in range(max(0, col_inicio - 1), min(colunas - 1, col_fim + 1) + 1)
+                for segmento in por_coluna[col] if segmento.linha == row
+            }
+            inicio = min([col_inicio] + [segmento.inicio for segmento in antigos])
+            fim = max([col_fim] + [segmento.fim for segmento in antigos])
+            for segmento in antigos:
+                self._remover_segmento(segmento)
+                removidos[segmento.indice] = segmento
+            for trecho in self._trechos(row, inicio, fim):
+                novos.append(self._novo_segmento(row, *trecho))
+            col_min = min(col_min, inicio)
+            col_max = max(col_max, fim)
+
+        # Decolagens cuja trajetória pode passar pela região
+        janela_inicio = max(0, col_inicio - self.alcance_voo)
+        janela_fim = min(colunas - 1, col_fim + self.alcance_voo)
+        # Decolagens que podem pousar num segmento trocado
+        vizinhos = {
+            segmento
+            for col in range(max(0, col_min - self.alcance_voo), min(colunas - 1, col_max + self.alcance_voo) + 1)
+            for segmento in por_coluna[col]
+        }.difference(novos)
+        for segmento in vizinhos:
+            mantidas = []
+            for aresta in segmento.arestas:
+                if janela_inicio <= aresta.decolagem <= janela_fim:
+                    continue
+                removido = removidos.get(aresta.destino)
+                if removido is not None:
+                    destino = self._segmento_na_linha(removido.linha, aresta.pouso)
+                    if destino is None:
+                        continue
+                    aresta = aresta._replace(destino=destino.indice)
+                mantidas.append(aresta)
+            segmento.arestas = mantidas
+            self._gerar_arestas(segmento, janela_inicio, janela_fim)
+        for segmento in novos:
+            self._gerar_arestas(segmento, segmento.inicio, segmento.fim)
+
+        # Moedas de alvo perto da região (colunas vizinhas) ou num segmento trocado
+        moeda_inicio = col_min - 2
+        moeda_fim = col_max + 2
+        refazer = []
+        for x, y in self.mapa.posicoes_moedas:
+            alvo = self.alvos_moedas.get((x, y))
+            if moeda_inicio <= int(x) // TILE_SIZE <= moeda_fim or (
+                    alvo is not None and alvo.segmento in removidos):
+                self.alvos_moedas.pop((x, y), None)
+                refazer.append((x, y))
+        self._calcular_alvos_moedas(refazer)
+        self.reconstrucoes_locais += 1
+
+    def _segmento_na_linha(self, linha, col):
+        for segmento in self.por_coluna[col]:
+            if segmento.linha == linha:
+                return segmento
+        return None
+
+    def _calcular_alvos_moedas(self, posicoes):
+        for x, y in posicoes:
+            alvo = self._alvo_moeda(x, y)
+            if alvo is not None:
+                self.alvos_moedas[(x, y)] = alvo
+
+    def _ordenar_moedas(self):
+        # Moedas em ordem de coluna, para percorrer a partir do jogador sem ordenar
+        self.moedas_por_coluna = sorted(
+            (alvo.coluna, posicao, alvo) for posicao, alvo in self.alvos_moedas.items()
+        )
+        self.colunas_moedas = [coluna for coluna, _, _ in self.moedas_por_coluna]
+
+    def _calcular_alcance(self):
+        """Componentes fortemente conexas (Tarjan) e os componentes alcançáveis de cada uma.
+
+        self.componente[segmento] é o índice da componente, e o bit c de
+        self.alcance[componente] indica que a componente c é alcançável.
+        Tarjan numera as componentes em ordem topológica reversa, então as
+        alcançáveis a partir de uma componente já estão prontas quando ela fecha.
+        """
+        quantidade = len(self.segmentos)
+        self.componente = componente = [-1] * quantidade
+        self.alcance = alcance = []
+        ordem = [-1] * quantidade
+        baixo = [0] * quantidade
+        pilha = []
+        na_pilha = [False] * quantidade
+        contador = 0
+        for raiz in range(quantidade):
+            if ordem[raiz] != -1:
+                continue
+            # Busca em profundidade iterativa: (segmento, próxima aresta)
+            trabalho = [(raiz, 0)]
+            while trabalho:
+                indice, proxima = trabalho.pop()
+                if proxima == 0:
+                    ordem[indice] = baixo[indice] = contador
+                    contador += 1
+                    pilha.append(indice)
+                    na_pilha[indice] = True
+                arestas = self.segmentos[indice].arestas
+                while proxima < len(arestas):
+                    destino = arestas[proxima].destino
+                    proxima += 1
+                    if ordem[destino] == -1:
+                        trabalho.append((indice, proxima))
+                        trabalho.append((destino, 0))
+                        break
+                    if na_pilha[destino]:
+                        baixo[indice] = min(baixo[indice], ordem[destino])
+                else:
+                    if baixo[indice] == ordem[indice]:
+                        numero = len(alcance)
+                        membros = []
+                        while True:
+                            membro = pilha.pop()
+                            na_pilha[membro] = False
+                            componente[membro] = numero
+                            membros.append(membro)
+                            if membro == indice:
+                                break
+                        bits = 1 << numero
+                        for membro in membros:
+                            for aresta in self.segmentos[membro].arestas:
+                                outro = componente[aresta.destino]
+                                if outro != numero:
+                                    bits |= alcance[outro]
+                        alcance.append(bits)
+                    if trabalho:
+                        pai = trabalho[-1][0]
+                        baixo[pai] = min(baixo[pai], baixo[indice])
+
+    def alcanca(self, origem, destino):
+        """Indica se o segmento `destino` é alcançável a partir de `origem` (índices)"""
+        componente = self.componente
+        return self.alcance[componente[origem]] >> componente[destino] & 1 == 1
+
+    def _adicionar_aresta(self, segmento, col, direcao, pulo):
+        if pulo:
+            pouso = self._pular(col, segmento.linha, direcao)
+        else:
+            pouso = self.simular(x_em_pe(col), y_em_pe(segmento.linha), direcao, False)
+        if pouso is None:
+            return
+        destino, coluna, frames = pouso
+        if destino is not segmento:
+            segmento.arestas.append(Aresta(col, direcao, pulo, destino.indice, coluna, frames))
+
+    def _alvo_moeda(self, x, y):
+        """Coluna e segmento de onde a moeda é pega em pé ou com um pulo parado"""
+        # Retângulo da moeda descontada a flutuação (vale em qualquer frame)
+        esquerda = int(x) - MOEDA_LARGURA // 2
+        topo = int(y) - MOEDA_ALTURA // 2 + MOEDA_AMPLITUDE_FLUTUACAO
+        moeda = (esquerda, topo, MOEDA_LARGURA, MOEDA_ALTURA - 2 * MOEDA_AMPLITUDE_FLUTUACAO)
+        col_moeda = int(x) // TILE_SIZE
+        linha_moeda = int(y) // TILE_SIZE
+
+        for col in (col_moeda, col_moeda - 1, col_moeda + 1):
+            if not 0 <= col < len(self.por_coluna):
+                continue
+            # O chão mais alto abaixo da moeda primeiro
+            for segmento in sorted(self.por_coluna[col], key=lambda s: s.linha):
+                if segmento.linha <= linha_moeda:
+                    continue
+                x_jogador = x_em_pe(col)
+                y_jogador = y_em_pe(segmento.linha)
+                if _sobrepoe(x_jogador, y_jogador, moeda):
+                    return AlvoMoeda(segmento.indice, col, False)
+                if self.simular(x_jogador, y_jogador, 0, True, moeda) is not None:
+                    return AlvoMoeda(segmento.indice, col, True)
+        return None
+
+    # Simulação
+    def _pular(self, col, linha, direcao):
+        """Pulo a partir de (col, linha): trajetória livre até tocar um tile sólido.
+
+        Até o primeiro tile sólido nada é resolvido; dali em diante o pulo
+        segue pela simulação completa a partir do frame anterior.
+        """
+        tiles = self.mapa.tiles
+        linhas = self.mapa.linhas
+        colunas = self.mapa.colunas
+        altura_px = self.mapa.altura_px
+        dx = col * TILE_SIZE
+        dy = linha * TILE_SIZE
+        estado = (x_em_pe(0), y_em_pe(0), DINO_FORCA_PULO)
+        for frame, (x, y, vel_y, novos) in enumerate(TRAJETORIAS_LIVRES[direcao]):
+            for c, r in novos:
+                c += col
+                r += linha
+                if 0 <= r < linhas and 0 <= c < colunas and tiles[r][c]:
+                    x_antes, y_antes, vel_antes = estado
+                    return self._simular(x_antes + dx, y_antes + dy, vel_antes, False, direcao, frame)
+            if y + dy > altura_px:
+                return None
+            estado = (x, y, vel_y)
+        return None
+
+    def _solidos(self, esquerda, topo):
+        """Limites (col mín., col máx., linha mín., linha máx.) dos tiles sólidos
+        sob a hitbox, ou None"""
+        col_inicio = esquerda // TILE_SIZE
+        col_fim = (esquerda + HITBOX_LARGURA - 1) // TILE_SIZE
+        if col_inicio < 0:
+            col_inicio = 0
+        if col_fim >= self.mapa.colunas:
+            col_fim = self.mapa.colunas - 1
+        row_inicio = topo // TILE_SIZE
+        row_fim = (topo + HITBOX_ALTURA - 1) // TILE_SIZE
+        if row_inicio < 0:
+            row_inicio = 0
+        if row_fim >= self.mapa.linhas:
+            row_fim = self.mapa.linhas - 1
+
+        limites = None
+        tiles = self.mapa.tiles
+        for row in range(row_inicio, row_fim + 1):
+            linha = tiles[row]
+            for col in range(col_inicio, col_fim + 1):
+                if linha[col]:
+                    if limites is None:
+                        limites = [col, col, row, row]
+                    else:
+                        if col < limites[0]:
+                            limites[0] = col
+                        if col > limites[1]:
+                            limites[1] = col
+                        limites[3] = row
+        return limites
+
+    def simular(self, x, y, direcao, pulo, alvo=None):
+        """Simula um pulo (ou a saída andando, em pé) segurando `direcao`.
+
+        Segue a mesma ordem de Jogador.atualizar. Retorna (segmento de
+        pouso, coluna, frames), ou None se cair do mapa, não pousar num
+        segmento ou passar do limite. Com `alvo` (retângulo), retorna assim
+        que a hitbox tocar nele.
+        """
+        vel_y = DINO_FORCA_PULO if pulo else 0
+        return self._simular(x, y, vel_y, not pulo, direcao, 0, alvo)
+
+    def _simular(self, x, y, vel_y, no_chao, direcao, frame_inicial, alvo=None):
+        dx = direcao * DINO_VELOCIDADE
+        for frame in range(frame_inicial + 1, LIMITE_FRAMES + 1):
+            if dx:
+                x += dx
+                solidos = self._solidos(int(x) + HITBOX_OFFSET_X, int(y) + HITBOX_OFFSET_Y)
+                if solidos:
+                    if dx > 0:
+                        x = solidos[0] * TILE_SIZE - HITBOX_OFFSET_X - HITBOX_LARGURA
+                    else:
+                        x = (solidos[1] + 1) * TILE_SIZE - HITBOX_OFFSET_X
+
+            vel_y += DINO_GRAVIDADE
+            dy = vel_y
+            if no_chao and dy > 0:
+                if self._solidos(int(x) + HITBOX_OFFSET_X, int(y) + HITBOX_OFFSET_Y + 1):
+                    dy = 0
+                    vel_y = 0
+                else:
+                    no_chao = False
+
+            y += dy
+            solidos = self._solidos(int(x) + HITBOX_OFFSET_X, int(y) + HITBOX_OFFSET_Y)
+            pousou = False
+            if solidos:
+                if dy > 0:
+                    y = solidos[2] * TILE_SIZE - HITBOX_OFFSET_Y - HITBOX_ALTURA
+                    pousou = True
+                elif dy < 0:
+                    y = (solidos[3] + 1) * TILE_SIZE - HITBOX_OFFSET_Y
+                vel_y = 0
+
+            if alvo is not None:
+                if _sobrepoe(x, y, alvo):
+                    return None, coluna_do_jogador(x), frame
+                if pousou:
+                    return None
+            elif pousou:
+                posicao = self._segmento_em(x, y)
+                if posicao is None:
+                    return None
+                return posicao[0], posicao[1], frame
+            if y > self.mapa.altura_px:
+                return None
+        return None
+
+    # Consultas
+    def segmento_em(self, x, y):
+        """(segmento, coluna) do jogador em pé em (x, y), ou None"""
+        self._atualizar()
+        return self._segmento_em(x, y)
+
+    def _segmento_em(self, x, y):
+        linha = (int(y) + HITBOX_OFFSET_Y + HITBOX_ALTURA) // TILE_SIZE
+        esquerda = int(x) + HITBOX_OFFSET_X
+        centro = coluna_do_jogador(x)
+        # A coluna do centro primeiro; depois as bordas da hitbox
+        for col in (centro, esquerda // TILE_SIZE, (esquerda + HITBOX_LARGURA - 1) // TILE_SIZE):
+            if 0 <= col < len(self.por_coluna):
+                for segmento in self.por_coluna[col]:
+                    if segmento.linha == linha:
+                        return segmento, col
+        return None
+
+    def remover_aresta(self, indice, aresta):
+        """Descarta uma aresta que não se confirmou no jogo (e os caminhos em cache)"""
+        arestas = self.segmentos[indice].arestas
+        if aresta in arestas:
+            arestas.remove(aresta)
+            self._calcular_alcance()
+            self.caminhos.clear()
+            self.proximas.clear()
+
+    def caminho(self, segmento, coluna, segmento_alvo, coluna_alvo):
+        """Arestas do caminho mais rápido (em frames) até a coluna alvo, ou None.
+
+        Se a busca passar de LIMITE_EXPANSOES, retorna o começo do caminho
+        (a última aresta não pousa em segmento_alvo). Veja _buscar.
+        """
+        resultado = self._buscar(segmento, coluna, segmento_alvo, coluna_alvo)
+        return None if resultado is None else resultado[0]
+
+    def _buscar(self, segmento, coluna, segmento_alvo, coluna_alvo):
+        """A* limitado sobre (segmento, coluna de chegada): (arestas, custo estimado) ou None.
+
+        O custo de andar é a distância até a decolagem e a heurística é a
+        distância horizontal na velocidade máxima. Só entram estados que
+        ainda alcançam segmento_alvo, então qualquer prefixo leva a ele.
+        Estourado o limite, o prefixo vai até o estado expandido mais perto
+        da coluna alvo, e o custo estimado soma a heurística restante. Os
+        resultados ficam em cache até o grafo mudar.
+        """
+        self._atualizar()
+        chave = (segmento, coluna, segmento_alvo, coluna_alvo)
+        if chave in self.caminhos:
+            return self.caminhos[chave]
+        if not self.alcanca(segmento, segmento_alvo):
+            self.caminhos[chave] = None
+            return None
+
+        componente = self.componente
+        alcance = self.alcance
+        bit_alvo = 1 << componente[segmento_alvo]
+
+        def heuristica(col):
+            return abs(col - coluna_alvo) * FRAMES_POR_TILE
+
+        abertos = [(heuristica(coluna), 0, segmento, coluna)]
+        custos = {(segmento, coluna): 0}
+        anteriores = {}
+        resultado = None
+        parcial = None  # (heurística, custo, estado) do melhor estado expandido
+        expansoes = 0
+        while abertos:
+            _, custo, seg, col = heapq.heappop(abertos)
+            if seg == -1:
+                # Nó final: a chegada à coluna alvo
+                resultado = (self._reconstruir(anteriores, (seg, col)), custo)
+                break
+            if custo > custos.get((seg, col), custo):
+                continue
+            if expansoes == LIMITE_EXPANSOES:
+                if parcial is not None:
+                    restante, custo_parcial, estado = parcial
+                    resultado = (self._reconstruir(anteriores, estado), custo_parcial + restante)
+                break
+            expansoes += 1
+            if seg != segmento:
+                candidato = (heuristica(col), custo, (seg, col))
+                if parcial is None or candidato[:2] < parcial[:2]:
+                    parcial = candidato
+            if seg == segmento_alvo:
+                final = custo + abs(col - coluna_alvo) * FRAMES_POR_TILE
+                if final < custos.get((-1, coluna_alvo), float('inf')):
+                    custos[(-1, coluna_alvo)] = final
+                    anteriores[(-1, coluna_alvo)] = ((seg, col), None)
+                    heapq.heappush(abertos, (final, final, -1, coluna_alvo))
+            for aresta in self.segmentos[seg].arestas:
+                if not alcance[componente[aresta.destino]] & bit_alvo:
+                    continue
+                novo = custo + abs(col - aresta.decolagem) * FRAMES_POR_TILE + aresta.frames
+                estado = (aresta.destino, aresta.pouso)
+                if novo < custos.get(estado, float('inf')):
+                    custos[estado] = novo
+                    anteriores[estado] = ((seg, col), aresta)
+                    heapq.heappush(abertos, (novo + heuristica(aresta.pouso), novo, *estado))
+
+        self.caminhos[chave] = resultado
+        return resultado
+
+    def _reconstruir(self, anteriores, estado):
+        arestas = []
+        while estado in anteriores:
+            estado, aresta = anteriores[estado]
+            if aresta is not None:
+                arestas.append(aresta)
+        arestas.reverse()
+        return arestas
+
+    def caminho_proxima_moeda(self, x, y, moedas):
+        """Caminho até a moeda restante mais próxima (em frames de percurso).
+
+        `moedas` são as posições (como em Mapa.posicoes_moedas) ainda não
+        coletadas. Retorna (posição, alvo, arestas) ou None se o jogador não
+        está em pé num segmento ou nenhuma moeda restante é alcançável. As
+        moedas são testadas a partir da coluna do jogador, para os dois
+        lados em ordem de distância horizontal, parando quando ela já não
+        pode vencer o melhor caminho encontrado. Para moedas além do limite
+        da busca, as arestas são o começo do caminho (veja _buscar).
+        """
+        origem = self.segmento_em(x, y)
+        if origem is None:
+            return None
+        segmento, coluna = origem
+        chave = (segmento.indice, coluna, frozenset(moedas))
+        if chave in self.proximas:
+            return self.proximas[chave]
+
+        ordenadas = self.moedas_por_coluna
+        direita = bisect.bisect_left(self.colunas_moedas, coluna)
+        esquerda = direita - 1
+        melhor = None
+        melhor_custo = float('inf')
+        while True:
+            # A candidata mais perto na horizontal entre os dois lados
+            if esquerda >= 0 and (direita >= len(ordenadas)
+                                  or coluna - ordenadas[esquerda][0] <= ordenadas[direita][0] - coluna):
+                col_alvo, posicao, alvo = ordenadas[esquerda]
+                esquerda -= 1
+            elif direita < len(ordenadas):
+                col_alvo, posicao, alvo = ordenadas[direita]
+                direita += 1
+            else:
+                break
+            if abs(col_alvo - coluna) * FRAMES_POR_TILE >= melhor_custo:
+                break
+            if posicao not in moedas:
+                continue
+            resultado = self._buscar(segmento.indice, coluna, alvo.segmento, alvo.coluna)
+            if resultado is None:
+                continue
+            arestas, custo = resultado
+            if custo < melhor_custo:
+                melhor = (posicao, alvo, arestas)
+                melhor_custo = custo
+
+        self.proximas[chave] = melhor
+        return melhor
+
+    def linhas_estatisticas(self):
+        """Tamanho do grafo e do cache (overlay F3)"""
+        arestas = sum(len(segmento.arestas) for segmento in self.segmentos)
+        return [f"Navegação: {len(self.segmentos) - len(self.livres)} segmentos, {arestas} arestas, "
+                f"{len(self.caminhos)} caminhos em cache, {self.reconstrucoes_locais} refeitos locais"]
+
+
+def _sobrepoe(x, y, retangulo):
+    """Indica se a hitbox do jogador em (x, y) toca o retângulo"""
+    esquerda = int(x) + HITBOX_OFFSET_X
+    topo = int(y) + HITBOX_OFFSET_Y
+    r_esquerda, r_topo, r_largura, r_altura = retangulo
+    return (esquerda < r_esquerda + r_largura and r_esquerda < esquerda + HITBOX_LARGURA
+            and topo < r_topo + r_altura and r_topo < topo + HITBOX_ALTURA)
+
+
+TRAJETORIAS_LIVRES = {direcao: _trajetoria_livre(direcao) for direcao in (-1, 1)}
@@ -0,0 +1,118 @@
+"""
+Pacote de assets: todas as imagens em um único arquivo, já decodificadas
+
+Carregar o pacote evita abrir e decodificar um PNG por imagem. Cada entrada
+guarda o tamanho e a data de modificação (em ns) do PNG de origem; se algum
+PNG mudar ou sumir, o pacote é ignorado, os PNGs são usados e o jogo grava um
+pacote novo. O arquivo é gerado (não versionado); para gerá-lo à mão:
+    python pacote_assets.py
+"""
+import os
+import struct
+import sys
+
+MAGICO = b'DINOPAK2'
+CABECALHO = struct.Struct('<8sI')  # mágico, número de imagens
+# Tamanho do nome, largura, altura, mtime do PNG (ns), bytes do PNG, bytes RGBA
+ENTRADA = struct.Struct('<HHHqII')
+
+
+def gravar_pacote(imagens, destino):
+    """Grava em `destino` os pixels RGBA de {caminho do PNG: superfície}.
+
+    As superfícies devem ser as lidas dos PNGs, antes de qualquer convert().
+    O arquivo é escrito ao lado e renomeado, para que uma gravação
+    interrompida nunca deixe um pacote pela metade.
+    """
+    import pygame
+
+    partes = [CABECALHO.pack(MAGICO, len(imagens))]
+    for caminho, imagem in imagens.items():
+        info = os.stat(caminho)
+        dados = pygame.image.tobytes(imagem, 'RGBA')
+        nome = caminho.replace(os.sep, '/').encode('utf-8')
+        largura, altura = imagem.get_size()
+        partes.append(ENTRADA.pack(
+            len(nome), largura, altura, info.st_mtime_ns, info.st_size, len(dados)
+        ))
+        partes.append(nome)
+        partes.append(dados)
+    temporario = f"{destino}.{os.getpid()}.tmp"
+    try:
+        with open(temporario, 'wb') as f:
+            f.write(b''.join(partes))
+        os.replace(temporario, destino)
+    except OSError:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+
+
+def empacotar(caminhos, destino):
+    """Decodifica os PNGs e grava os pixels RGBA de todos em `destino`"""
+    import pygame
+
+    gravar_pacote({caminho: pygame.image.load(caminho) for caminho in caminhos}, destino)
+
+
+def carregar_pacote(caminho):
+    """Lê o pacote e retorna {caminho do PNG: (largura, altura, pixels RGBA)}.
+
+    Retorna um dicionário vazio se o pacote não existir, for de outro
+    formato, estiver truncado ou corrompido ou algum PNG tiver mudado de
+    tamanho ou de data de modificação (o jogo então grava um novo).
+    """
+    try:
+        with open(caminho, 'rb') as f:
+            dados = memoryview(f.read())
+    except OSError:
+        return {}
+    if len(dados) < CABECALHO.size:
+        return {}
+    magico, quantidade = CABECALHO.unpack_from(dados)
+    if magico != MAGICO:
+        return {}
+
+    imagens = {}
+    posicao = CABECALHO.size
+    for _ in range(quantidade):
+        try:
+            tamanho_nome, largura, altura, mtime_png, bytes_png, bytes_rgba = ENTRADA.unpack_from(
+                dados, posicao
+            )
+        except struct.error:
+            return {}
+        posicao += ENTRADA.size
+        # A entrada inteira precisa caber no arquivo e os pixels na imagem
+        if posicao + tamanho_nome + bytes_rgba > len(dados) or bytes_rgba != largura * altura * 4:
+            return {}
+        try:
+            nome = bytes(dados[posicao:posicao + tamanho_nome]).decode('utf-8')
+        except UnicodeDecodeError:
+            return {}
+        posicao += tamanho_nome
+        try:
+            info = os.stat(nome)
+        except (OSError, ValueError):
+            return {}  # ValueError: nome com byte nulo
+        if info.st_size != bytes_png or info.st_mtime_ns != mtime_png:
+            return {}
+        imagens[nome] = (largura, altura, dados[posicao:posicao + bytes_rgba])
+        posicao += bytes_rgba
+    return imagens
+
+
+def main():
+    from config import PACOTE_ASSETS
+
+    pasta = os.path.dirname(PACOTE_ASSETS)
+    caminhos = sorted(
+        f"{pasta}/{nome}" for nome in os.listdir(pasta) if nome.endswith('.png')
+    )
+    empacotar(caminhos, PACOTE_ASSETS)
+    print(f"{len(caminhos)} imagens em {PACOTE_ASSETS} ({os.path.getsize(PACOTE_ASSETS)} bytes)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
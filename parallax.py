@@ -0,0 +1,91 @@
+"""
+Sistema de fundo com parallax (camadas que rolam em velocidades diferentes)
+"""
+import math
+import pygame
+from config import (
+    LARGURA_VIRTUAL, ALTURA_VIRTUAL, PARALLAX_MARGEM_WRAP, PARALLAX_FATORES,
+    COR_CHAVE_MAPA
+)
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# Silhuetas das camadas (da mais distante para a mais próxima):
+# (cor, altura base em pixels a partir do fundo, [(amplitude, número de ondas), ...])
+SILHUETAS = [
+    ((60, 20, 40), 70, [(18, 2), (7, 5)]),
+    ((45, 15, 30), 50, [(12, 3), (5, 8)]),
+    ((30, 10, 20), 30, [(8, 4), (4, 11)]),
+]
+
+
+class CamadaParallax:
+    """Uma faixa de fundo armazenada uma única vez e repetida horizontalmente"""
+
+    def __init__(self, imagem, fator):
+        self.imagem = imagem
+        self.largura = imagem.get_width()
+        self.fator = fator
+
+    def desenhar(self, superficie, camera_x):
+        """Desenha a faixa com no máximo dois blits"""
+        deslocamento = int(camera_x * self.fator) % self.largura
+        superficie.blit(self.imagem, (-deslocamento, 0))
+
+        # Parte que "dá a volta" quando a faixa não cobre mais a viewport
+        if self.largura - deslocamento < LARGURA_VIRTUAL:
+            superficie.blit(self.imagem, (self.largura - deslocamento, 0))
+
+
+class Parallax:
+    """Classe que gerencia o céu e as camadas de parallax"""
+
+    def __init__(self, assets):
+        # O céu não se move, então é desenhado com um único blit
+        self.ceu = assets.background
+
+        largura = LARGURA_VIRTUAL + PARALLAX_MARGEM_WRAP
+        self.camadas = []
+        for (cor, base, ondas), fator in zip(SILHUETAS, PARALLAX_FATORES):
+            imagem = assets.memoria.registrar(
+                self._criar_silhueta(largura, cor, base, ondas), 'fundo'
+            )
+            self.camadas.append(CamadaParallax(imagem, fator))
+
+    def _alturas_silhueta(self, largura, base, ondas):
+        """Calcula a altura do relevo em cada coluna (periódica na largura da faixa)"""
+        alturas = []
+        for x in range(largura):
+            fase = 2 * math.pi * x / largura
+            altura = base + sum(a * math.sin(n * fase) for a, n in ondas)
+            alturas.append(int(ALTURA_VIRTUAL - altura))
+        return alturas
+
+    def _criar_silhueta(self, largura, cor, base, ondas):
+        """Cria a faixa de uma camada (transparente acima do relevo)"""
+        imagem = pygame.Surface((largura, ALTURA_VIRTUAL))
+        imagem.fill(COR_CHAVE_MAPA)
+        alturas = self._alturas_silhueta(largura, base, ondas)
+
+        if numpy is not None:
+            # Uma única passada vetorizada preenchendo tudo abaixo do relevo
+            ys = numpy.arange(ALTURA_VIRTUAL)
+            mascara = ys[None, :] >= numpy.array(alturas)[:, None]
+            pygame.surfarray.pixels3d(imagem)[mascara] = cor
+        else:
+            for x, topo in enumerate(alturas):
+                pygame.draw.line(imagem, cor, (x, topo), (x, ALTURA_VIRTUAL - 1))
+
+        imagem = imagem.convert()
+        imagem.set_colorkey(COR_CHAVE_MAPA, pygame.RLEACCEL)
+        return imagem
+
+    def desenhar(self, superficie, camera_x):
+        """Desenha o céu e todas as camadas de parallax"""
+        superficie.blit(self.ceu, (0, 0))
+        for camada in self.camadas:
+            camada.desenhar(superficie, camera_x)
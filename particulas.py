@@ -0,0 +1,116 @@
+"""
+Partículas de impacto de meteoros e de coleta de moedas (arrays NumPy)
+"""
+import math
+import pygame
+from config import (
+    PARTICULAS_CAPACIDADE, PARTICULAS_GRAVIDADE, PARTICULAS_VIDA,
+    PARTICULAS_POR_IMPACTO, PARTICULAS_POR_MOEDA
+)
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# Paletas (uma cor sorteada por partícula)
+CORES_IMPACTO = ((255, 120, 30), (255, 200, 60), (140, 60, 30), (90, 40, 25))
+CORES_MOEDA = ((255, 230, 80), (255, 255, 200), (250, 190, 40))
+
+
+class SistemaParticulas:
+    """Partículas de um pixel guardadas em arrays pré-alocados.
+
+    As emissões ocupam um anel de capacidade fixa (as mais antigas são
+    sobrescritas quando ele enche). Cada tick move todas de uma vez e o
+    desenho escreve os pixels visíveis com uma única atribuição em
+    surfarray. Sem NumPy o sistema fica desligado.
+    """
+
+    def __init__(self, capacidade=PARTICULAS_CAPACIDADE, semente=None):
+        self.capacidade = capacidade if numpy is not None else 0
+        self.gravidade = PARTICULAS_GRAVIDADE
+        self.proxima = 0  # Próxima posição livre do anel
+        self.frames_restantes = 0  # Até a última partícula emitida morrer
+        if not self.capacidade:
+            return
+
+        self.rng = numpy.random.default_rng(semente)
+        self.pos = numpy.zeros((capacidade, 2), dtype=numpy.float32)
+        self.vel = numpy.zeros((capacidade, 2), dtype=numpy.float32)
+        self.vida = numpy.zeros(capacidade, dtype=numpy.int32)
+        self.cor = numpy.zeros((capacidade, 3), dtype=numpy.uint8)
+        self.paletas = {}  # tupla de cores -> array
+
+    def emitir(self, x, y, quantidade, velocidade, cores, subida=0.0, vida=PARTICULAS_VIDA):
+        """Emite `quantidade` partículas a partir de (x, y) em direções aleatórias"""
+        quantidade = min(quantidade, self.capacidade)
+        if quantidade <= 0:
+            return
+
+        indices = (self.proxima + numpy.arange(quantidade)) % self.capacidade
+        self.proxima = (self.proxima + quantidade) % self.capacidade
+
+        angulos = self.rng.uniform(0, 2 * math.pi, quantidade)
+        rapidez = self.rng.uniform(0.3, 1.0, quantidade) * velocidade
+        self.pos[indices] = (x, y)
+        self.vel[indices, 0] = numpy.cos(angulos) * rapidez
+        self.vel[indices, 1] = numpy.sin(angulos) * rapidez - subida
+        self.vida[indices] = self.rng.integers(vida[0], vida[1], quantidade)
+
+        paleta = self.paletas.get(cores)
+        if paleta is None:
+            paleta = self.paletas[cores] = numpy.array(cores, dtype=numpy.uint8)
+        self.cor[indices] = paleta[self.rng.integers(0, len(paleta), quantidade)]
+        self.frames_restantes = max(self.frames_restantes, vida[1])
+
+    def ao_pousar_meteoros(self, eventos):
+        """Detritos no ponto de impacto de cada meteoro"""
+        for evento in eventos:
+            self.emitir(evento.x, evento.y, PARTICULAS_POR_IMPACTO, 2.0, CORES_IMPACTO, subida=1.5)
+
+    def ao_coletar_moedas(self, eventos):
+        """Brilho no lugar de cada moeda coletada"""
+        for evento in eventos:
+            self.emitir(evento.x, evento.y, PARTICULAS_POR_MOEDA, 1.2, CORES_MOEDA, subida=0.8)
+
+    def atualizar(self):
+        """Move todas as partículas (nada a fazer quando todas já morreram)"""
+        if not self.frames_restantes:
+            return
+        self.frames_restantes -= 1
+        self.pos += self.vel
+        self.vel[:, 1] += self.gravidade
+        self.vida -= 1
+
+    def desenhar(self, superficie, camera_x, camera_y):
+        """Escreve os pixels das partículas vivas visíveis"""
+        if not self.frames_restantes:
+            return
+        largura, altura = superficie.get_size()
+        tela_x = (self.pos[:, 0] - camera_x).astype(numpy.int32)
+        tela_y = (self.pos[:, 1] - camera_y).astype(numpy.int32)
+        visiveis = numpy.flatnonzero(
+            (self.vida > 0) & (tela_x >= 0) & (tela_x < largura) & (tela_y >= 0) & (tela_y < altura)
+        )
+        if not len(visiveis):
+            return
+
+        pixels = pygame.surfarray.pixels3d(superficie)
+        pixels[tela_x[visiveis], tela_y[visiveis]] = self.cor[visiveis]
+        # Solta a trava da superfície antes dos próximos blits
+        del pixels
+
+    def limpar(self):
+        """Descarta todas as partículas (reinício e checkpoints)"""
+        if self.capacidade:
+            self.vida[:] = 0
+        self.frames_restantes = 0
+
+    def linhas_estatisticas(self):
+        """Partículas vivas (overlay F3)"""
+        if not self.capacidade:
+            return ["Partículas: desligadas (sem NumPy)"]
+        vivas = int(numpy.count_nonzero(self.vida > 0)) if self.frames_restantes else 0
+        return [f"Partículas: {vivas}/{self.capacidade}"]
@@ -0,0 +1,152 @@
+"""
+Piloto automático: coleta as moedas seguindo o grafo de navegação do mapa
+"""
+import pygame
+from entrada import Entrada, TeclasSimuladas
+from navegacao import Aresta, x_em_pe
+
+# Ticks esperando sair do chão depois de decolar antes de desistir da aresta
+ESPERA_DECOLAGEM = 30
+
+TECLA_DIRECAO = {-1: (pygame.K_LEFT,), 0: (), 1: (pygame.K_RIGHT,)}
+
+
+class PilotoAutomatico(Entrada):
+    """Entrada que joga sozinha (demonstração do grafo de navegação).
+
+    Em pé, segue as arestas do caminho até a moeda restante mais próxima:
+    anda até a coluna de decolagem, confere a aresta com uma simulação a
+    partir da posição real e então pula (ou sai andando pela borda),
+    segurando a direção até pousar. Pousos fora do esperado e arestas que
+    não se confirmam levam a um novo planejamento. Eventos do teclado de
+    verdade (ESC, F3...) continuam valendo.
+    """
+
+    def __init__(self, jogo):
+        super().__init__()
+        self.jogo = jogo
+        self.grafo = jogo.mapa.grafo_navegacao()
+        self._seguradas = TeclasSimuladas()
+        self.arestas = []
+        self.alvo = None  # AlvoMoeda do plano atual
+        self.moeda = None  # Posição da moeda do plano atual
+        self.esperado = None  # Índice do segmento onde o plano espera estar
+        self.executando = None  # Aresta em andamento (decolou, ainda não pousou)
+        self.saiu_do_chao = False
+        self.espera = 0
+        self.ignoradas = set()  # Moedas que o plano alcançou sem coletar
+        self.planejamentos = 0
+
+    def eventos_do_tick(self):
+        eventos = super().eventos_do_tick()
+        if self._decidir():
+            eventos.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+        return eventos
+
+    def teclas(self):
+        return self._seguradas
+
+    def _segurar(self, direcao):
+        self._seguradas = TeclasSimuladas(TECLA_DIRECAO[direcao])
+
+    def moedas_restantes(self):
+        """Posições das moedas ainda ativas"""
+        moedas = self.jogo.gerenciador_moedas
+        return {
+            (x, y) for x, y, ativa in zip(moedas.xs, moedas.ys, moedas.ativas)
+            if ativa and (x, y) not in self.ignoradas
+        }
+
+    def _planejar(self):
+        jogador = self.jogo.jogador
+        self.planejamentos += 1
+        plano = self.grafo.caminho_proxima_moeda(jogador.x, jogador.y, self.moedas_restantes())
+        if plano is None:
+            self.moeda = self.alvo = None
+            self.arestas = []
+            return
+        self.moeda, self.alvo, arestas = plano
+        self.arestas = list(arestas)
+        self.esperado = self.grafo.segmento_em(jogador.x, jogador.y)[0].indice
+
+    def _decidir(self):
+        """Escolhe as teclas do tick; retorna True para pular"""
+        jogador = self.jogo.jogador
+        if self.jogo.game_over or jogador.morto or jogador.levou_dano:
+            self._segurar(0)
+            self.executando = None
+            return False
+
+        if self.executando is not None:
+            if not jogador.no_chao:
+                self.saiu_do_chao = True
+                return False
+            self.espera += 1
+            if not self.saiu_do_chao and self.espera < ESPERA_DECOLAGEM:
+                return False
+            # Pousou (ou não conseguiu decolar)
+            self.executando = None
+            self._segurar(0)
+
+        if not jogador.no_chao:
+            return False
+
+        posicao = self.grafo.segmento_em(jogador.x, jogador.y)
+        if posicao is None:
+            return False
+        segmento = posicao[0]
+        # Replaneja também no fim de um caminho parcial (alvo além do limite da busca)
+        if (self.moeda is None or self.moeda not in self.moedas_restantes()
+                or segmento.indice != self.esperado
+                or (not self.arestas and segmento.indice != self.alvo.segmento)):
+            self._planejar()
+            if self.moeda is None:
+                self._segurar(0)
+                return False
+
+        if self.arestas:
+            aresta = self.arestas[0]
+            coluna = aresta.decolagem
+        else:
+            aresta = None
+            coluna = self.alvo.coluna
+
+        distancia = x_em_pe(coluna) - jogador.x
+        if abs(distancia) > 1:
+            self._segurar(1 if distancia > 0 else -1)
+            return False
+
+        if aresta is None:
+            if not self.alvo.pulo:
+                # Em pé no alvo e a moeda não saiu: não insistir nela
+                self.ignoradas.add(self.moeda)
+                self.moeda = None
+                self._segurar(0)
+                return False
+            aresta = Aresta(coluna, 0, True, segmento.indice, coluna, 0)
+        else:
+            # Confere a aresta a partir da posição real (pode diferir em 1 pixel)
+            pouso = self.grafo.simular(jogador.x, jogador.y, aresta.direcao, aresta.pulo)
+            if pouso is None or pouso[0].indice != aresta.destino:
+                self.grafo.remover_aresta(segmento.indice, aresta)
+                self.moeda = None
+                self._segurar(0)
+                return False
+            self.arestas.pop(0)
+
+        self.executando = aresta
+        self.saiu_do_chao = False
+        self.espera = 0
+        self.esperado = aresta.destino
+        self._segurar(aresta.direcao)
+        if aresta.direcao == 0:
+            # Pulo parado pela moeda: o plano termina nele
+            self.moeda = None
+        return aresta.pulo
+
+    def linhas_estatisticas(self):
+        linhas = super().linhas_estatisticas()
+        linhas.append(f"Piloto: {len(self.moedas_restantes())} moedas restantes, "
+                      f"{self.planejamentos} planejamentos")
+        linhas.extend(self.grafo.linhas_estatisticas())
+        return linhas
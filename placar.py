@@ -0,0 +1,29 @@
+"""
+Pontuação da partida (alimentada pelos eventos de coleta)
+"""
+
+
+class Placar:
+    """Classe que acumula os pontos da partida"""
+
+    def __init__(self):
+        self.pontos = 0
+        self.moedas = 0
+
+    def ao_coletar_moedas(self, eventos):
+        """Soma os pontos de um lote de moedas coletadas"""
+        self.moedas += len(eventos)
+        self.pontos += sum(evento.pontos for evento in eventos)
+
+    def capturar_estado(self):
+        """Retorna (pontos, moedas)"""
+        return (self.pontos, self.moedas)
+
+    def restaurar_estado(self, estado):
+        """Restaura um estado capturado por capturar_estado"""
+        self.pontos, self.moedas = estado
+
+    def reiniciar(self):
+        """Zera a pontuação"""
+        self.pontos = 0
+        self.moedas = 0
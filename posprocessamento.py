@@ -0,0 +1,138 @@
+"""
+Pós-processamento da superfície virtual com tabelas de cores (LUTs)
+"""
+import pygame
+from config import (
+    LARGURA_VIRTUAL, ALTURA_VIRTUAL, POSPROCESSAMENTO_NIVEIS, FLASH_DANO_FRAMES,
+    FLASH_DANO_INTENSIDADE, CEU_METEOROS_ESCURO, CEU_ESCURECIMENTO_MAXIMO,
+    CEU_SUAVIZACAO, GAME_OVER_ESCURECIMENTO
+)
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def lut_afim(multiplicador, soma=(0, 0, 0)):
+    """LUT (3, 256) de v -> v * multiplicador + soma por canal, limitada a 0-255"""
+    valores = numpy.arange(256, dtype=numpy.float32)
+    canais = [valores * m + s for m, s in zip(multiplicador, soma)]
+    return numpy.clip(numpy.rint(canais), 0, 255).astype(numpy.uint8)
+
+
+def lut_flash(intensidade):
+    """Puxa a imagem para o vermelho"""
+    k = intensidade * FLASH_DANO_INTENSIDADE
+    return lut_afim((1 - 0.3 * k, 1 - 0.7 * k, 1 - 0.7 * k), (140 * k, 0, 0))
+
+
+def lut_ceu(intensidade):
+    """Escurece a cena, um pouco menos no azul (noite)"""
+    k = intensidade * CEU_ESCURECIMENTO_MAXIMO
+    return lut_afim((1 - k, 1 - k, 1 - 0.7 * k))
+
+
+def lut_game_over():
+    """Mesmo resultado do overlay preto semi-transparente"""
+    k = 1 - GAME_OVER_ESCURECIMENTO
+    return lut_afim((k, k, k))
+
+
+class PosProcessamento:
+    """Efeitos de tela inteira aplicados antes da escala.
+
+    Cada efeito tem uma intensidade quantizada em POSPROCESSAMENTO_NIVEIS
+    níveis; a combinação dos níveis ativos vira uma única LUT de 256
+    entradas por canal, calculada uma vez e guardada em cache. Aplicar é
+    uma consulta à tabela por canal sobre a vista pixels3d da superfície
+    (sem cópia da imagem, só um buffer de um canal reaproveitado). Sem
+    efeito ativo, nada é feito.
+
+    Sem NumPy só o escurecimento do Game Over existe (um overlay guardado).
+    """
+
+    def __init__(self):
+        self.flash = 0  # Frames restantes do flash de dano
+        self.densidade = 0.0  # Média móvel dos meteoros na tela (0-1)
+        self.vidas = None  # Vidas no tick anterior (dano = queda)
+        self.luts = {}  # (nível flash, nível céu, game over) -> LUT (3, 256)
+        self._canal = None  # Buffer de um canal (evita alocar por frame)
+        self._overlay = None
+
+    def atualizar(self, jogador, quantidade_meteoros):
+        """Detecta o dano e acompanha a densidade de meteoros na tela (um tick)"""
+        if self.vidas is not None and jogador.vidas < self.vidas:
+            self.flash = FLASH_DANO_FRAMES
+        elif self.flash:
+            self.flash -= 1
+        self.vidas = jogador.vidas
+
+        alvo = min(1.0, quantidade_meteoros / CEU_METEOROS_ESCURO)
+        self.densidade += (alvo - self.densidade) * CEU_SUAVIZACAO
+
+    def limpar(self):
+        """Encerra os efeitos em andamento (reinício e checkpoints)"""
+        self.flash = 0
+        self.densidade = 0.0
+        self.vidas = None
+
+    def niveis(self, game_over):
+        """Chave da LUT do frame: níveis quantizados de cada efeito"""
+        nivel_flash = -(-self.flash * POSPROCESSAMENTO_NIVEIS // FLASH_DANO_FRAMES)
+        nivel_ceu = int(self.densidade * POSPROCESSAMENTO_NIVEIS)
+        return nivel_flash, nivel_ceu, game_over
+
+    def lut(self, chave):
+        """LUT combinada dos efeitos da chave (calculada uma vez)"""
+        lut = self.luts.get(chave)
+        if lut is not None:
+            return lut
+        nivel_flash, nivel_ceu, game_over = chave
+        lut = numpy.tile(numpy.arange(256, dtype=numpy.uint8), (3, 1))
+        efeitos = []
+        if nivel_ceu:
+            efeitos.append(lut_ceu(nivel_ceu / POSPROCESSAMENTO_NIVEIS))
+        if nivel_flash:
+            efeitos.append(lut_flash(nivel_flash / POSPROCESSAMENTO_NIVEIS))
+        if game_over:
+            efeitos.append(lut_game_over())
+        # Compor tabelas é indexar uma pela outra
+        for efeito in efeitos:
+            lut = numpy.take_along_axis(efeito, lut.astype(numpy.intp), axis=1)
+        self.luts[chave] = lut
+        return lut
+
+    def aplicar(self, superficie, game_over=False):
+        """Aplica os efeitos ativos à superfície; retorna se algo foi feito"""
+        if numpy is None:
+            if not game_over:
+                return False
+            if self._overlay is None:
+                self._overlay = pygame.Surface((LARGURA_VIRTUAL, ALTURA_VIRTUAL))
+                self._overlay.set_alpha(round(255 * GAME_OVER_ESCURECIMENTO))
+            superficie.blit(self._overlay, (0, 0))
+            return True
+
+        chave = self.niveis(game_over)
+        if chave == (0, 0, False):
+            return False
+        lut = self.lut(chave)
+        pixels = pygame.surfarray.pixels3d(superficie)
+        if self._canal is None or self._canal.shape != pixels.shape[:2]:
+            self._canal = numpy.empty(pixels.shape[:2], dtype=numpy.uint8)
+        for canal in range(3):
+            vista = pixels[:, :, canal]
+            # take num buffer contíguo é mais rápido que indexar a vista espaçada
+            numpy.take(lut[canal], vista, out=self._canal)
+            vista[...] = self._canal
+        # Solta a trava da superfície antes dos próximos blits
+        del pixels, vista
+        return True
+
+    def linhas_estatisticas(self):
+        """Níveis atuais e LUTs em cache (overlay F3)"""
+        if numpy is None:
+            return ["Pós: só Game Over (sem NumPy)"]
+        nivel_flash, nivel_ceu, _ = self.niveis(False)
+        return [f"Pós: flash {nivel_flash}, céu {nivel_ceu}, {len(self.luts)} LUTs"]
@@ -0,0 +1,80 @@
+"""
+Medição de tempos por frame e overlay de depuração (F3)
+"""
+import time
+import pygame
+
+# Peso da média móvel exponencial dos tempos
+SUAVIZACAO = 0.1
+# O texto do overlay é renderizado de novo só a cada N frames
+FRAMES_ATUALIZACAO_OVERLAY = 15
+
+
+class Profiler:
+    """Classe que acumula tempos por seção e desenha o overlay"""
+
+    def __init__(self, memoria):
+        self.memoria = memoria
+        self.visivel = False
+        self.tempos = {}  # seção -> média móvel em ms
+        self.geradores_linhas = []  # Funções que retornam linhas extras para o overlay
+        self.fonte = pygame.font.Font(None, 12)
+        self._linhas_renderizadas = []
+        self._contador_overlay = 0
+        self.trace = None  # Lista de (seção, início, ms) quando gravando
+
+    def iniciar_trace(self):
+        """Passa a guardar cada medição para salvar_trace"""
+        self.trace = []
+
+    def registrar(self, secao, inicio):
+        """Registra o tempo gasto em uma seção desde `inicio` (perf_counter)"""
+        ms = (time.perf_counter() - inicio) * 1000
+        if self.trace is not None:
+            self.trace.append((secao, inicio, ms))
+        anterior = self.tempos.get(secao)
+        if anterior is None:
+            self.tempos[secao] = ms
+        else:
+            self.tempos[secao] = anterior + (ms - anterior) * SUAVIZACAO
+
+    def salvar_trace(self, caminho):
+        """Salva as medições no formato de trace do Chrome (chrome://tracing)"""
+        import json
+
+        eventos = [
+            {'name': secao, 'ph': 'X', 'ts': inicio * 1e6, 'dur': ms * 1000, 'pid': 0, 'tid': 0}
+            for secao, inicio, ms in self.trace
+        ]
+        with open(caminho, 'w') as f:
+            json.dump({'traceEvents': eventos, 'displayTimeUnit': 'ms'}, f)
+
+    def alternar(self):
+        """Mostra ou esconde o overlay"""
+        self.visivel = not self.visivel
+        self._contador_overlay = 0
+
+    def linhas(self):
+        """Linhas de texto do overlay (tempos, subsistemas e memória)"""
+        linhas = [f"{secao}: {ms:.2f} ms" for secao, ms in self.tempos.items()]
+        for gerador in self.geradores_linhas:
+            linhas.extend(gerador())
+        linhas.extend(self.memoria.relatorio())
+        return linhas
+
+    def desenhar(self, superficie):
+        """Desenha o overlay no canto inferior esquerdo"""
+        if not self.visivel:
+            return
+
+        if self._contador_overlay == 0:
+            self._linhas_renderizadas = [
+                self.fonte.render(linha, True, (255, 255, 255), (0, 0, 0))
+                for linha in self.linhas()
+            ]
+        self._contador_overlay = (self._contador_overlay + 1) % FRAMES_ATUALIZACAO_OVERLAY
+
+        y = superficie.get_height() - 2
+        for texto in reversed(self._linhas_renderizadas):
+            y -= texto.get_height()
+            superficie.blit(texto, (2, y))
@@ -0,0 +1,85 @@
+"""
+Recarga do arquivo do mapa com o jogo rodando (modo de desenvolvimento)
+"""
+import os
+import time
+from config import MAPA_RECARGA_INTERVALO
+
+
+class RecargaMapa:
+    """Observa o arquivo do mapa e aplica as mudanças na partida em andamento.
+
+    A cada MAPA_RECARGA_INTERVALO frames um os.stat confere se o arquivo
+    mudou (mtime e tamanho). Quando muda, Mapa.recarregar aplica só os tiles
+    diferentes e as moedas adicionadas ou removidas são trocadas no
+    GerenciadorMoedas; jogador, meteoros e moedas já coletadas continuam
+    como estavam. O reinício passa a usar o mapa novo e o checkpoint (que
+    guarda o mapa antigo) é descartado. O resultado da última recarga (ou o
+    erro que a impediu) aparece no overlay F3.
+    """
+
+    def __init__(self, jogo, arquivo):
+        self.jogo = jogo
+        self.arquivo = arquivo
+        self.assinatura = self._assinatura()
+        self.contador = 0
+        self.recargas = 0
+        self.ultima = None  # (ms, tiles alterados, moedas adicionadas, moedas removidas)
+        self.erro = None
+
+    def _assinatura(self):
+        try:
+            estado = os.stat(self.arquivo)
+        except OSError:
+            return None
+        return estado.st_mtime_ns, estado.st_size
+
+    def verificar(self):
+        """Chamada uma vez por frame; recarrega se o arquivo mudou"""
+        self.contador += 1
+        if self.contador < MAPA_RECARGA_INTERVALO:
+            return False
+        self.contador = 0
+        assinatura = self._assinatura()
+        # Tamanho 0: o editor ainda está gravando
+        if assinatura is None or assinatura == self.assinatura or not assinatura[1]:
+            return False
+        self.assinatura = assinatura
+        return self.recarregar()
+
+    def recarregar(self):
+        """Aplica o arquivo atual ao jogo; retorna se deu certo"""
+        inicio = time.perf_counter()
+        jogo = self.jogo
+        try:
+            alterados, adicionadas, removidas = jogo.mapa.recarregar(self.arquivo)
+        except (OSError, ValueError) as erro:
+            self.erro = str(erro)
+            return False
+        self.erro = None
+
+        moedas = jogo.gerenciador_moedas
+        for x, y in removidas:
+            moedas.remover_moeda(x, y)
+        for x, y in adicionadas:
+            moedas.adicionar_moeda(x, y)
+        if adicionadas or removidas:
+            # O reinício volta com todas as moedas do arquivo novo
+            jogo.estado_inicial.moedas = (b'\x01' * len(moedas), jogo.estado_inicial.moedas[1])
+            jogo.hud.invalidar()
+        jogo.checkpoint = None
+
+        ms = (time.perf_counter() - inicio) * 1000
+        self.ultima = (ms, alterados, len(adicionadas), len(removidas))
+        self.recargas += 1
+        return True
+
+    def linhas_estatisticas(self):
+        """Última recarga (overlay F3)"""
+        if self.erro is not None:
+            return [f"Recarga: {self.erro}"]
+        if self.ultima is None:
+            return [f"Recarga: observando {self.arquivo}"]
+        ms, alterados, adicionadas, removidas = self.ultima
+        return [f"Recarga: {self.recargas}x, última {ms:.2f} ms ({alterados} tiles, "
+                f"+{adicionadas}/-{removidas} moedas)"]
@@ -0,0 +1,663 @@
+"""
+Corridas em rede: servidor autoritativo (asyncio, TCP local) e cliente
+
+O servidor roda a simulação dos jogadores e dos meteoros a uma taxa fixa e
+envia snapshots quantizados: cada cliente recebe só o que mudou desde o
+último snapshot que recebeu (o TCP garante a ordem, então essa é a base do
+delta). Os spawns de meteoros vão junto, e cada cliente simula a queda.
+
+Cada cliente prevê o próprio jogador e envia a entrada de todo frame,
+numerada; o servidor aplica as entradas na mesma ordem e informa no
+snapshot a última que aplicou. Se o estado do servidor nesse frame não for
+o previsto (um meteoro que só acertou de um lado), o cliente pede uma
+correção, volta ao estado completo do servidor e reaplica as entradas
+seguintes. Reinícios e checkpoints também passam pelo servidor.
+"""
+import asyncio
+import socket
+import struct
+import time
+from collections import deque
+import pygame
+from config import (
+    LARGURA_VIRTUAL, SPRITE_LARGURA, REDE_PORTA, REDE_TAXA_SIMULACAO, REDE_TICKS_POR_SNAPSHOT,
+    REDE_SUBPIXELS, REDE_ATRASO_INTERPOLACAO, REDE_MAX_JOGADORES, REDE_ALFA_FANTASMA,
+    REDE_ENTRADAS_POR_TICK, COLISAO_POR_PIXEL
+)
+from camera import Camera
+from eventos import BarramentoEventos
+from jogador import Jogador, CAMPOS_ESTADO, sprite_animacao
+from meteoro import GerenciadorMeteoros
+
+# Tipos de mensagem (primeiro byte)
+MSG_BOAS_VINDAS = b'B'
+MSG_ENTRADA = b'E'
+MSG_SNAPSHOT = b'S'
+MSG_REINICIO = b'R'
+MSG_CORRECAO = b'C'  # Pedido do cliente (só o tipo) e resposta do servidor
+
+TAMANHO = struct.Struct('<H')  # Prefixo de cada mensagem
+BOAS_VINDAS = struct.Struct('<cB')  # tipo, id do jogador
+ENTRADA = struct.Struct('<cBI')  # tipo, teclas, frame do cliente
+REINICIO = struct.Struct('<cBI')  # tipo, ação, frame do cliente
+# tipo, tick, último frame do destinatário aplicado, jogadores, meteoros
+CABECALHO_SNAPSHOT = struct.Struct('<cIIBH')
+CORRECAO = struct.Struct('<cI')  # tipo, frame do cliente do estado que segue
+METEORO = struct.Struct('<ihhh')  # x, y (px), vel_x, vel_y (1/256 px por tick)
+VELOCIDADE_METEORO = 256
+
+# Bits das teclas na entrada
+ESQUERDA, DIREITA, PULO = 1, 2, 4
+
+# Ações de MSG_REINICIO (R, F5 e F9 no cliente)
+REINICIAR, SALVAR_CHECKPOINT, VOLTAR_CHECKPOINT = range(3)
+
+# Estado completo do jogador nas correções; as moedas ficam só no cliente
+CAMPOS_CORRECAO = tuple(campo for campo in CAMPOS_ESTADO if campo != 'moedas_coletadas')
+# Na ordem de CAMPOS_CORRECAO ('estado' e 'estado_anterior' vão como índice de ESTADOS)
+ESTADO_JOGADOR = struct.Struct('<3d?b3BH3B?H?H?B2?')
+ESTADOS = ('idle', 'movendo', 'pulando', 'hurt', 'morto')
+
+# Bits da máscara de cada jogador no snapshot
+X_DELTA, X_ABSOLUTO, Y_DELTA, Y_ABSOLUTO, ANIMACAO, FLAGS, VIDAS, REMOVIDO = (1 << i for i in range(8))
+# Tamanho de um jogador enviado por completo (id, máscara, x, y, animação, flags, vidas)
+TAMANHO_COMPLETO = 2 + 4 + 4 + 3
+
+# Bits das flags do jogador
+ESPELHADO, OCULTO = 1, 2
+
+
+def _mensagem(dados):
+    """Prefixa a mensagem com o tamanho"""
+    return TAMANHO.pack(len(dados)) + dados
+
+
+def quantizar_jogador(jogador):
+    """Estado visível do jogador: (x, y em subpixels, animação, flags, vidas)"""
+    codigo, frame = jogador.codigo_animacao()
+    flags = (ESPELHADO if jogador.direcao == -1 else 0) | (OCULTO if jogador.piscando() else 0)
+    return (
+        round(jogador.x * REDE_SUBPIXELS),
+        round(jogador.y * REDE_SUBPIXELS),
+        codigo << 4 | frame,
+        flags,
+        jogador.vidas
+    )
+
+
+def codificar_estado(jogador):
+    """Campos de CAMPOS_CORRECAO empacotados em ESTADO_JOGADOR"""
+    valores = [getattr(jogador, campo) for campo in CAMPOS_CORRECAO]
+    for indice in (CAMPOS_CORRECAO.index('estado'), CAMPOS_CORRECAO.index('estado_anterior')):
+        valores[indice] = ESTADOS.index(valores[indice])
+    return ESTADO_JOGADOR.pack(*valores)
+
+
+def decodificar_estado(dados, posicao, jogador):
+    """Aplica ao jogador um estado gravado por codificar_estado"""
+    valores = list(ESTADO_JOGADOR.unpack_from(dados, posicao))
+    for indice in (CAMPOS_CORRECAO.index('estado'), CAMPOS_CORRECAO.index('estado_anterior')):
+        valores[indice] = ESTADOS[valores[indice]]
+    for campo, valor in zip(CAMPOS_CORRECAO, valores):
+        setattr(jogador, campo, valor)
+
+
+def codificar_delta(id_jogador, atual, anterior):
+    """Entrada do snapshot com só o que mudou desde `anterior` (None = completo).
+
+    Posições que mudaram pouco vão como deltas de um byte. Retorna b'' se
+    nada mudou.
+    """
+    if atual == anterior:
+        return b''
+    mascara = 0
+    formato = '<BB'
+    valores = [id_jogador, 0]
+    for eixo, bit_delta, bit_absoluto in ((0, X_DELTA, X_ABSOLUTO), (1, Y_DELTA, Y_ABSOLUTO)):
+        if anterior is not None:
+            delta = atual[eixo] - anterior[eixo]
+            if delta == 0:
+                continue
+            if -128 <= delta <= 127:
+                mascara |= bit_delta
+                formato += 'b'
+                valores.append(delta)
+                continue
+        mascara |= bit_absoluto
+        formato += 'i'
+        valores.append(atual[eixo])
+    for campo, bit in ((2, ANIMACAO), (3, FLAGS), (4, VIDAS)):
+        if anterior is None or atual[campo] != anterior[campo]:
+            mascara |= bit
+            formato += 'B'
+            valores.append(atual[campo])
+    valores[1] = mascara
+    return struct.pack(formato, *valores)
+
+
+def decodificar_snapshot(dados, base):
+    """Aplica um snapshot à base do cliente (id -> [x, y, animação, flags, vidas]).
+
+    Retorna (tick do servidor, último frame do destinatário aplicado pelo
+    servidor, spawns de meteoros como (x, y, vel_x, vel_y)).
+    """
+    _, tick, quadro, jogadores, meteoros = CABECALHO_SNAPSHOT.unpack_from(dados)
+    posicao = CABECALHO_SNAPSHOT.size
+    for _ in range(jogadores):
+        id_jogador, mascara = dados[posicao], dados[posicao + 1]
+        posicao += 2
+        if mascara & REMOVIDO:
+            base.pop(id_jogador, None)
+            continue
+        estado = base.setdefault(id_jogador, [0, 0, 0, 0, 0])
+        for eixo, bit_delta, bit_absoluto in ((0, X_DELTA, X_ABSOLUTO), (1, Y_DELTA, Y_ABSOLUTO)):
+            if mascara & bit_delta:
+                estado[eixo] += struct.unpack_from('<b', dados, posicao)[0]
+                posicao += 1
+            elif mascara & bit_absoluto:
+                estado[eixo] = struct.unpack_from('<i', dados, posicao)[0]
+                posicao += 4
+        for campo, bit in ((2, ANIMACAO), (3, FLAGS), (4, VIDAS)):
+            if mascara & bit:
+                estado[campo] = dados[posicao]
+                posicao += 1
+
+    spawns = []
+    for _ in range(meteoros):
+        x, y, vel_x, vel_y = METEORO.unpack_from(dados, posicao)
+        posicao += METEORO.size
+        spawns.append((x, y, vel_x / VELOCIDADE_METEORO, vel_y / VELOCIDADE_METEORO))
+    return tick, quadro, spawns
+
+
+class JogadorConectado:
+    """Jogador simulado pelo servidor e o estado da conexão do seu cliente"""
+
+    __slots__ = (
+        'jogador', 'camera', 'teclas', 'entradas', 'quadro', 'inicial', 'checkpoint',
+        'escritor', 'base', 'bytes_enviados', 'bytes_recebidos'
+    )
+
+    def __init__(self, jogador, camera, escritor):
+        self.jogador = jogador
+        self.camera = camera
+        self.teclas = {pygame.K_LEFT: False, pygame.K_RIGHT: False}
+        # Entradas e reinícios ainda não aplicados, na ordem em que chegaram
+        self.entradas = deque(maxlen=REDE_TAXA_SIMULACAO)
+        self.quadro = 0  # Último frame do cliente aplicado
+        self.inicial = jogador.capturar_estado()
+        self.checkpoint = None
+        self.escritor = escritor
+        self.base = {}  # id -> estado quantizado que este cliente já conhece
+        self.bytes_enviados = 0
+        self.bytes_recebidos = 0
+
+
+class ServidorCorrida:
+    """Servidor autoritativo: simula todos os jogadores e os meteoros"""
+
+    def __init__(self, assets, mapa, semente=None):
+        self.assets = assets
+        self.mapa = mapa
+        self.meteoros = GerenciadorMeteoros(assets, mapa.largura_px, BarramentoEventos(), semente)
+        self.conectados = {}  # id -> JogadorConectado
+        self.tick = 0
+        self.servidor = None
+        self._spawns = []  # Meteoros criados desde o último snapshot (já empacotados)
+
+        # Estatísticas
+        self.tempos_tick = deque(maxlen=REDE_TAXA_SIMULACAO * 60)  # ms, último minuto
+        self.bytes_snapshots = 0
+        self.bytes_completos = 0  # O que os mesmos snapshots custariam sem delta
+
+    async def iniciar(self, host='127.0.0.1', porta=REDE_PORTA):
+        """Começa a aceitar conexões"""
+        self.servidor = await asyncio.start_server(self._atender, host, porta)
+        return self.servidor
+
+    def fechar(self):
+        """Para de aceitar conexões e desconecta os clientes"""
+        if self.servidor is not None:
+            self.servidor.close()
+        for conectado in self.conectados.values():
+            conectado.escritor.close()
+
+    def _novo_id(self):
+        """Menor id livre"""
+        return next(i for i in range(REDE_MAX_JOGADORES) if i not in self.conectados)
+
+    async def _atender(self, leitor, escritor):
+        """Conexão de um cliente: registra o jogador e lê as entradas"""
+        if len(self.conectados) >= REDE_MAX_JOGADORES:
+            escritor.close()
+            return
+
+        id_jogador = self._novo_id()
+        conectado = JogadorConectado(
+            Jogador(50, 100, self.assets),
+            Camera(self.mapa.largura_px, self.mapa.altura_px),
+            escritor
+        )
+        self.conectados[id_jogador] = conectado
+        escritor.get_extra_info('socket').setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        escritor.write(_mensagem(BOAS_VINDAS.pack(MSG_BOAS_VINDAS, id_jogador)))
+
+        try:
+            while True:
+                tamanho, = TAMANHO.unpack(await leitor.readexactly(TAMANHO.size))
+                dados = await leitor.readexactly(tamanho)
+                conectado.bytes_recebidos += TAMANHO.size + tamanho
+                tipo = dados[:1]
+                if tipo == MSG_ENTRADA:
+                    conectado.entradas.append(ENTRADA.unpack(dados))
+                elif tipo == MSG_REINICIO:
+                    conectado.entradas.append(REINICIO.unpack(dados))
+                elif tipo == MSG_CORRECAO:
+                    # O estado atual é o do último frame aplicado
+                    mensagem = _mensagem(
+                        CORRECAO.pack(MSG_CORRECAO, conectado.quadro)
+                        + codificar_estado(conectado.jogador)
+                    )
+                    escritor.write(mensagem)
+                    conectado.bytes_enviados += len(mensagem)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            del self.conectados[id_jogador]
+            escritor.close()
+
+    def passo(self):
+        """Avança a simulação um tick e envia o snapshot quando for a hora"""
+        inicio = time.perf_counter()
+        conectados = list(self.conectados.values())
+
+        if conectados:
+            for conectado in conectados:
+                self._aplicar_entradas(conectado)
+                conectado.camera.atualizar(conectado.jogador.x, conectado.jogador.y)
+
+            # Os spawns se revezam entre as câmeras dos jogadores
+            camera_x = conectados[self.tick % len(conectados)].camera.x
+            gerados = self.meteoros.gerados
+            self.meteoros.atualizar(self.mapa, camera_x)
+            novos = self.meteoros.gerados - gerados
+            if novos:
+                self._publicar_meteoros(self.meteoros.meteoros[-novos:])
+
+            for conectado in conectados:
+                hitbox = conectado.jogador.get_hitbox()
+                mascara = conectado.jogador.get_mascara() if COLISAO_POR_PIXEL else None
+                if any(meteoro.atinge(hitbox, mascara) for meteoro in self.meteoros.meteoros):
+                    conectado.jogador.receber_dano()
+
+        self.tick += 1
+        if self.tick % REDE_TICKS_POR_SNAPSHOT == 0:
+            self._enviar_snapshots()
+        self.tempos_tick.append((time.perf_counter() - inicio) * 1000)
+
+    def _aplicar_entradas(self, conectado):
+        """Simula os frames do cliente que chegaram (até REDE_ENTRADAS_POR_TICK).
+
+        Sem entrada nova o jogador espera: cada frame do cliente é simulado
+        uma vez, com as mesmas teclas, como na previsão do cliente.
+        """
+        jogador = conectado.jogador
+        aplicadas = 0
+        while conectado.entradas and aplicadas < REDE_ENTRADAS_POR_TICK:
+            tipo, valor, quadro = conectado.entradas.popleft()
+            if tipo == MSG_REINICIO:
+                if valor == REINICIAR:
+                    jogador.restaurar_estado(conectado.inicial)
+                elif valor == SALVAR_CHECKPOINT:
+                    conectado.checkpoint = jogador.capturar_estado()
+                elif conectado.checkpoint is not None:
+                    jogador.restaurar_estado(conectado.checkpoint)
+                conectado.quadro = quadro
+                continue
+            conectado.teclas[pygame.K_LEFT] = bool(valor & ESQUERDA)
+            conectado.teclas[pygame.K_RIGHT] = bool(valor & DIREITA)
+            if valor & PULO:
+                jogador.pedir_pulo()
+            jogador.atualizar(conectado.teclas, self.mapa)
+            conectado.quadro = quadro
+            aplicadas += 1
+
+    def _publicar_meteoros(self, meteoros):
+        """Quantiza os meteoros novos (como os clientes vão vê-los) e os enfileira"""
+        for meteoro in meteoros:
+            vel_x = round(meteoro.vel_x * VELOCIDADE_METEORO)
+            vel_y = round(meteoro.vel_y * VELOCIDADE_METEORO)
+            meteoro.vel_x = vel_x / VELOCIDADE_METEORO
+            meteoro.vel_y = vel_y / VELOCIDADE_METEORO
+            self.meteoros._calcular_trajetoria(meteoro, self.mapa)
+            self._spawns.append(METEORO.pack(int(meteoro.x), int(meteoro.y), vel_x, vel_y))
+
+    def _enviar_snapshots(self):
+        """Envia a cada cliente o delta entre o estado atual e a base dele"""
+        estados = {
+            id_jogador: quantizar_jogador(conectado.jogador)
+            for id_jogador, conectado in self.conectados.items()
+        }
+        spawns = b''.join(self._spawns)
+        quantidade_spawns = len(self._spawns)
+        self._spawns = []
+
+        # Clientes com a mesma base recebem as mesmas entradas: codifica uma vez
+        entradas_prontas = {}
+        for conectado in self.conectados.values():
+            base = conectado.base
+            entradas = []
+            for id_jogador, estado in estados.items():
+                chave = (id_jogador, base.get(id_jogador))
+                entrada = entradas_prontas.get(chave)
+                if entrada is None:
+                    entrada = entradas_prontas[chave] = codificar_delta(id_jogador, estado, chave[1])
+                if entrada:
+                    entradas.append(entrada)
+            for id_jogador in base.keys() - estados.keys():
+                entradas.append(struct.pack('<BB', id_jogador, REMOVIDO))
+            conectado.base = dict(estados)
+
+            mensagem = _mensagem(
+                CABECALHO_SNAPSHOT.pack(
+                    MSG_SNAPSHOT, self.tick, conectado.quadro, len(entradas), quantidade_spawns
+                )
+                + b''.join(entradas) + spawns
+            )
+            conectado.escritor.write(mensagem)
+            conectado.bytes_enviados += len(mensagem)
+            self.bytes_snapshots += len(mensagem)
+            self.bytes_completos += (
+                TAMANHO.size + CABECALHO_SNAPSHOT.size + TAMANHO_COMPLETO * len(estados) + len(spawns)
+            )
+
+    async def executar(self, ticks=None):
+        """Roda a simulação a REDE_TAXA_SIMULACAO ticks por segundo"""
+        loop = asyncio.get_running_loop()
+        intervalo = 1 / REDE_TAXA_SIMULACAO
+        proximo = loop.time()
+        fim = None if ticks is None else self.tick + ticks
+        while fim is None or self.tick < fim:
+            self.passo()
+            proximo += intervalo
+            espera = proximo - loop.time()
+            if espera < -intervalo:
+                # Atrasado mais de um tick: não tenta recuperar o tempo perdido
+                proximo = loop.time()
+            await asyncio.sleep(max(0, espera))
+
+    def linhas_estatisticas(self):
+        """Resumo do tempo de tick e da banda usada"""
+        tempos = sorted(self.tempos_tick) or [0]
+        economia = 1 - self.bytes_snapshots / max(1, self.bytes_completos)
+        return [
+            f"Jogadores: {len(self.conectados)}  tick {self.tick}",
+            f"Tick: média {sum(tempos) / len(tempos):.3f} ms  p99 {tempos[int(len(tempos) * 0.99)]:.3f} ms",
+            f"Snapshots: {self.bytes_snapshots} bytes ({economia:.0%} menos que sem delta)",
+        ]
+
+
+async def servir(assets, mapa, semente=None, host='127.0.0.1', porta=REDE_PORTA):
+    """Roda um servidor até ser interrompido"""
+    servidor = ServidorCorrida(assets, mapa, semente)
+    await servidor.iniciar(host, porta)
+    print(f"Servidor em {host}:{porta} ({REDE_TAXA_SIMULACAO} ticks/s)")
+    try:
+        await servidor.executar()
+    finally:
+        servidor.fechar()
+        for linha in servidor.linhas_estatisticas():
+            print(linha)
+
+
+class ClienteCorrida:
+    """Conexão do Jogo com o servidor (socket não bloqueante, lido a cada frame)"""
+
+    def __init__(self, host='127.0.0.1', porta=REDE_PORTA):
+        self.socket = socket.create_connection((host, porta))
+        self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.conectado = True
+        self._buffer = bytearray()
+        self._saida = bytearray()  # Mensagens (ou o resto delas) ainda não aceitas pelo socket
+        self.bytes_enviados = 0
+        self.bytes_recebidos = 0
+
+        # Previsão do jogador local: frames ainda não confirmados pelo servidor
+        self.quadro = 0  # Último frame cuja entrada foi enviada
+        self.entradas = deque(maxlen=REDE_TAXA_SIMULACAO * 2)  # (frame, esquerda, direita, pulou)
+        self.previstos = {}  # frame -> estado quantizado previsto depois dele
+        self._primeiro_quadro = 0  # Estados de frames anteriores são de antes do último reinício
+        self._correcao_pedida = False
+        self._correcao = None  # (frame, mensagem) recebida e ainda não aplicada
+        self.correcoes = 0
+
+        self.base = {}  # id -> estado quantizado do último snapshot
+        self.historico = {}  # id -> snapshots recentes do jogador (para interpolar)
+        self.tick_servidor = None
+        self._instante_tick = 0
+
+        # Espera as boas-vindas com o id deste jogador
+        self.id = None
+        while self.id is None:
+            dados = self.socket.recv(4096)
+            if not dados:
+                raise ConnectionError("o servidor fechou a conexão")
+            self._buffer += dados
+            for mensagem in self._mensagens():
+                if mensagem[:1] == MSG_BOAS_VINDAS:
+                    _, self.id = BOAS_VINDAS.unpack(mensagem)
+        self.socket.setblocking(False)
+
+    def _mensagens(self):
+        """Retira do buffer as mensagens completas"""
+        buffer = self._buffer
+        posicao = 0
+        while len(buffer) - posicao >= TAMANHO.size:
+            tamanho, = TAMANHO.unpack_from(buffer, posicao)
+            fim = posicao + TAMANHO.size + tamanho
+            if fim > len(buffer):
+                break
+            yield bytes(buffer[posicao + TAMANHO.size:fim])
+            posicao = fim
+        del buffer[:posicao]
+
+    def _enviar(self, mensagem):
+        """Enfileira uma mensagem e envia o que o socket aceitar (sem bloquear)"""
+        if not self.conectado:
+            return
+        self._saida += mensagem
+        self._despachar()
+
+    def _despachar(self):
+        """Envia o início da fila de saída.
+
+        Um envio parcial deixa o resto na fila (em vez de meia mensagem no
+        fluxo); ele sai nas próximas chamadas, a cada frame em receber().
+        """
+        saida = self._saida
+        while saida and self.conectado:
+            try:
+                enviados = self.socket.send(saida)
+            except BlockingIOError:
+                break
+            except OSError:
+                self.conectado = False
+                break
+            del saida[:enviados]
+            self.bytes_enviados += enviados
+
+    def enviar_entrada(self, esquerda, direita, pulou):
+        """Envia as teclas do próximo frame (todo frame, para o servidor repetir a simulação)"""
+        self.quadro += 1
+        self.entradas.append((self.quadro, esquerda, direita, pulou))
+        teclas = (ESQUERDA if esquerda else 0) | (DIREITA if direita else 0) | (PULO if pulou else 0)
+        self._enviar(_mensagem(ENTRADA.pack(MSG_ENTRADA, teclas, self.quadro)))
+
+    def enviar_reinicio(self, acao):
+        """Avisa o servidor de um reinício ou checkpoint (REINICIAR, SALVAR_CHECKPOINT...)
+
+        A ação ocupa um número de frame, para que os estados do servidor de
+        antes e de depois dela não se confundam.
+        """
+        self.quadro += 1
+        self._enviar(_mensagem(REINICIO.pack(MSG_REINICIO, acao, self.quadro)))
+        if acao != SALVAR_CHECKPOINT:
+            self.entradas.clear()
+            self.previstos.clear()
+            self._primeiro_quadro = self.quadro
+            self._correcao = None
+            self._correcao_pedida = False
+
+    def prever(self, jogador):
+        """Guarda o estado previsto do jogador local depois do frame atual"""
+        self.previstos[self.quadro] = quantizar_jogador(jogador)
+
+    def reconciliar(self, jogador, mapa):
+        """Aplica a correção recebida: estado do servidor e reaplicação das entradas.
+
+        Chamado depois de enviar_entrada e antes de simular o frame novo.
+        Retorna True se o jogador foi corrigido.
+        """
+        if self._correcao is None:
+            return False
+        quadro, mensagem = self._correcao
+        self._correcao = None
+        self._correcao_pedida = False
+        if quadro < self._primeiro_quadro:
+            # Estado de antes de um reinício
+            return False
+
+        decodificar_estado(mensagem, CORRECAO.size, jogador)
+        teclas = {pygame.K_LEFT: False, pygame.K_RIGHT: False}
+        for entrada, esquerda, direita, pulou in self.entradas:
+            if entrada <= quadro or entrada >= self.quadro:
+                continue
+            teclas[pygame.K_LEFT] = esquerda
+            teclas[pygame.K_RIGHT] = direita
+            if pulou:
+                jogador.pedir_pulo()
+            jogador.atualizar(teclas, mapa)
+            self.previstos[entrada] = quantizar_jogador(jogador)
+        self.correcoes += 1
+        return True
+
+    def _conferir_previsao(self, quadro):
+        """Pede uma correção se o servidor discorda do estado previsto em `quadro`"""
+        for antigo in [q for q in self.previstos if q < quadro]:
+            del self.previstos[antigo]
+        previsto = self.previstos.pop(quadro, None)
+        estado = self.base.get(self.id)
+        if previsto is None or estado is None or self._correcao_pedida:
+            return
+        if tuple(estado) != previsto:
+            self._correcao_pedida = True
+            self._enviar(_mensagem(MSG_CORRECAO))
+
+    def receber(self):
+        """Lê tudo o que chegou; retorna os spawns de meteoros recebidos"""
+        self._despachar()
+        while self.conectado:
+            try:
+                dados = self.socket.recv(65536)
+            except BlockingIOError:
+                break
+            except OSError:
+                dados = b''
+            if not dados:
+                self.conectado = False
+                break
+            self._buffer += dados
+            self.bytes_recebidos += len(dados)
+
+        spawns = []
+        for mensagem in self._mensagens():
+            tipo = mensagem[:1]
+            if tipo == MSG_SNAPSHOT:
+                tick, quadro, novos = decodificar_snapshot(mensagem, self.base)
+                spawns.extend(novos)
+                self._guardar_snapshot(tick)
+                self._conferir_previsao(quadro)
+            elif tipo == MSG_CORRECAO:
+                self._correcao = (CORRECAO.unpack_from(mensagem)[1], mensagem)
+        return spawns
+
+    def _guardar_snapshot(self, tick):
+        """Acrescenta o estado de cada outro jogador ao seu histórico"""
+        self.tick_servidor = tick
+        self._instante_tick = time.perf_counter()
+        for id_jogador in self.historico.keys() - self.base.keys():
+            del self.historico[id_jogador]
+        for id_jogador, estado in self.base.items():
+            if id_jogador != self.id:
+                historico = self.historico.get(id_jogador)
+                if historico is None:
+                    historico = self.historico[id_jogador] = deque(maxlen=8)
+                historico.append((tick, *estado))
+
+    def posicoes_fantasmas(self):
+        """Outros jogadores interpolados REDE_ATRASO_INTERPOLACAO ticks no passado.
+
+        Retorna uma lista de (x, y, animação, flags).
+        """
+        if self.tick_servidor is None:
+            return []
+        decorrido = (time.perf_counter() - self._instante_tick) * REDE_TAXA_SIMULACAO
+        tick = self.tick_servidor + decorrido - REDE_ATRASO_INTERPOLACAO
+
+        posicoes = []
+        for historico in self.historico.values():
+            anterior = historico[0]
+            x, y = anterior[1], anterior[2]
+            for atual in historico:
+                if atual[0] >= tick:
+                    if atual is not anterior:
+                        t = (tick - anterior[0]) / (atual[0] - anterior[0])
+                        x = anterior[1] + (atual[1] - anterior[1]) * t
+                        y = anterior[2] + (atual[2] - anterior[2]) * t
+                    break
+                anterior = atual
+            else:
+                # Mais novo que o último snapshot: fica na última posição
+                x, y = anterior[1], anterior[2]
+            posicoes.append((x / REDE_SUBPIXELS, y / REDE_SUBPIXELS, anterior[3], anterior[4]))
+        return posicoes
+
+    def fechar(self):
+        """Encerra a conexão"""
+        self.conectado = False
+        self.socket.close()
+
+
+class Fantasmas:
+    """Desenha os outros jogadores translúcidos"""
+
+    def __init__(self, assets):
+        self.assets = assets
+        self._cache = {}  # (animação, espelhado) -> sprite translúcido
+
+    def _sprite(self, animacao, flags):
+        """Sprite translúcido da animação (com cache)"""
+        chave = (animacao, flags & ESPELHADO)
+        sprite = self._cache.get(chave)
+        if sprite is None:
+            sprite = sprite_animacao(self.assets, animacao >> 4, animacao & 15)
+            if flags & ESPELHADO:
+                sprite = self.assets.espelhado(sprite)
+            sprite = sprite.copy()
+            sprite.set_alpha(REDE_ALFA_FANTASMA)
+            self._cache[chave] = sprite
+            self.assets.memoria.registrar(
+                sprite, 'fantasmas', lambda c=chave: self._cache.pop(c, None)
+            )
+        return sprite
+
+    def desenhar(self, superficie, camera_x, camera_y, posicoes):
+        """Desenha os fantasmas visíveis"""
+        superficie.blits(
+            [
+                (self._sprite(animacao, flags), (int(x - camera_x), int(y - camera_y)))
+                for x, y, animacao, flags in posicoes
+                if not flags & OCULTO and -SPRITE_LARGURA <= x - camera_x <= LARGURA_VIRTUAL
+            ],
+            doreturn=False
+        )
\ No newline at end of file